@@ -1,17 +1,41 @@
 import argparse
 import sys
+from contextlib import nullcontext
+from typing import Optional, TextIO
 
-from src.Interpreter import Interpreter
+from src.ASTCache import ASTCache
+from src.BytecodeCompiler import BytecodeCompiler, write_bytecode, read_bytecode
+from src.ClosureInterpreter import ClosureInterpreter
+from src.Interpreter import Interpreter, DEFAULT_MEMO_SIZE
 from src.Lexer import Lexer
 from src.Parser import Parser
+from src.PyInterpreter import PyInterpreter
+from src.PyTranspiler import write_module
+from src.RegexLexer import RegexLexer
 from src.Repl import Repl
+from src.StackInterpreter import StackInterpreter, DEFAULT_FRAME_BUDGET
+from src.VirtualMachine import VirtualMachine
+from src.core.ASTNodes import Node
+from src.core.Bytecode import CodeObject, disassemble
+from src.core.Token import SourceMap
+from src.utils.Constants import BYTECODE_SUFFIX
+from src.utils.ErrorHandler import InterpreterError, ParserError, LexerError
+from src.utils.Logger import Logger, LogLevel
+
+TOKENIZERS = {"hand": Lexer, "regex": RegexLexer}
+ENGINES = ("tree", "stack", "closure", "vm", "py")
+LOG_LEVELS = {"trace": LogLevel.TRACE, "info": LogLevel.INFO}
 
 
 def parse_args() -> argparse.Namespace:
     """Custom arg parser for parsing CLI arguments"""
     arg_parser = argparse.ArgumentParser()
-    if len(sys.argv) > 1 and not sys.argv[1].startswith("-"):
-        arg_parser.add_argument("src", type=str, help="The source file to translate")
+    arg_parser.add_argument(
+        "src",
+        type=str,
+        nargs="?",
+        help="The source file to translate ('-' reads the program from stdin)",
+    )
 
     arg_parser.add_argument(
         "-l",
@@ -34,20 +58,198 @@ def parse_args() -> argparse.Namespace:
         default=False,
         help="Verbose mode for the interpreter",
     )
+    arg_parser.add_argument(
+        "--log-level",
+        choices=LOG_LEVELS.keys(),
+        default="trace",
+        help="Detail of the verbose output: every token and node, "
+        "or only parsed constructs and file operations",
+    )
+    arg_parser.add_argument(
+        "--log-file",
+        type=str,
+        help="Write the verbose output (-l, -p, -i) to a file instead of the console",
+    )
+    arg_parser.add_argument(
+        "--tokenizer",
+        choices=TOKENIZERS.keys(),
+        default="hand",
+        help="Tokenizer backend: hand-written scanner or regex master pattern",
+    )
+    arg_parser.add_argument(
+        "--lazy",
+        action="store_true",
+        default=False,
+        help="Parse function bodies on their first call "
+        "(syntax errors in functions that are never called are not reported)",
+    )
+    arg_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=False,
+        help="Always parse the source file, without reading or writing its cached AST",
+    )
+    arg_parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="tree",
+        help="Evaluation engine: recursive AST visitor, explicit-stack evaluator "
+        "(the depth of programs is then only limited by the frame budget) "
+        "closures compiled from the AST (faster loops), "
+        "bytecode run by a virtual machine "
+        "or Python source transpiled from the AST and run by CPython",
+    )
+    arg_parser.add_argument(
+        "--dis",
+        action="store_true",
+        default=False,
+        help="Print the bytecode of the program instead of running it",
+    )
+    arg_parser.add_argument(
+        "--save-bytecode",
+        type=str,
+        metavar="PATH",
+        help=f"Compile the program to a bytecode file ({BYTECODE_SUFFIX}) "
+        "instead of running it, the file runs without its source",
+    )
+    arg_parser.add_argument(
+        "--save-py",
+        type=str,
+        metavar="PATH",
+        help="Transpile the program to a Python module instead of running it, "
+        "the module runs without the Nyaa front end (its errors are still reported "
+        "at source positions)",
+    )
+    arg_parser.add_argument(
+        "--memo-size",
+        type=int,
+        default=DEFAULT_MEMO_SIZE,
+        help="Maximum number of results memoized per function "
+        "(only functions without side effects, whose result depends on their "
+        "arguments alone, are memoized)",
+    )
+    arg_parser.add_argument(
+        "--no-memo",
+        action="store_true",
+        default=False,
+        help="Disable the memoization of function results",
+    )
+    arg_parser.add_argument(
+        "--no-fusion",
+        action="store_true",
+        default=False,
+        help="Interpret statements node by node, without fusing common shapes "
+        "(x++, x = x + k, a[i] = x, while loops comparing two operands) "
+        "into single nodes (tree engine)",
+    )
+    arg_parser.add_argument(
+        "--frame-budget",
+        type=int,
+        default=DEFAULT_FRAME_BUDGET,
+        help="Maximum number of pending evaluation frames of the stack engine",
+    )
     return arg_parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    lexer = Lexer(verbose=args.lexer)
-    parser = Parser(lexer=lexer, verbose=args.parser)
-    interpreter = Interpreter(verbose=args.interpreter)
+    with open(args.log_file, "w") if args.log_file else nullcontext() as log_file:
+        run(args, log_file)
 
-    if "src" not in args:
+
+def run(args: argparse.Namespace, log_file: Optional[TextIO]) -> None:
+    """
+    Runs the REPL or a program, as configured by the CLI arguments
+    @param log_file: The file verbose output is written to, None for the console
+    """
+
+    def logger(subsystem: str, enabled: bool) -> Optional[Logger]:
+        """Returns the logger of a subsystem, None if its verbose mode is disabled"""
+        if not enabled:
+            return None
+        return Logger(subsystem, LOG_LEVELS[args.log_level], log_file)
+
+    lexer = TOKENIZERS[args.tokenizer](logger=logger("lexer", args.lexer))
+    parser = Parser(
+        lexer=lexer, lazy_bodies=args.lazy, logger=logger("parser", args.parser)
+    )
+    interpreter_logger = logger("interpreter", args.interpreter)
+    memo_size = 0 if args.no_memo else args.memo_size
+    if args.engine == "stack":
+        interpreter = StackInterpreter(
+            frame_budget=args.frame_budget,
+            logger=interpreter_logger,
+            memo_size=memo_size,
+        )
+    elif args.engine == "closure":
+        interpreter = ClosureInterpreter(logger=interpreter_logger, memo_size=memo_size)
+    elif args.engine == "py":
+        interpreter = PyInterpreter(logger=interpreter_logger, memo_size=memo_size)
+    elif args.engine == "vm" or (args.src or "").endswith(BYTECODE_SUFFIX):
+        interpreter = VirtualMachine(logger=interpreter_logger, memo_size=memo_size)
+    else:
+        interpreter = Interpreter(
+            logger=interpreter_logger,
+            memo_size=memo_size,
+            fusion=not args.no_fusion,
+        )
+
+    if args.src is None:
         Repl(parser, interpreter).run()
+        return
+
+    if args.src.endswith(BYTECODE_SUFFIX):
+        try:
+            program, source_map = read_bytecode(args.src)
+        except (OSError, ValueError, EOFError) as e:
+            print(f"Error: '{args.src}' cannot be loaded: {e}", file=sys.stderr)
+            exit(1)
+    elif args.src == "-":
+        program = parser.parse_stream(sys.stdin)
+        source_map = parser.source_map
+    elif args.no_cache or args.lexer or args.parser:
+        # Lexer and parser logs are only produced when the source is parsed
+        program = parser.parse_source(filepath=args.src)
+        source_map = parser.source_map
     else:
-        AST = parser.parse_source(filepath=args.src)
-        interpreter.interpret(AST)
+        program, source_map = ASTCache(parser).parse_source(args.src)
+
+    if args.dis or args.save_bytecode:
+        code = compile_program(program, source_map)
+        if args.dis:
+            print(disassemble(code, source_map))
+        if args.save_bytecode:
+            write_bytecode(args.save_bytecode, code, source_map)
+        return
+
+    if args.save_py:
+        if isinstance(program, CodeObject):
+            print(f"Error: '{args.src}' is compiled bytecode", file=sys.stderr)
+            exit(1)
+        try:
+            # Lazily parsed bodies are parsed to be transpiled
+            write_module(args.save_py, program, source_map, args.src)
+        except (ParserError, LexerError) as e:
+            print(e, file=sys.stderr)
+            exit(1)
+        except InterpreterError as e:
+            print(e.locate(source_map), file=sys.stderr)
+            exit(1)
+        return
+
+    interpreter.interpret(program, source_map)
+
+
+def compile_program(program: Node | CodeObject, source_map: SourceMap) -> CodeObject:
+    """Compiles a program to bytecode (unless already compiled), exits on compile errors"""
+    if isinstance(program, CodeObject):
+        return program
+
+    try:
+        return BytecodeCompiler().compile_module(program)
+    except InterpreterError as e:
+        print(e.locate(source_map), file=sys.stderr)
+        exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,165 @@
+import hashlib
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Optional
+
+from src.Parser import Parser
+from src.core.ASTNodes import ProgramNode
+from src.core.Token import SourceMap
+from src.utils.Constants import (
+    CACHE_DIR,
+    CACHE_SUFFIX,
+    CACHE_MAGIC,
+    MAX_BULK_READ_SIZE,
+)
+
+# Modules whose code determines the AST produced for a source.
+# Any change to them invalidates every cached program.
+AST_MODULES = (
+    "src/Lexer.py",
+    "src/RegexLexer.py",
+    "src/Parser.py",
+    "src/core/ASTNodes.py",
+    "src/core/RuntimeObject.py",
+    "src/core/Token.py",
+    "src/core/Types.py",
+    "src/utils/Constants.py",
+)
+ROOT_DIR = Path(__file__).resolve().parent.parent
+# Pickling recurses (in C) through the AST. The interpreter raises the recursion
+# limit far beyond what the C stack can hold, so it is lowered while pickling:
+# deeper ASTs are simply not cached.
+MAX_PICKLE_DEPTH = 20000
+
+
+def build_digest(parser_options: str = "", modules: tuple = AST_MODULES) -> bytes:
+    """
+    Digest identifying the interpreter build that produces (and consumes) cached ASTs
+    @param parser_options: Parser settings that change the shape of the AST
+    @param modules: Modules whose code determines what is cached
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(CACHE_MAGIC)
+    digest.update(sys.version.encode())
+    digest.update(parser_options.encode())
+    for module in modules:
+        digest.update((ROOT_DIR / module).read_bytes())
+    return digest.digest()
+
+
+class ASTCache:
+    """
+    Stores parsed programs in a __nyaacache__ directory next to their source
+    (like Python's __pycache__), so unchanged sources skip lexing and parsing.
+
+    An entry is the magic number, the build digest and the source digest,
+    followed by the pickled AST and source map. Entries that are stale, corrupt
+    or unreadable are treated as misses and rewritten.
+    Failing to write an entry (e.g. a read-only directory) is not an error.
+    """
+
+    def __init__(self, parser: Parser):
+        """
+        @param parser: The parser used for sources that are not cached
+        """
+        self.__parser = parser
+        self.__build_digest = build_digest(parser.options)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def cache_path(source: Path) -> Path:
+        """Returns the path of the cache entry of a source file"""
+        return source.parent / CACHE_DIR / (source.stem + CACHE_SUFFIX)
+
+    def parse_source(self, filepath: str) -> tuple[ProgramNode, SourceMap]:
+        """
+        Parses a Nyaa source file, loading the AST from the cache when possible
+        @param filepath: Path to the source file
+        @return: The AST of the program and the source map to report its errors with
+        """
+        source = Path(filepath)
+        try:
+            if source.stat().st_size > MAX_BULK_READ_SIZE:
+                # Huge sources are streamed by the lexer rather than read in full
+                return self.__parse(filepath)
+
+            with open(source, "r") as source_file:
+                program = source_file.read()
+        except (OSError, ValueError):
+            # The parser reports missing and unreadable sources
+            return self.__parse(filepath)
+
+        source_digest = hashlib.sha256(
+            program.encode("utf-8", "surrogatepass")
+        ).digest()
+        cache_path = self.cache_path(source)
+        if cached := self.__load(cache_path, source_digest):
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        ast = self.__parser.parse_string(program)
+        source_map = self.__parser.source_map
+        self.__store(cache_path, source_digest, ast, source_map)
+        return ast, source_map
+
+    def __parse(self, filepath: str) -> tuple[ProgramNode, SourceMap]:
+        """Parses a source file without the cache"""
+        ast = self.__parser.parse_source(filepath)
+        return ast, self.__parser.source_map
+
+    def __header(self, source_digest: bytes) -> bytes:
+        """Returns the header identifying an up-to-date entry of a source"""
+        return CACHE_MAGIC + self.__build_digest + source_digest
+
+    def __load(
+        self, cache_path: Path, source_digest: bytes
+    ) -> Optional[tuple[ProgramNode, SourceMap]]:
+        """
+        Loads a cache entry
+        @return: The cached AST and source map, or None if the entry is missing, stale or corrupt
+        """
+        header = self.__header(source_digest)
+        try:
+            with open(cache_path, "rb") as entry:
+                if entry.read(len(header)) != header:
+                    return None
+                ast, source_map = pickle.load(entry)
+        except Exception:
+            return None
+
+        if not isinstance(ast, ProgramNode) or not isinstance(source_map, SourceMap):
+            return None
+        return ast, source_map
+
+    def __store(
+        self,
+        cache_path: Path,
+        source_digest: bytes,
+        ast: ProgramNode,
+        source_map: SourceMap,
+    ) -> None:
+        """Writes a cache entry, replacing any previous entry atomically"""
+        try:
+            recursion_limit = sys.getrecursionlimit()
+            sys.setrecursionlimit(min(recursion_limit, MAX_PICKLE_DEPTH))
+            try:
+                payload = pickle.dumps((ast, source_map), pickle.HIGHEST_PROTOCOL)
+            finally:
+                sys.setrecursionlimit(recursion_limit)
+
+            cache_path.parent.mkdir(exist_ok=True)
+            temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            try:
+                with open(temp_path, "wb") as entry:
+                    entry.write(self.__header(source_digest))
+                    entry.write(payload)
+                os.replace(temp_path, cache_path)
+            except OSError:
+                temp_path.unlink(missing_ok=True)
+                raise
+        except Exception:
+            return
@@ -0,0 +1,604 @@
+import pickle
+from typing import Any, Callable, Iterable, Optional
+
+from src.ASTCache import AST_MODULES, build_digest
+from src.EffectAnalyser import EffectAnalyser
+from src.core.ASTNodes import (
+    Node,
+    ProgramNode,
+    FuncDefNode,
+    BodyNode,
+    ReturnNode,
+    BreakNode,
+    ContinueNode,
+    IfNode,
+    WhileNode,
+    ForNode,
+    ArrayNode,
+    AssignmentNode,
+    PostfixExprNode,
+    CallNode,
+    PrintNode,
+    ArgsNode,
+    FileNode,
+    CharReprNode,
+    IntReprNode,
+    LengthNode,
+    ExprNode,
+    FactorNode,
+    BinaryOpNode,
+    UnaryOpNode,
+    LiteralNode,
+    LoadNode,
+    IdentifierNode,
+    NumericLiteralNode,
+    StringLiteralNode,
+    BooleanNode,
+    OperatorNode,
+    LazyBodyNode,
+)
+from src.core.Bytecode import OpCode, CodeObject, Site, BINARY_OPERATORS
+from src.core.RuntimeObject import SharedRunTimeObject
+from src.core.Token import SourceMap
+from src.utils.Constants import WARNING, BYTECODE_MAGIC
+from src.utils.ErrorHandler import InterpreterError, ErrorType
+
+# Modules whose code determines the bytecode compiled from an AST (and how it runs)
+BYTECODE_MODULES = AST_MODULES + (
+    "src/core/Bytecode.py",
+    "src/BytecodeCompiler.py",
+    "src/EffectAnalyser.py",
+    "src/VirtualMachine.py",
+)
+
+# Nodes compiled to instructions that leave no value on the stack
+STATEMENT_LABELS = {
+    "program",
+    "func_def",
+    "body",
+    "return",
+    "break",
+    "continue",
+    "if",
+    "while",
+    "for",
+    "array_def",
+    "array_update",
+    "assignment",
+    "print",
+    "file_open",
+    "file_write",
+}
+
+
+class Loop:
+    """A loop being compiled, with the jumps of the break statements leaving it"""
+
+    def __init__(self, continue_target: int):
+        """
+        @param continue_target: The instruction starting the next iteration
+        """
+        self.continue_target = continue_target
+        self.break_jumps: list[int] = []
+
+
+class BytecodeCompiler:
+    """
+    Compiles the AST into bytecode for the virtual machine.
+
+    Each construct is compiled to the instructions reproducing how the tree
+    interpreter evaluates it: operands are evaluated in the same order and errors
+    are reported by the same handlers. Break and continue statements jump out of
+    the innermost loop or to its next iteration, and return statements return from
+    the function (or jump to the end of the program), so bodies run straight through.
+    """
+
+    def __init__(self):
+        # Compile methods indexed by node label
+        self.__compile_methods: dict[str, Callable[[Any], None]] = {
+            name.removeprefix("compile_"): getattr(self, name)
+            for name in dir(self)
+            if name.startswith("compile_")
+            and name not in ("compile_module", "compile_function")
+        }
+        self.__code: Optional[CodeObject] = None
+        self.__const_indices: dict[tuple, int] = {}
+        self.__name_indices: dict[str, int] = {}
+        # Loops enclosing the statement compiled, innermost last
+        self.__loops: list[Loop] = []
+        # Jumps to the end of the program (return statements of the main program)
+        self.__exit_jumps: Optional[list[int]] = None
+
+    def compile_module(self, node: Node) -> CodeObject:
+        """
+        Compiles a program (or a REPL input) into the code run by the virtual machine
+        @param node: The root node
+        @return: Code returning the value of the node if it is an expression, else None
+        """
+        code = self.__begin(CodeObject("<main>"))
+        self.__exit_jumps = []
+        self.compile(node)
+        self.__emit(OpCode.RETURN_VALUE)
+        if self.__exit_jumps:
+            # Statements leaving the program jump here, past any loop state on the stack
+            exit_label = self.__emit(OpCode.LOAD_NONE)
+            self.__emit(OpCode.RETURN_VALUE)
+            for exit_jump in self.__exit_jumps:
+                self.__patch(exit_jump, exit_label)
+        return self.__end(code)
+
+    def compile_function(
+        self, name: str, params: Iterable[str], body: BodyNode
+    ) -> CodeObject:
+        """
+        Compiles the body of a function, returning to the caller at its end
+        @param params: The names of the parameters of the function
+        """
+        code = self.__begin(CodeObject(name))
+        self.__compile_statement(body)
+        self.__emit(OpCode.LOAD_NONE)
+        self.__emit(OpCode.RETURN_FRAME)
+        if body is not None:
+            self.__code.callees = EffectAnalyser().analyse(params, body)
+        return self.__end(code)
+
+    def __begin(self, code: CodeObject) -> tuple:
+        """Starts emitting instructions to a code object, returns the state of the enclosing one"""
+        enclosing = (
+            self.__code,
+            self.__const_indices,
+            self.__name_indices,
+            self.__loops,
+            self.__exit_jumps,
+        )
+        self.__code, self.__const_indices, self.__name_indices = code, {}, {}
+        self.__loops, self.__exit_jumps = [], None
+        return enclosing
+
+    def __end(self, enclosing: tuple) -> CodeObject:
+        """Finishes emitting instructions to a code object and returns it"""
+        code = self.__code
+        (
+            self.__code,
+            self.__const_indices,
+            self.__name_indices,
+            self.__loops,
+            self.__exit_jumps,
+        ) = enclosing
+        return code
+
+    def compile(self, node: Node) -> None:
+        """
+        Compiles a node leaving its value on the stack,
+        None for a statement (the parser accepts a few in expressions, e.g. after modoru)
+        """
+        self.__compile_node(node)
+        if node.label in STATEMENT_LABELS:
+            self.__emit(OpCode.LOAD_NONE, node=node)
+
+    def __compile_node(self, node: Node) -> None:
+        """Compiles a node, falling back to evaluating it with its visit method"""
+        compile_method = self.__compile_methods.get(node.label)
+        if compile_method:
+            compile_method(node)
+        else:
+            self.__compile_eval(node)
+
+    def __emit(self, op: OpCode, arg: int = 0, node: Optional[Node] = None) -> int:
+        """
+        Appends an instruction to the code
+        @param node: The node compiled, its position is recorded in the line table
+        @return: The index of the instruction
+        """
+        code = self.__code
+        pc = len(code.instructions)
+        if node is not None:
+            code.line_table.add(pc, node.start_pos, node.end_pos)
+        code.instructions += (int(op), arg)
+        return pc
+
+    def __label(self) -> int:
+        """Returns the index of the next instruction"""
+        return len(self.__code.instructions)
+
+    def __patch(self, pc: int, target: int) -> None:
+        """Sets the target of a jump instruction"""
+        self.__code.instructions[pc + 1] = target
+
+    def __const(self, label: str, value: Any) -> int:
+        """Returns the index of a constant in the constant pool"""
+        key = (label, type(value), value)
+        if key not in self.__const_indices:
+            self.__const_indices[key] = len(self.__code.consts)
+            self.__code.consts.append(SharedRunTimeObject(label, value))
+        return self.__const_indices[key]
+
+    def __name(self, name: str) -> int:
+        """Returns the index of a name in the name table"""
+        if name not in self.__name_indices:
+            self.__name_indices[name] = len(self.__code.names)
+            self.__code.names.append(name)
+        return self.__name_indices[name]
+
+    def __site(self, node: Node, **attributes) -> int:
+        """Returns the index of a new site of a node"""
+        self.__code.sites.append(Site(node, **attributes))
+        return len(self.__code.sites) - 1
+
+    def __compile_eval(self, node: Node) -> None:
+        """Compiles a node to be evaluated by its visit method (which reports invalid nodes)"""
+        self.__code.nodes.append(node)
+        self.__emit(OpCode.EVAL_NODE, len(self.__code.nodes) - 1, node)
+        if node.label in STATEMENT_LABELS:
+            self.__emit(OpCode.POP_TOP, node=node)
+
+    def __compile_statement(self, node: Node) -> None:
+        """Compiles a statement, discarding the value of expression statements"""
+        self.__compile_node(node)
+        if node.label not in STATEMENT_LABELS:
+            self.__emit(OpCode.POP_TOP, node=node)
+
+    def compile_program(self, node: ProgramNode) -> None:
+        if node.eof:
+            return
+
+        for func in node.functions:
+            self.__compile_statement(func)
+
+        if node.body:
+            self.__compile_statement(node.body)
+
+    def compile_func_def(self, node: FuncDefNode) -> None:
+        params = {}
+        if node.args:
+            for arg in node.args.children:
+                if arg.value in params:
+                    raise InterpreterError(
+                        ErrorType.RUNTIME,
+                        f"Duplicate parameter {WARNING}'{arg.value}'",
+                        node.args.start_pos,
+                        node.args.end_pos,
+                    )
+                params[arg.value] = "identifier"
+
+        body = node.body
+        if not isinstance(body, LazyBodyNode):
+            # Lazily parsed bodies are compiled on their first call
+            body = self.compile_function(node.identifier, params, body)
+
+        self.__code.consts.append((node.identifier, params, body))
+        self.__emit(OpCode.MAKE_FUNCTION, len(self.__code.consts) - 1, node)
+
+    def compile_body(self, node: BodyNode) -> None:
+        for stmt in node.statements:
+            self.__compile_statement(stmt)
+
+    def compile_return(self, node: ReturnNode) -> None:
+        self.__emit(OpCode.SET_POSITION, self.__site(node), node)
+        if node.tail_call:
+            # The call replaces the frame, unless its result is memoized
+            self.__compile_call(node.expr, OpCode.TAIL_CALL)
+            self.__emit(OpCode.RETURN_FRAME, node=node)
+            return
+        if node.expr:
+            self.compile(node.expr)
+        else:
+            self.__emit(OpCode.LOAD_NONE, node=node)
+        self.__compile_exit(node)
+
+    def __compile_exit(self, node: Node) -> None:
+        """
+        Compiles leaving the function with the value on top of the stack,
+        or leaving the main program
+        """
+        if self.__exit_jumps is None:
+            self.__emit(OpCode.RETURN_FRAME, node=node)
+        else:
+            self.__emit(OpCode.POP_TOP, node=node)
+            self.__exit_jumps.append(self.__emit(OpCode.JUMP, node=node))
+
+    def compile_break(self, node: BreakNode) -> None:
+        if not self.__loops:
+            # Outside loops, break ends the function (or the program) as a bare return does
+            self.__emit(OpCode.LOAD_NONE, node=node)
+            return self.__compile_exit(node)
+        self.__loops[-1].break_jumps.append(self.__emit(OpCode.JUMP, node=node))
+
+    def compile_continue(self, node: ContinueNode) -> None:
+        if not self.__loops:
+            # Outside loops, continue ends the function (or the program) as a bare return does
+            self.__emit(OpCode.LOAD_NONE, node=node)
+            return self.__compile_exit(node)
+        self.__emit(OpCode.JUMP, self.__loops[-1].continue_target, node)
+
+    def __compile_conditional_body(self, body: Optional[BodyNode]) -> None:
+        if body:
+            self.__compile_statement(body)
+
+    def compile_if(self, node: IfNode) -> None:
+        exits = []
+        branches = [(node.expr, node.body)]
+        branches += [(stmt.expr, stmt.body) for stmt in node.else_if_statements]
+        for i, (condition, body) in enumerate(branches):
+            self.compile(condition)
+            next_branch = self.__emit(OpCode.POP_JUMP_IF_FALSE, node=condition)
+            self.__compile_conditional_body(body)
+            if i < len(branches) - 1 or node.else_body:
+                exits.append(self.__emit(OpCode.JUMP, node=node))
+            self.__patch(next_branch, self.__label())
+
+        if node.else_body:
+            self.__compile_conditional_body(node.else_body)
+
+        end = self.__label()
+        for exit_jump in exits:
+            self.__patch(exit_jump, end)
+
+    def compile_while(self, node: WhileNode) -> None:
+        condition = self.__label()
+        self.compile(node.expr)
+        exit_jump = self.__emit(OpCode.POP_JUMP_IF_FALSE, node=node.expr)
+        loop = self.__compile_loop_body(node.body, condition)
+        self.__emit(OpCode.JUMP, condition, node)
+
+        end = self.__label()
+        self.__patch(exit_jump, end)
+        for break_jump in loop.break_jumps:
+            self.__patch(break_jump, end)
+
+    def compile_for(self, node: ForNode) -> None:
+        # Each range value is checked before the next one is evaluated
+        self.compile(node.range_start)
+        self.__emit(OpCode.RANGE_VALUE, self.__site(node.range_start), node)
+        self.compile(node.range_end)
+        self.__emit(OpCode.RANGE_VALUE, self.__site(node.range_end), node)
+        self.__emit(OpCode.FOR_SETUP, self.__name(node.identifier.value), node)
+
+        iteration = self.__emit(OpCode.FOR_ITER, node=node)
+        loop = self.__compile_loop_body(node.body, iteration)
+        self.__emit(OpCode.JUMP, iteration, node)
+
+        if loop.break_jumps:
+            # Breaking out of the loop pops the iterator and the loop variable
+            break_target = self.__emit(OpCode.POP_TOP, node=node)
+            self.__emit(OpCode.POP_TOP, node=node)
+            for break_jump in loop.break_jumps:
+                self.__patch(break_jump, break_target)
+        self.__patch(iteration, self.__label())
+
+    def __compile_loop_body(
+        self, body: Optional[BodyNode], continue_target: int
+    ) -> Loop:
+        """Compiles the body of a loop, returning the loop with its break jumps"""
+        loop = Loop(continue_target)
+        self.__loops.append(loop)
+        self.__compile_conditional_body(body)
+        self.__loops.pop()
+        return loop
+
+    def compile_array_def(self, node: ArrayNode) -> None:
+        self.__emit(OpCode.SET_POSITION, self.__site(node), node)
+        if node.size:
+            self.compile(node.size)
+            self.__emit(OpCode.ARRAY_OF_SIZE, node=node)
+        elif node.initial_values:
+            for value in node.initial_values:
+                self.compile(value)
+            self.__emit(OpCode.BUILD_LIST, len(node.initial_values), node)
+        elif node.string_value:
+            self.compile(node.string_value)
+            self.__emit(OpCode.ARRAY_OF_STRING, node=node)
+        else:
+            self.__emit(OpCode.BUILD_LIST, 0, node)
+        self.__emit(OpCode.STORE_ARRAY, self.__name(node.identifier), node)
+
+    def compile_array_access(self, node: ArrayNode) -> None:
+        if not node.index:
+            return self.__compile_eval(node)
+
+        self.compile(node.index)
+        site = self.__site(node, identifier=node.identifier)
+        self.__emit(OpCode.ARRAY_LOAD, site, node)
+
+    def compile_array_update(self, node: ArrayNode) -> None:
+        if not node.index or not node.value:
+            return self.__compile_eval(node)
+
+        site = self.__site(node, identifier=node.identifier)
+        self.__emit(OpCode.SET_POSITION, site, node)
+        self.compile(node.index)
+        self.compile(node.value)
+        self.__emit(OpCode.ARRAY_STORE, site, node)
+
+    def compile_assignment(self, node: AssignmentNode) -> None:
+        if not isinstance(node.left, IdentifierNode):
+            return self.__compile_eval(node)
+
+        self.compile(node.right)
+        self.__emit(OpCode.STORE_NAME, self.__name(node.left.value), node)
+
+    def compile_postfix_expr(self, node: PostfixExprNode) -> None:
+        if not isinstance(node.left, IdentifierNode):
+            return self.__compile_eval(node)
+
+        op = OpCode.INCREMENT_NAME if node.operator == "++" else OpCode.DECREMENT_NAME
+        self.__emit(op, self.__name(node.left.value), node)
+
+    def compile_call(self, node: CallNode) -> None:
+        self.__compile_call(node, OpCode.CALL)
+
+    def __compile_call(self, node: CallNode, op: OpCode) -> None:
+        """Compiles a call, made by the given call instruction"""
+        site = self.__site(
+            node,
+            identifier=node.identifier,
+            args=Site(node.args) if node.args else None,
+        )
+        self.__emit(OpCode.CALL_SETUP, site, node)
+        if node.args:
+            self.compile_args(node.args)
+        else:
+            self.__emit(OpCode.LOAD_NONE, node=node)
+        self.__emit(op, site, node)
+
+    def compile_args(self, node: ArgsNode) -> None:
+        for arg_node in node.children:
+            self.compile(arg_node)
+        self.__emit(OpCode.BUILD_LIST, len(node.children), node)
+
+    def compile_print(self, node: PrintNode) -> None:
+        if not node.args:
+            return self.__compile_eval(node)
+
+        self.compile_args(node.args)
+        self.__emit(OpCode.PRINT, self.__site(node, println=node.println), node)
+
+    def compile_file_open(self, node: FileNode) -> None:
+        if not node.filepath or not node.access_mode or not node.identifier:
+            return self.__compile_eval(node)
+
+        self.compile(node.filepath)
+        self.compile(node.access_mode)
+        site = self.__site(node, identifier=node.identifier)
+        self.__emit(OpCode.FILE_OPEN, site, node)
+
+    def compile_file_write(self, node: FileNode) -> None:
+        if not node.identifier or not node.write_buffer:
+            return self.__compile_eval(node)
+
+        site = self.__site(
+            node, identifier=node.identifier, is_write_line=node.is_write_line
+        )
+        self.__emit(OpCode.FILE_LOOKUP, site, node)
+        self.compile(node.write_buffer)
+        self.__emit(OpCode.FILE_WRITE, site, node)
+
+    def compile_file_read(self, node: FileNode) -> None:
+        if not node.identifier:
+            return self.__compile_eval(node)
+
+        site = self.__site(node, identifier=node.identifier)
+        self.__emit(OpCode.FILE_LOOKUP, site, node)
+        if node.n_chars_to_read:
+            self.compile(node.n_chars_to_read)
+        else:
+            self.__emit(OpCode.LOAD_NONE, node=node)
+        self.__emit(OpCode.FILE_READ, site, node)
+
+    def compile_char_repr(self, node: CharReprNode) -> None:
+        self.compile(node.expr)
+        self.__emit(OpCode.CHAR_REPR, self.__site(node), node)
+
+    def compile_int_repr(self, node: IntReprNode) -> None:
+        self.compile(node.expr)
+        self.__emit(OpCode.INT_REPR, self.__site(node), node)
+
+    def compile_length(self, node: LengthNode) -> None:
+        self.compile(node.expr)
+        self.__emit(OpCode.LENGTH, self.__site(node), node)
+
+    def compile_binary_op(self, node: BinaryOpNode) -> None:
+        if node.operator not in BINARY_OPERATORS:
+            return self.__compile_eval(node)
+
+        self.compile(node.left)
+        self.compile(node.right)
+        self.__emit(OpCode.BINARY_OP, BINARY_OPERATORS.index(node.operator), node)
+
+    def compile_unary_op(self, node: UnaryOpNode) -> None:
+        self.compile(node.operand)
+        site = self.__site(node, operator=node.operator)
+        self.__emit(OpCode.UNARY_OP, site, node)
+
+    def compile_literal(self, node: LiteralNode) -> None:
+        self.__emit(OpCode.LOAD_CONST, self.__const(node.kind, node.value), node)
+
+    def compile_load(self, node: LoadNode) -> None:
+        self.__emit(OpCode.LOAD_NAME, self.__name(node.identifier), node)
+
+    def compile_expr(self, node: ExprNode) -> None:
+        if not node.left or (node.operator and not node.right):
+            return self.__compile_eval(node)
+
+        self.__emit(OpCode.SET_POSITION, self.__site(node), node)
+        self.__compile_nested_expr(node)
+
+    def compile_simple_expr(self, node: ExprNode) -> None:
+        if not node.left or (node.operator and not node.right):
+            return self.__compile_eval(node)
+
+        self.__compile_nested_expr(node)
+
+    def compile_term(self, node: ExprNode) -> None:
+        self.compile_simple_expr(node)
+
+    def __compile_nested_expr(self, node: ExprNode) -> None:
+        """Compiles an operand of a nested expression, resolving its identifiers"""
+        self.compile(node.left)
+        self.__emit(OpCode.RESOLVE_IDENTIFIER, node=node)
+        if node.operator:
+            self.compile(node.right)
+            self.__emit(OpCode.RESOLVE_IDENTIFIER, node=node)
+            site = self.__site(node, operator=node.operator)
+            self.__emit(OpCode.NESTED_OP, site, node)
+
+    def compile_factor(self, node: FactorNode) -> None:
+        if not node.left:
+            return self.__compile_eval(node)
+
+        self.compile(node.left)
+        self.__emit(OpCode.RESOLVE_IDENTIFIER, node=node)
+        if node.right:
+            self.compile(node.right)
+            self.__emit(OpCode.RESOLVE_IDENTIFIER, node=node)
+            self.__emit(OpCode.FACTOR_OP, node=node)
+
+    def compile_identifier(self, node: IdentifierNode) -> None:
+        self.__emit(OpCode.LOAD_CONST, self.__const("identifier", node.value), node)
+
+    def compile_operator(self, node: OperatorNode) -> None:
+        self.__emit(OpCode.LOAD_CONST, self.__const("operator", node.value), node)
+
+    def compile_numeric_literal(self, node: NumericLiteralNode) -> None:
+        self.__emit(OpCode.LOAD_CONST, self.__const("number", node.value), node)
+
+    def compile_string_literal(self, node: StringLiteralNode) -> None:
+        self.__emit(OpCode.LOAD_CONST, self.__const("string", node.value), node)
+
+    def compile_boolean_literal(self, node: BooleanNode) -> None:
+        self.__emit(OpCode.LOAD_CONST, self.__const("boolean", node.value), node)
+
+
+def write_bytecode(path: str, code: CodeObject, source_map: SourceMap) -> None:
+    """
+    Writes compiled code to a bytecode file, to be run without the source
+    @param path: The path of the bytecode file
+    @param code: The code of the program
+    @param source_map: The source map of the program, to report its errors with
+    """
+    with open(path, "wb") as bytecode_file:
+        bytecode_file.write(BYTECODE_MAGIC + build_digest(modules=BYTECODE_MODULES))
+        pickle.dump((code, source_map), bytecode_file, pickle.HIGHEST_PROTOCOL)
+
+
+def read_bytecode(path: str) -> tuple[CodeObject, SourceMap]:
+    """
+    Reads the code of a program from a bytecode file
+    @param path: The path of the bytecode file
+    @return: The code of the program and its source map
+    @raise ValueError: If the file was not written by this build of the compiler,
+    or it is corrupt
+    """
+    header = BYTECODE_MAGIC + build_digest(modules=BYTECODE_MODULES)
+    with open(path, "rb") as bytecode_file:
+        if bytecode_file.read(len(header)) != header:
+            raise ValueError("Bytecode compiled by another version of Nyaa")
+        try:
+            code, source_map = pickle.load(bytecode_file)
+        except Exception as e:
+            # A truncated or corrupt payload fails in many ways (as the AST cache sees)
+            raise ValueError("Corrupt Nyaa bytecode file") from e
+
+    if not isinstance(code, CodeObject) or not isinstance(source_map, SourceMap):
+        raise ValueError("Not a Nyaa bytecode file")
+    return code, source_map
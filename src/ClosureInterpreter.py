@@ -0,0 +1,592 @@
+from typing import Any, Callable, Optional
+
+from src.Interpreter import (
+    Interpreter,
+    OPERATIONS,
+    DEFAULT_MEMO_SIZE,
+    MAX_VISIT_DEPTH,
+)
+from src.core.ASTNodes import (
+    Node,
+    ProgramNode,
+    BodyNode,
+    ReturnNode,
+    BreakNode,
+    ContinueNode,
+    IfNode,
+    WhileNode,
+    ForNode,
+    ArrayNode,
+    AssignmentNode,
+    PostfixExprNode,
+    CallNode,
+    PrintNode,
+    ArgsNode,
+    FileNode,
+    CharReprNode,
+    IntReprNode,
+    LengthNode,
+    BinaryOpNode,
+    UnaryOpNode,
+    LiteralNode,
+    LoadNode,
+    IdentifierNode,
+    NumericLiteralNode,
+    StringLiteralNode,
+    BooleanNode,
+)
+from src.core.Completion import Completion, BREAK, CONTINUE
+from src.core.RuntimeObject import RunTimeObject
+from src.core.Symbol import VarSymbol, FunctionSymbol
+from src.utils.Logger import Logger, LogLevel
+
+# A compiled node, called without arguments to execute (or evaluate) the node
+Closure = Callable[[], Any]
+
+
+class ClosureInterpreter(Interpreter):
+    """
+    Interprets the AST by compiling it into nested Python closures.
+
+    Every node is compiled once into a closure that executes it, with its children
+    compiled into the closures it calls. Operators, the names read and written and
+    the shape of the control flow are resolved while compiling, so executing a loop
+    body just calls closures instead of dispatching its nodes again on every iteration.
+    Function bodies are compiled on their first call.
+
+    Variables live in the environments of the tree interpreter and errors are reported
+    the same way. Nodes that are rarely executed (function definitions, input, file
+    reads and closes) and nested expression trees are compiled to their visit method.
+    """
+
+    def __init__(
+        self,
+        verbose: bool = False,
+        logger: Optional[Logger] = None,
+        memo_size: int = DEFAULT_MEMO_SIZE,
+    ):
+        """
+        @param verbose: Flag to enable logging (to the console, if no logger is given)
+        @param logger: Logger of the interpreter subsystem
+        @param memo_size: Maximum number of results memoized per pure function
+        """
+        # Fused and quickened nodes are only run by the tree interpreter
+        super().__init__(
+            verbose=verbose,
+            logger=logger,
+            memo_size=memo_size,
+            fusion=False,
+            quickening=False,
+        )
+
+        # Traced programs are walked by the tree interpreter, which logs every node visited
+        self.__trace = self.logger is not None and self.logger.enabled_for(
+            LogLevel.TRACE
+        )
+
+        # Compile methods indexed by node label
+        self.__compile_methods: dict[str, Callable[[Node], Closure]] = {
+            name.removeprefix("compile_"): getattr(self, name)
+            for name in dir(self)
+            if name.startswith("compile_")
+        }
+
+        # Compiled function bodies, indexed by their body node
+        self.__compiled_bodies: dict[Node, Closure] = {}
+        self.__compile_depth = 0  # Depth of the node compiled
+
+    def evaluate(self, node: Node):
+        """Compiles a node (and its children) into a closure and returns the result of calling it"""
+        if self.__trace:
+            return super().evaluate(node)
+        return self.compile(node)()
+
+    def compile(self, node: Node) -> Closure:
+        """
+        Compiles a node into a closure, falling back to its visit method
+        @raise RecursionError: If the nodes are nested deeper than the visitor allows
+        (the closures of nested nodes call each other as deeply when executed)
+        """
+        if self.__compile_depth >= MAX_VISIT_DEPTH:
+            raise RecursionError(
+                "Compile depth exceeded! The code is nested too deeply to be compiled"
+            )
+
+        self.__compile_depth += 1
+        try:
+            compile_method = self.__compile_methods.get(node.label)
+            if compile_method:
+                return compile_method(node)
+            return self.__compile_visit(node)
+        finally:
+            self.__compile_depth -= 1
+
+    def compiled_body(self, function_symbol: FunctionSymbol) -> Closure:
+        """Returns the compiled body of a function, compiling it on the first call"""
+        body = self.function_body(function_symbol)
+        closure = self.__compiled_bodies.get(body)
+        if closure is None:
+            closure = self.__compiled_bodies[body] = self.compile(body)
+        return closure
+
+    def compile_program(self, node: ProgramNode) -> Closure:
+        if node.eof:
+            return lambda: None
+
+        statements = [self.compile(func) for func in node.functions]
+        if node.body:
+            statements.append(self.compile(node.body))
+
+        def program():
+            for statement in statements:
+                statement()
+
+        return program
+
+    def compile_body(self, node: BodyNode) -> Closure:
+        statements = tuple([self.compile(stmt) for stmt in node.statements])
+
+        if not node.transfers:
+
+            def body():
+                for statement in statements:
+                    statement()
+
+            return body
+
+        def transferring_body():
+            for statement in statements:
+                completion = statement()
+                if completion.__class__ is Completion:
+                    return completion
+
+        return transferring_body
+
+    def compile_return(self, node: ReturnNode) -> Closure:
+        if node.tail_call:
+            return self.__compile_tail_call(node)
+        start_pos, end_pos = node.start_pos, node.end_pos
+        expr = self.compile(node.expr) if node.expr else None
+
+        def return_statement():
+            self.node_start_pos = start_pos
+            self.node_end_pos = end_pos
+            return Completion("return", expr() if expr else None)
+
+        return return_statement
+
+    def __compile_tail_call(self, node: ReturnNode) -> Closure:
+        """Compiles a return statement returning the result of a call (see visit_return)"""
+        start_pos, end_pos = node.start_pos, node.end_pos
+        call_node = node.expr
+        args = self.compile(call_node.args) if call_node.args else None
+
+        def tail_call():
+            self.node_start_pos = start_pos
+            self.node_end_pos = end_pos
+            function_symbol = self.lookup_function(call_node)
+            function_args = args() if args else None
+            return Completion("tail_call", (call_node, function_symbol, function_args))
+
+        return tail_call
+
+    def compile_break(self, node: BreakNode) -> Closure:
+        start_pos, end_pos = node.start_pos, node.end_pos
+
+        def break_statement():
+            self.node_start_pos = start_pos
+            self.node_end_pos = end_pos
+            return BREAK
+
+        return break_statement
+
+    def compile_continue(self, node: ContinueNode) -> Closure:
+        start_pos, end_pos = node.start_pos, node.end_pos
+
+        def continue_statement():
+            self.node_start_pos = start_pos
+            self.node_end_pos = end_pos
+            return CONTINUE
+
+        return continue_statement
+
+    def __compile_conditional_body(self, body_node: Optional[BodyNode]) -> Closure:
+        """Compiles a conditional body, returning its completion record (if any) when executed"""
+        if not body_node:
+            return lambda: None
+        return self.compile(body_node)
+
+    def compile_if(self, node: IfNode) -> Closure:
+        condition = self.compile(node.expr)
+        body = self.__compile_conditional_body(node.body)
+        if not node.else_if_statements and not node.else_body:
+
+            def if_statement():
+                if condition().value:
+                    return body()
+
+            return if_statement
+
+        # Closures are compiled in list comprehensions, which do not recurse in C
+        # (as generators consumed by tuple do), so deeply nested nodes compile
+        branches = ((condition, body),) + tuple(
+            [
+                (
+                    self.compile(else_if_stmt.expr),
+                    self.__compile_conditional_body(else_if_stmt.body),
+                )
+                for else_if_stmt in node.else_if_statements
+            ]
+        )
+        else_body = (
+            self.__compile_conditional_body(node.else_body) if node.else_body else None
+        )
+
+        def if_elif_else_statement():
+            for branch_condition, branch_body in branches:
+                if branch_condition().value:
+                    return branch_body()
+
+            if else_body:
+                return else_body()
+
+        return if_elif_else_statement
+
+    def compile_while(self, node: WhileNode) -> Closure:
+        condition = self.compile(node.expr)
+        body = self.__compile_conditional_body(node.body)
+
+        if not node.body or not node.body.transfers:
+
+            def while_loop():
+                while condition().value:
+                    body()
+
+            return while_loop
+
+        def transferring_while_loop():
+            while condition().value:
+                completion = body()
+                if completion is BREAK:
+                    break
+                if completion is not None and completion is not CONTINUE:
+                    return completion
+
+        return transferring_while_loop
+
+    def compile_for(self, node: ForNode) -> Closure:
+        range_start_node, range_end_node = node.range_start, node.range_end
+        range_start = self.compile(range_start_node)
+        range_end = self.compile(range_end_node)
+        identifier = node.identifier.value
+        body = self.__compile_conditional_body(node.body)
+        transfers = node.body is not None and node.body.transfers
+        handle_range_value = self.handle_range_value
+
+        def for_loop():
+            start = handle_range_value(range_start_node, range_start())
+            end = handle_range_value(range_end_node, range_end())
+
+            # Create iterator in symbol table
+            iterator_runtime_object = RunTimeObject(label="number", value=0)
+            self.current_env.insert_symbol(
+                identifier, VarSymbol(identifier, iterator_runtime_object)
+            )
+
+            incrementer = 1 if start < end else -1
+            if not transfers:
+                for i in range(start, end, incrementer):
+                    iterator_runtime_object.value = i
+                    body()
+                return None
+
+            for i in range(start, end, incrementer):
+                iterator_runtime_object.value = i
+                completion = body()
+                if completion is BREAK:
+                    break
+                if completion is not None and completion is not CONTINUE:
+                    return completion
+
+        return for_loop
+
+    def compile_array_def(self, node: ArrayNode) -> Closure:
+        start_pos, end_pos = node.start_pos, node.end_pos
+        identifier = node.identifier
+        if node.size:
+            size = self.compile(node.size)
+
+            def array_values():
+                array_size = self._test_for_identifier(size()).value
+                return [RunTimeObject(label="number", value=0)] * int(array_size)
+
+        elif node.initial_values:
+            initial_values = tuple(
+                [self.compile(value) for value in node.initial_values]
+            )
+
+            def array_values():
+                values = [value() for value in initial_values]
+                return [value.copy() if value.shared else value for value in values]
+
+        elif node.string_value:
+            string_value = self.compile(node.string_value)
+
+            def array_values():
+                return [
+                    RunTimeObject("string", value=char) for char in string_value().value
+                ]
+
+        else:
+            array_values = list
+
+        def array_def():
+            self.node_start_pos = start_pos
+            self.node_end_pos = end_pos
+            values = array_values()
+            self.current_env.insert_symbol(
+                identifier, VarSymbol(identifier, RunTimeObject("array", values))
+            )
+
+        return array_def
+
+    def compile_array_access(self, node: ArrayNode) -> Closure:
+        if not node.index:
+            return self.__compile_visit(node)
+
+        index = self.compile(node.index)
+        handle_array_access = self.handle_array_access
+        return lambda: handle_array_access(node, index())
+
+    def compile_array_update(self, node: ArrayNode) -> Closure:
+        if not node.index or not node.value:
+            return self.__compile_visit(node)
+
+        start_pos, end_pos = node.start_pos, node.end_pos
+        index = self.compile(node.index)
+        value = self.compile(node.value)
+        handle_array_update = self.handle_array_update
+
+        def array_update():
+            self.node_start_pos = start_pos
+            self.node_end_pos = end_pos
+            index_object = index()
+            handle_array_update(node, index_object, value())
+
+        return array_update
+
+    def compile_assignment(self, node: AssignmentNode) -> Closure:
+        if not isinstance(node.left, IdentifierNode):
+            return self.__compile_visit(node)
+
+        identifier = node.left.value
+        right = self.compile(node.right)
+
+        def assignment_to_identifier():
+            rhs = right()
+            if rhs.label in "function":
+                runtime_object = rhs
+            else:
+                runtime_object = RunTimeObject(rhs.label, rhs.value)
+            self.current_env.insert_symbol(
+                identifier, VarSymbol(identifier, runtime_object)
+            )
+
+        return assignment_to_identifier
+
+    def compile_postfix_expr(self, node: PostfixExprNode) -> Closure:
+        if not isinstance(node.left, IdentifierNode):
+            return self.__compile_visit(node)
+
+        identifier = node.left.value
+        step = 1 if node.operator == "++" else -1
+
+        def postfix_expr():
+            runtime_object = self.current_env.lookup_symbol(identifier)
+            runtime_object.value += step
+            return RunTimeObject("number", runtime_object.value)
+
+        return postfix_expr
+
+    def compile_call(self, node: CallNode) -> Closure:
+        args = self.compile(node.args) if node.args else None
+
+        def call():
+            self.check_for_stack_overflow(node)
+            function_symbol = self.lookup_function(node)
+            function_args = args() if args else None
+            local_env = self.bind_arguments(node, function_symbol, function_args)
+            old_env = self.current_env
+            memoized = []  # Memo keys of the calls returning the result
+            while True:
+                body = self.compiled_body(function_symbol)
+                self.current_env = local_env
+
+                # Return the result of a previous call of a pure function, else execute its body
+                memo_key = self.memo_key(function_symbol, function_args)
+                if memo_key is not None:
+                    result = function_symbol.memo.get(memo_key)
+                    if result is not None:
+                        break
+                    memoized.append((function_symbol, memo_key))
+
+                # Break and continue statements outside loops end the function as well
+                completion = body()
+                if completion is None or completion.kind != "tail_call":
+                    result = completion.value if completion is not None else None
+                    break
+
+                # The call returned by the function runs in this frame
+                _, function_symbol, function_args, local_env = self.bind_tail_call(
+                    completion, function_symbol
+                )
+
+            for function_symbol, memo_key in memoized:
+                function_symbol.memo.put(memo_key, result)
+            self.current_env = old_env
+            self.release_stack_frame()
+            return result
+
+        return call
+
+    def compile_print(self, node: PrintNode) -> Closure:
+        args = self.compile(node.args)
+        handle_print = self.handle_print
+        return lambda: handle_print(node, args())
+
+    def compile_args(self, node: ArgsNode) -> Closure:
+        args = tuple([self.compile(arg_node) for arg_node in node.children])
+        return lambda: [arg() for arg in args]
+
+    def compile_file_open(self, node: FileNode) -> Closure:
+        if not node.filepath or not node.access_mode or not node.identifier:
+            return self.__compile_visit(node)
+
+        filepath = self.compile(node.filepath)
+        access_mode = self.compile(node.access_mode)
+
+        def file_open():
+            filepath_object = filepath()
+            self.handle_file_open(node, filepath_object, access_mode())
+
+        return file_open
+
+    def compile_file_write(self, node: FileNode) -> Closure:
+        if not node.identifier or not node.write_buffer:
+            return self.__compile_visit(node)
+
+        write_buffer = self.compile(node.write_buffer)
+
+        def file_write():
+            file = self.lookup_file(node)
+            self.handle_file_write(node, file, write_buffer())
+
+        return file_write
+
+    def compile_char_repr(self, node: CharReprNode) -> Closure:
+        expr = self.compile(node.expr)
+        handle_char_repr = self.handle_char_repr
+        return lambda: handle_char_repr(node, expr())
+
+    def compile_int_repr(self, node: IntReprNode) -> Closure:
+        expr = self.compile(node.expr)
+        handle_int_repr = self.handle_int_repr
+        return lambda: handle_int_repr(node, expr())
+
+    def compile_length(self, node: LengthNode) -> Closure:
+        expr = self.compile(node.expr)
+        handle_length = self.handle_length
+        return lambda: handle_length(node, expr())
+
+    def compile_binary_op(self, node: BinaryOpNode) -> Closure:
+        op = node.operator
+        handler = self.binary_op_handler(op)
+        if not handler:
+            return self.__compile_visit(node)
+
+        left = self.compile(node.left)
+
+        start_pos, end_pos = node.start_pos, node.end_pos
+
+        def handle_operation(left_object: RunTimeObject, right_object: RunTimeObject):
+            """Applies the operation with its handler, which reports invalid operations"""
+            self.node_start_pos = start_pos
+            self.node_end_pos = end_pos
+            return handler(left_object, right_object, op)
+
+        # Fold a constant right operand into the operation
+        constant = node.right
+        if isinstance(constant, LiteralNode) and (constant.kind, op) in OPERATIONS:
+            function, label = OPERATIONS[(constant.kind, op)]
+            kind, value = constant.kind, constant.value
+            constant_object = constant.constant
+
+            def binary_op_constant():
+                left_object = left()
+                if left_object.label == kind:
+                    return RunTimeObject(label, function(left_object.value, value))
+                return handle_operation(left_object, constant_object)
+
+            return binary_op_constant
+
+        right = self.compile(node.right)
+        operations = {
+            operand_label: OPERATIONS[(operand_label, op)]
+            for operand_label in ("number", "string")
+            if (operand_label, op) in OPERATIONS
+        }
+        if not operations:
+            return lambda: handle_operation(left(), right())
+
+        def binary_op():
+            left_object = left()
+            right_object = right()
+            if left_object.label == right_object.label:
+                operation = operations.get(left_object.label)
+                if operation:
+                    function, label = operation
+                    return RunTimeObject(
+                        label, function(left_object.value, right_object.value)
+                    )
+            return handle_operation(left_object, right_object)
+
+        return binary_op
+
+    def compile_unary_op(self, node: UnaryOpNode) -> Closure:
+        operand = self.compile(node.operand)
+        handle_unary_op = self.handle_unary_op
+        return lambda: handle_unary_op(node, operand())
+
+    @staticmethod
+    def compile_literal(node: LiteralNode) -> Closure:
+        constant = node.constant
+        return lambda: constant
+
+    def compile_load(self, node: LoadNode) -> Closure:
+        identifier = node.identifier
+        return lambda: self.current_env.lookup_symbol(identifier)
+
+    @staticmethod
+    def compile_identifier(node: IdentifierNode) -> Closure:
+        value = node.value
+        return lambda: RunTimeObject("identifier", value)
+
+    @staticmethod
+    def compile_numeric_literal(node: NumericLiteralNode) -> Closure:
+        constant = node.constant
+        return lambda: constant
+
+    @staticmethod
+    def compile_string_literal(node: StringLiteralNode) -> Closure:
+        constant = node.constant
+        return lambda: constant
+
+    @staticmethod
+    def compile_boolean_literal(node: BooleanNode) -> Closure:
+        constant = node.constant
+        return lambda: constant
+
+    def __compile_visit(self, node: Node) -> Closure:
+        """Compiles a node into a call to its visit method (which reports invalid nodes)"""
+        visit_method = self.dispatch_table[node.label]
+        return lambda: visit_method(node)
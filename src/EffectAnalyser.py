@@ -0,0 +1,138 @@
+from typing import Iterable, Optional
+
+from src.Resolver import Resolver
+from src.core.ASTNodes import (
+    Node,
+    BodyNode,
+    ForNode,
+    AssignmentNode,
+    CallNode,
+    IdentifierNode,
+    children,
+    walk,
+)
+
+# Labels of the nodes performing input or output
+EFFECT_LABELS = {
+    "print",
+    "input",
+    "file_open",
+    "file_close",
+    "file_read",
+    "file_readline",
+    "file_write",
+}
+
+
+class EffectAnalyser:
+    """
+    Static analysis of the effects of function bodies, which finds the functions whose
+    result only depends on the values of their arguments, so their calls can be memoized.
+
+    A function is pure if it performs no input or output, only reads its parameters
+    and the local variables it assigned before, on every path to the read, and only
+    stores to the arrays it defines (arrays are passed and assigned by reference).
+    Other variables are read from the global scope, which may change between calls.
+    The functions it calls by name are globals as well: the function is pure as long as
+    they are, which is checked when its calls are memoized, as they may be redefined.
+    """
+
+    def __init__(self):
+        # Results of the bodies analysed, indexed by body node
+        self.__callees: dict[Node, Optional[frozenset[str]]] = {}
+        # Arrays defined by the function analysed
+        self.__local_arrays: set[str] = set()
+
+    def callees(
+        self, params: Iterable[str], body: BodyNode
+    ) -> Optional[frozenset[str]]:
+        """
+        Analyses the body of a function (once)
+        @param params: The names of the parameters of the function
+        @param body: The body of the function
+        @return: The names of the global functions the function calls,
+        None if the function is impure
+        """
+        if body not in self.__callees:
+            self.__callees[body] = self.analyse(params, body)
+        return self.__callees[body]
+
+    def analyse(
+        self, params: Iterable[str], body: BodyNode
+    ) -> Optional[frozenset[str]]:
+        """
+        Analyses the body of a function
+        @return: The names of the global functions the function calls,
+        None if the function is impure
+        """
+        params = set(params)
+        # Arrays only assigned by the array definitions of the function are its own
+        local_arrays = set()
+        other_variables = set(params)
+        for node in walk(body):
+            if node.label == "array_def":
+                local_arrays.add(node.identifier)
+            else:
+                name = Resolver.assigned_name(node)
+                if name is not None:
+                    other_variables.add(name)
+        self.__local_arrays = local_arrays - other_variables
+
+        callees = set()
+        if not self.__pure(body, params, callees):
+            return None
+        return frozenset(callees)
+
+    def __pure(self, node: Node, assigned: set[str], callees: set[str]) -> bool:
+        """
+        Checks a node has no effect and only reads variables assigned before it
+        @param assigned: The local variables assigned on every path to the node,
+        extended with the ones the node assigns
+        @param callees: Collects the names of the global functions called
+        """
+        if node.label in EFFECT_LABELS:
+            return False
+        if node.label == "array_update" and node.identifier not in self.__local_arrays:
+            return False
+
+        if isinstance(node, BodyNode):
+            # The assignments of a block are not run on every path past the block
+            assigned = set(assigned)
+            return all(
+                self.__pure(statement, assigned, callees)
+                for statement in node.statements
+            )
+
+        if isinstance(node, ForNode):
+            # The loop variable is only assigned if the range is not empty
+            return (
+                self.__pure(node.range_start, assigned, callees)
+                and self.__pure(node.range_end, assigned, callees)
+                and self.__pure(node.body, assigned | {node.identifier.value}, callees)
+            )
+
+        if isinstance(node, AssignmentNode):
+            name = Resolver.assigned_name(node)
+            if name is None or not self.__pure(node.right, assigned, callees):
+                return False
+            assigned.add(name)
+            return True
+
+        if isinstance(node, CallNode):
+            # Functions held by local variables are not known until the call
+            if node.identifier in assigned:
+                return False
+            callees.add(node.identifier)
+        elif isinstance(node, IdentifierNode):
+            if node.value not in assigned:
+                return False
+        elif node.label != "array_def":
+            name = Resolver.variable_name(node)
+            if name is not None and name not in assigned:
+                return False
+
+        if not all(self.__pure(child, assigned, callees) for child in children(node)):
+            return False
+        if node.label == "array_def":
+            assigned.add(node.identifier)
+        return True
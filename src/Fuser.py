@@ -0,0 +1,85 @@
+from collections import Counter
+from typing import Optional
+
+from src.core.ASTNodes import (
+    Node,
+    BodyNode,
+    WhileNode,
+    AssignmentNode,
+    PostfixExprNode,
+    BinaryOpNode,
+    LiteralNode,
+    IdentifierNode,
+    FusedNode,
+    IncrementNode,
+    AddConstantNode,
+    ArrayStoreNode,
+    CompareWhileNode,
+    walk,
+)
+
+# Operators of the conditions of the while loops fused
+COMPARISON_OPERATORS = ("==", "!=", "<", ">", "<=", ">=")
+
+
+class Fuser:
+    """
+    Pass run by the tree interpreter on the resolved AST, which rewrites the statement
+    shapes hot loops are made of into fused nodes, each run by a single visit:
+    - increment: x++ and x-- statements
+    - add_constant: assignments of an operand plus (or minus) a number, e.g. x = x + 1
+    - array_store: stores to an array element, e.g. a[i] = x
+    - compare_while: while loops comparing two operands, e.g. daijoubu (i < n)
+    Only statements are fused, the expressions of other shapes are left as they are.
+    """
+
+    def __init__(self):
+        # Number of sites fused, by label of the fused node
+        self.counts: Counter[str] = Counter()
+
+    def fuse(self, node: Node) -> Counter[str]:
+        """
+        Fuses the statements of the bodies of a node (and its descendants).
+        Statements already fused are left as they are.
+        @param node: The root node
+        @return: The number of sites fused, by label of the fused node
+        """
+        counts = Counter()
+        for body in walk(node):
+            if not isinstance(body, BodyNode):
+                continue
+            for index, statement in enumerate(body.statements):
+                fused = self.fused_statement(statement)
+                if fused is not None:
+                    body.statements[index] = fused
+                    counts[fused.label] += 1
+        self.counts.update(counts)
+        return counts
+
+    @staticmethod
+    def fused_statement(statement: Node) -> Optional[FusedNode]:
+        """Returns the fused node of a statement, None if it has none of the fused shapes"""
+        if isinstance(statement, PostfixExprNode):
+            if isinstance(statement.left, IdentifierNode):
+                return IncrementNode(statement)
+        elif isinstance(statement, AssignmentNode):
+            operation = statement.right
+            if (
+                isinstance(statement.left, IdentifierNode)
+                and isinstance(operation, BinaryOpNode)
+                and operation.operator in ("+", "-")
+                and isinstance(operation.right, LiteralNode)
+                and operation.right.kind == "number"
+            ):
+                return AddConstantNode(statement)
+        elif statement.label == "array_update":
+            if statement.index is not None and statement.value is not None:
+                return ArrayStoreNode(statement)
+        elif isinstance(statement, WhileNode):
+            condition = statement.expr
+            if (
+                isinstance(condition, BinaryOpNode)
+                and condition.operator in COMPARISON_OPERATORS
+            ):
+                return CompareWhileNode(statement)
+        return None
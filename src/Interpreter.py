@@ -1,5 +1,8 @@
+import operator
 import sys
-from typing import Optional, TextIO
+from collections import Counter, defaultdict
+from itertools import repeat
+from typing import Callable, Optional, TextIO
 
 from src.core.ASTNodes import (
     FileNode,
@@ -32,12 +35,27 @@ from src.core.ASTNodes import (
     CharReprNode,
     LengthNode,
     IntReprNode,
+    BinaryOpNode,
+    UnaryOpNode,
+    LiteralNode,
+    LoadNode,
+    LazyBodyNode,
+    IncrementNode,
+    AddConstantNode,
+    ArrayStoreNode,
+    CompareWhileNode,
 )
-from src.core.CacheMemory import cache_mem
-from src.core.Environment import Environment
-from src.core.RuntimeObject import RunTimeObject
+from src.core.CacheMemory import FunctionMemo, UNMEMOIZED_LABELS
+from src.core.Completion import Completion, BREAK, CONTINUE
+from src.core.Environment import Environment, SlotEnvironment
+from src.core.RuntimeObject import RunTimeObject, HAI, IIE
 from src.core.Symbol import VarSymbol, FunctionSymbol, FileSymbol
-from src.core.Token import Position
+from src.core.Token import SourceMap
+from src.EffectAnalyser import EffectAnalyser
+from src.Fuser import Fuser
+from src.Lexer import Lexer
+from src.Parser import Parser
+from src.Resolver import Resolver, LOCAL_SCOPE, GLOBAL_SCOPE
 from src.utils.Constants import WARNING
 from src.utils.ErrorHandler import (
     throw_unary_type_err,
@@ -46,25 +64,141 @@ from src.utils.ErrorHandler import (
     success_msg,
     emoji,
     InterpreterError,
+    ParserError,
+    LexerError,
     ErrorType,
 )
+from src.utils.Logger import Logger, LogLevel, subsystem_logger
 
-MAX_VISIT_DEPTH = 5470
 INTERNAL_STACK_SIZE = 1010
+DEFAULT_MEMO_SIZE = 1000  # Results memoized per function
 SYS_RECURSION_LIMIT = 1000000
+# Before Python 3.11, every nested Python call also recursed on the C stack,
+# which overflows (segfaults) long before the raised recursion limit is reached
+MAX_VISIT_DEPTH = 5470 if sys.version_info < (3, 11) else SYS_RECURSION_LIMIT
+
+RELATIONAL_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    ">": operator.gt,
+    "<=": operator.le,
+    ">=": operator.ge,
+}
+
+
+def length_comparison(relational_operator: Callable) -> Callable:
+    """Returns the comparison of the length of a string with a number"""
+    return lambda string, number: relational_operator(len(string), number)
+
+
+# Binary operations, indexed by the operator and the labels of the left and right operands,
+# with the function applying them to the operand values and the label of their result.
+# Operations on other operand types are invalid, except for the logical operators
+# 'and'/'or', which apply to any operands.
+BINARY_OPERATIONS = {
+    ("+", "number", "number"): (operator.add, "number"),
+    ("+", "string", "string"): (operator.add, "string"),
+    ("-", "number", "number"): (operator.sub, "number"),
+    ("*", "number", "number"): (operator.mul, "number"),
+    ("*", "string", "number"): (operator.mul, "string"),
+    ("*", "number", "string"): (operator.mul, "string"),
+    ("/", "number", "number"): (operator.truediv, "number"),
+    ("%", "number", "number"): (operator.mod, "number"),
+    **{
+        (relational_operator, label, label): (function, "boolean")
+        for label in ("number", "string", "boolean")
+        for relational_operator, function in RELATIONAL_OPERATORS.items()
+    },
+    # Strings compare their length with numbers
+    **{
+        (relational_operator, "string", "number"): (
+            length_comparison(function),
+            "boolean",
+        )
+        for relational_operator, function in RELATIONAL_OPERATORS.items()
+    },
+}
+BINARY_OPERATORS = {operation[0] for operation in BINARY_OPERATIONS} | {"and", "or"}
+
+# Binary operations applied directly to two operands of the same type,
+# indexed by the label of the operands and the operator,
+# with the function applying them and the label of their result.
+# Other operations (and operands of different types) go through the operation handler.
+OPERATIONS = {
+    (left_label, op): operation
+    for (op, left_label, right_label), operation in BINARY_OPERATIONS.items()
+    if left_label == right_label and left_label in ("number", "string") and op != "/"
+}
+
+
+# Executions of a binary operation before it is specialised for the labels of its operands,
+# and executions it waits before trying again when they matched no operation (or missed)
+QUICKENING_THRESHOLD = 8
+QUICKENING_BACKOFF = 64
+
+# Labels of the binary operations specialised for the labels of their operands
+QUICKENED_LABELS = ("quick_arithmetic", "quick_comparison")
+
+# Nodes whose value a loop storing it to every element of an array evaluates once
+FILL_LABELS = {
+    "literal",
+    "numeric_literal",
+    "string_literal",
+    "boolean_literal",
+    "load",
+}
+
+# Nodes evaluating to a new runtime object, which assignments need not copy
+# (unless it is a shared runtime object, such as the constant of a literal)
+FRESH_LABELS = {
+    "literal",
+    "numeric_literal",
+    "string_literal",
+    "boolean_literal",
+    "binary_op",
+    *QUICKENED_LABELS,
+    "unary_op",
+    "postfix_expr",
+    "char_repr",
+    "int_repr",
+    "length",
+    "input",
+    "file_read",
+    "file_readline",
+}
 
 
 class Interpreter:
-    def __init__(self, verbose: bool = False):
-        self.__verbose = verbose
+    def __init__(
+        self,
+        verbose: bool = False,
+        logger: Optional[Logger] = None,
+        memo_size: int = DEFAULT_MEMO_SIZE,
+        fusion: bool = True,
+        quickening: bool = True,
+    ):
+        """
+        @param verbose: Flag to enable logging (to the console, if no logger is given)
+        @param logger: Logger of the interpreter subsystem
+        @param memo_size: Maximum number of results memoized per pure function
+        (0 disables memoization)
+        @param fusion: Flag to fuse common statement shapes into single nodes
+        (see Fuser) before they are interpreted
+        @param quickening: Flag to specialise binary operations for the labels of their
+        operands, once they ran a few times (see visit_binary_op)
+        """
+        self.__logger = subsystem_logger("interpreter", verbose, logger)
         self.global_env: Environment = Environment(name="global", level=1)
         self.current_env = self.global_env
-
-        #  Control flow flags
-        self.break_flag = False
-        self.continue_flag = False
-        self.return_flag = False
-        self.return_value = None
+        self.resolver = Resolver()
+        self.effect_analyser = EffectAnalyser()
+        self.fuser = Fuser() if fusion else None
+        self.quickening = quickening
+        # Binary operations specialised, specialised operations run (only counted when
+        # the interpreter is logged) and operations reverted as their operands missed
+        self.quickening_stats: Counter[str] = Counter()
+        self.memo_size = memo_size
 
         # Safety nets
         self.__visitor_depth = 0  # Keep track of the depth of the visitor
@@ -72,24 +206,112 @@ class Interpreter:
         sys.setrecursionlimit(SYS_RECURSION_LIMIT)
 
         # Error handling
-        self.node_start_pos = Position(line=-1, col=-1)
-        self.node_end_pos = Position(line=-1, col=-1)
+        self.node_start_pos: Optional[int] = None
+        self.node_end_pos: Optional[int] = None
+
+        # Visit methods indexed by node label, resolved once instead of on every visit
+        self.__visit_methods = {
+            name.removeprefix("visit_"): getattr(self, name)
+            for name in dir(self)
+            if name.startswith("visit_")
+        }
+        if self.__logger:
+            for label in QUICKENED_LABELS:
+                self.__visit_methods[label] = self.__counted(
+                    self.__visit_methods[label]
+                )
+
+        # Table used by Node.accept to dispatch nodes to their visit method.
+        # Nodes are only routed through visit when it has logging or depth checks to do.
+        if self.__logger and self.__logger.enabled_for(LogLevel.TRACE):
+            self.dispatch_table = defaultdict(lambda: self.__visit_logged)
+        elif MAX_VISIT_DEPTH < SYS_RECURSION_LIMIT:
+            self.dispatch_table = defaultdict(lambda: self.visit)
+        else:
+            self.dispatch_table = defaultdict(
+                lambda: self.generic_visit, self.__visit_methods
+            )
+
+        # Binary operators, with the handler implementing them
+        self.__binary_op_handlers = dict.fromkeys(
+            BINARY_OPERATORS, self.handle_binary_operation
+        )
+
+    def binary_op_handler(self, operator: str) -> Optional[Callable]:
+        """Returns the handler implementing a binary operator, None if the operator is invalid"""
+        return self.__binary_op_handlers.get(operator)
+
+    @property
+    def logger(self) -> Optional[Logger]:
+        """Returns the logger of the interpreter, None if it is not logged"""
+        return self.__logger
 
     def __log(self, message: str) -> None:
-        if self.__verbose:
-            print(message)
+        """Logs an operation of the interpreter"""
+        self.__logger.info(success_msg(message))
+
+    def __counted(self, visit_method: Callable) -> Callable:
+        """Returns a visit method of specialised operations, counting their executions"""
+        stats = self.quickening_stats
+
+        def visit_counted(node: BinaryOpNode) -> RunTimeObject:
+            stats["executions"] += 1
+            return visit_method(node)
+
+        return visit_counted
+
+    def __log_quickening(self) -> None:
+        """Logs the binary operations specialised, and how often their operands hit their guard"""
+        stats = self.quickening_stats
+        if not stats["quickened"]:
+            return
+        hits = stats["executions"] - stats["deopts"]
+        rate = hits / stats["executions"] if stats["executions"] else 0
+        self.__log(
+            f"Quickened {stats['quickened']} binary operations: "
+            f"{hits} specialised executions ({rate:.1%} hits), {stats['deopts']} deopts"
+        )
 
-    def interpret(self, ast: Node):
+    def interpret(self, ast: Node, source_map: Optional[SourceMap] = None):
         """
         Interprets the given abstract syntax tree by visiting the root node
         and returning the result of the interpretation
+        @param ast: The root node of the program
+        @param source_map: Resolves node offsets to positions when reporting errors
         """
         try:
-            return ast.accept(self)
+            result = self.evaluate(ast)
         except RecursionError as e:
             print(f"{emoji()}\nVisitor Error:", e, file=sys.stderr)
         except InterpreterError as e:
+            print(e.locate(source_map), file=sys.stderr)
+        except (ParserError, LexerError) as e:
+            # Raised by the bodies of functions parsed lazily, on their first call
             print(e, file=sys.stderr)
+        else:
+            # Statements transferring control out of the program (or REPL input) end it
+            return None if isinstance(result, Completion) else result
+        finally:
+            if self.__logger:
+                self.__log_quickening()
+
+    def evaluate(self, node: Node):
+        """Evaluates a node (and its children) and returns the result"""
+        self.resolver.resolve(node)
+        self.fuse(node)
+        return node.accept(self)
+
+    def fuse(self, node: Node) -> None:
+        """Fuses the statements of a resolved node (and its children), if fusion is enabled"""
+        if not self.fuser:
+            return
+
+        counts = self.fuser.fuse(node)
+        if self.__logger and counts:
+            sites = ", ".join(
+                f"{label} {count}" for label, count in sorted(counts.items())
+            )
+            self.__log(f"Fused {sum(counts.values())} statement sites: {sites}")
 
     def visit(self, node: Node):
         """
@@ -113,22 +335,18 @@ class Interpreter:
             )
 
         self.__visitor_depth += 1
-        method = f"visit_{node.label}"
-        self.__log(warning_msg(f"Visiting {node.label}"))
-        visit_method = getattr(self, method, self.generic_visit)
-
-        # Cache node visit
-        if not cache_mem.has_key(node):
-            cache_mem.put(node, visit_method)
-
-        # Visit (in the case of cache misses)
-        if result := visit_method(node):
-            self.__log(success_msg(f"Returned --> {node.label}: {result}"))
-        self.__log(warning_msg(f"Visited {node.label}"))
-
+        result = self.__visit_methods.get(node.label, self.generic_visit)(node)
         self.__visitor_depth -= 1
         return result
 
+    def __visit_logged(self, node: Node):
+        """visit, logging the node (installed when nodes are traced)"""
+        self.__logger.trace(warning_msg(f"Visiting {node.label}"))
+        if result := self.visit(node):
+            self.__logger.trace(success_msg(f"Returned --> {node.label}: {result}"))
+        self.__logger.trace(warning_msg(f"Visited {node.label}"))
+        return result
+
     def visit_program(self, node: ProgramNode):
         """Interprets a program node by visiting its functions and body"""
         if node.eof:
@@ -165,132 +383,251 @@ class Interpreter:
             node.identifier, VarSymbol(node.identifier, function_obj)
         )
 
-    def visit_body(self, node: BodyNode):
+    def visit_body(self, node: BodyNode) -> Optional[Completion]:
         """
-        Interprets a body node, executes its statements,
-        and returns the result of the last evaluated statement
+        Interprets a body node by executing its statements, until one transfers control
+        @return: The completion record of the statement transferring control (if any)
         """
-        for stmt in node.statements:
-            if self.break_flag or self.return_flag:
-                break
+        if not node.transfers:
+            for stmt in node.statements:
+                stmt.accept(self)
+            return None
 
-            if self.continue_flag:
-                self.continue_flag = False
-                continue
-
-            stmt.accept(self)
+        for stmt in node.statements:
+            completion = stmt.accept(self)
+            if completion.__class__ is Completion:
+                return completion
 
-    def visit_return(self, node: ReturnNode):
+    def visit_return(self, node: ReturnNode) -> Completion:
         """
         Interprets a return statement node and
-        returns the result of the evaluated expression if any
+        returns the completion record holding the result of the evaluated expression (if any).
+        A call returned by a function is made by its caller (see visit_call),
+        the record holds the function called and its evaluated arguments.
         """
         self.node_start_pos = node.start_pos
         self.node_end_pos = node.end_pos
-        self.return_value = node.expr.accept(self) if node.expr else None
-        self.return_flag = True
-
-    def visit_break(self, node: BreakNode):
+        if node.tail_call:
+            call = node.expr
+            function_symbol = self.lookup_function(call)
+            function_args = call.args.accept(self) if call.args else None
+            return Completion("tail_call", (call, function_symbol, function_args))
+        return Completion("return", node.expr.accept(self) if node.expr else None)
+
+    def visit_break(self, node: BreakNode) -> Completion:
         """Interprets a break statement node"""
         self.node_start_pos = node.start_pos
         self.node_end_pos = node.end_pos
-        self.break_flag = True
+        return BREAK
 
-    def visit_continue(self, node: ContinueNode):
+    def visit_continue(self, node: ContinueNode) -> Completion:
         """Interprets a continue statement node"""
         self.node_start_pos = node.start_pos
         self.node_end_pos = node.end_pos
-        self.continue_flag = True
+        return CONTINUE
 
-    def __handle_conditional_execution(self, body_node: Optional[BodyNode]):
-        """
-        Handles the execution of a conditional body node
-        and returns the result of the last evaluated statement (if any)
-        """
-        if not body_node:
-            return
-
-        body_node.accept(self)
-        if self.return_flag:
-            return self.return_value
-
-    def visit_if(self, node: IfNode):
+    def visit_if(self, node: IfNode) -> Optional[Completion]:
         """
         Visits an if node and interprets its body if the condition is met,
-        and returns the result of the last evaluated statement (if any)
+        and returns the completion record of the body (if any)
         """
         condition = node.expr.accept(self)
         if condition.value:
-            return self.__handle_conditional_execution(node.body)
+            return node.body.accept(self) if node.body else None
 
         for else_if_stmt in node.else_if_statements:
             condition = else_if_stmt.expr.accept(self)
             if condition.value:
-                return self.__handle_conditional_execution(else_if_stmt.body)
+                return else_if_stmt.body.accept(self) if else_if_stmt.body else None
 
         if node.else_body:
-            return self.__handle_conditional_execution(node.else_body)
+            return node.else_body.accept(self)
 
-    def visit_while(self, node: WhileNode):
+    def visit_while(self, node: WhileNode) -> Optional[Completion]:
         """
         Visits a while loop and interprets its body while the condition is met,
-        and returns the result of the last evaluated statement (if any)
+        and returns the completion record of a return statement of the body (if any)
         """
-        condition = node.expr.accept(self)
-        while condition.value:
-            if stmt := self.__handle_conditional_execution(node.body):
-                return stmt
-
-            if self.break_flag:
-                self.break_flag = False
+        body = node.body
+        if not body or not body.transfers:
+            while node.expr.accept(self).value:
+                if body:
+                    body.accept(self)
+            return None
+
+        while node.expr.accept(self).value:
+            completion = body.accept(self)
+            if completion is BREAK:
                 break
+            if completion is not None and completion is not CONTINUE:
+                return completion
 
-            condition = node.expr.accept(self)  # Re-evaluate condition
+    def visit_compare_while(self, node: CompareWhileNode) -> Optional[Completion]:
+        """
+        Visits a fused while loop whose condition compares two operands,
+        numbers are compared directly and other operands by the binary operation
+        """
+        left_node, right_node, condition, body = node.operands
+        compare = RELATIONAL_OPERATORS[condition.operator]
+        transfers = body is not None and body.transfers
+        while True:
+            left = left_node.accept(self)
+            right = right_node.accept(self)
+            if left.label == "number" and right.label == "number":
+                if not compare(left.value, right.value):
+                    return None
+            elif not self.handle_binary_op(condition, left, right).value:
+                return None
+
+            if not transfers:
+                if body:
+                    body.accept(self)
+                continue
 
-    def visit_for(self, node: ForNode):
+            completion = body.accept(self)
+            if completion is BREAK:
+                return None
+            if completion is not None and completion is not CONTINUE:
+                return completion
+
+    def visit_for(self, node: ForNode) -> Optional[Completion]:
         """
-        Visits a for loop and interprets its body while the condition is met,
-        and returns the result of the last evaluated statement (if any)
+        Visits a for loop and interprets its body for each value of the range,
+        and returns the completion record of a return statement of the body (if any)
         @raise InterpreterError: If the range value is not an integer
         """
 
-        def validate_range_node(range_node):
-            """
-            Validates the range value of a range node
-            @raise InterpreterError: If the range value is not an integer.
-            """
-            runtime_object = range_node.accept(self)
-            if not isinstance(runtime_object.value, int):
-                raise InterpreterError(
-                    ErrorType.RUNTIME,
-                    f"Range value '{type(runtime_object.value).__name__}' "
-                    f"cannot be used as an integer",
-                    range_node.start_pos,
-                    range_node.end_pos,
-                )
-            return runtime_object.value
-
-        range_start = validate_range_node(node.range_start)
-        range_end = validate_range_node(node.range_end)
+        range_start = self.handle_range_value(
+            node.range_start, node.range_start.accept(self)
+        )
+        range_end = self.handle_range_value(node.range_end, node.range_end.accept(self))
 
         # Create iterator in symbol table
         iterator_runtime_object = RunTimeObject(label="number", value=0)
-        self.current_env.insert_symbol(
-            node.identifier.value,
-            VarSymbol(node.identifier.value, iterator_runtime_object),
-        )
+        self.assign_variable(node, node.identifier.value, iterator_runtime_object)
 
         # incrementer to determine direction of iteration
         incrementer = 1 if range_start < range_end else -1
-        for i in range(range_start, range_end, incrementer):
+        iterations = range(range_start, range_end, incrementer)
+        if node.counted:
+            return self.run_counted_loop(node, iterator_runtime_object, iterations)
+
+        body = node.body
+        if not body or not body.transfers:
+            for i in iterations:
+                iterator_runtime_object.value = i
+                if body:
+                    body.accept(self)
+            return None
+
+        for i in iterations:
             iterator_runtime_object.value = i
-
-            if self.break_flag:
-                self.break_flag = False
+            completion = body.accept(self)
+            if completion is BREAK:
                 break
+            if completion is not None and completion is not CONTINUE:
+                return completion
 
-            if result := self.__handle_conditional_execution(node.body):
-                return result
+    def run_counted_loop(
+        self, node: ForNode, iterator_runtime_object: RunTimeObject, iterations: range
+    ) -> Optional[Completion]:
+        """
+        Runs a for loop whose body does not reassign its iterator, by visiting the statements
+        of the body directly instead of the body node, on every iteration
+        @return: The completion record of a return statement of the body (if any)
+        """
+        if not iterations:
+            return None
+        if not node.body:
+            iterator_runtime_object.value = iterations[-1]
+            return None
+        if self.fill_array(node, iterator_runtime_object, iterations):
+            return None
+
+        visits = [
+            (self.dispatch_table[stmt.label], stmt) for stmt in node.body.statements
+        ]
+        if not node.body.transfers:
+            if len(visits) == 1:
+                visit, stmt = visits[0]
+                for i in iterations:
+                    iterator_runtime_object.value = i
+                    visit(stmt)
+                return None
+
+            for i in iterations:
+                iterator_runtime_object.value = i
+                for visit, stmt in visits:
+                    visit(stmt)
+            return None
+
+        for i in iterations:
+            iterator_runtime_object.value = i
+            for visit, stmt in visits:
+                completion = visit(stmt)
+                if completion.__class__ is Completion:
+                    if completion is BREAK:
+                        return None
+                    if completion is not CONTINUE:
+                        return completion
+                    break
+
+    def fill_array(
+        self, node: ForNode, iterator_runtime_object: RunTimeObject, iterations: range
+    ) -> bool:
+        """
+        Runs a for loop whose body only stores a constant (or a variable) to the element
+        of an array indexed by the iterator, by storing it to the whole range at once
+        @return: Whether the range was stored, the loop is run if it is not within the array
+        """
+        statements = node.body.statements
+        if len(statements) != 1:
+            return False
+        store = statements[0]
+        if store.label == "array_store":
+            store = store.statement
+        if store.label != "array_update":
+            return False
+        if store.index.__class__ is not LoadNode or store.value is None:
+            return False
+        if store.index.identifier != node.identifier.value:
+            return False
+        if store.value.label not in FILL_LABELS or (
+            store.value.label == "load"
+            and store.value.identifier == node.identifier.value
+        ):
+            return False
+
+        self.check_array_update(store)
+        value_runtime = store.value.accept(self)
+        array_symbol = self.lookup_variable(store, store.identifier).value
+        low, high = sorted((iterations[0], iterations[-1]))
+        if not isinstance(array_symbol, list) or low < 0 or high >= len(array_symbol):
+            return False
+
+        array_symbol[low : high + 1] = map(
+            RunTimeObject,
+            repeat(value_runtime.label, len(iterations)),
+            repeat(value_runtime.value, len(iterations)),
+        )
+        iterator_runtime_object.value = iterations[-1]
+        return True
+
+    @staticmethod
+    def handle_range_value(range_node: Node, runtime_object: RunTimeObject) -> int:
+        """
+        Validates the range value of a range node
+        @raise InterpreterError: If the range value is not an integer.
+        """
+        if not isinstance(runtime_object.value, int):
+            raise InterpreterError(
+                ErrorType.RUNTIME,
+                f"Range value '{type(runtime_object.value).__name__}' "
+                f"cannot be used as an integer",
+                range_node.start_pos,
+                range_node.end_pos,
+            )
+        return runtime_object.value
 
     def visit_array_def(self, node: ArrayNode):
         """Visits an ArrayNode and creates a new array in the symbol table"""
@@ -298,11 +635,12 @@ class Interpreter:
         self.node_end_pos = node.end_pos
 
         if node.size:
-            array_size = self.__test_for_identifier(node.size.accept(self)).value
+            array_size = self._test_for_identifier(node.size.accept(self)).value
             # FIXME: Handle nulls
             values = [RunTimeObject(label="number", value=0)] * int(array_size)
         elif node.initial_values:
             values = [value.accept(self) for value in node.initial_values]
+            values = [value.copy() if value.shared else value for value in values]
         elif node.string_value:
             string_value = node.string_value.accept(self)
             values = [
@@ -311,9 +649,7 @@ class Interpreter:
         else:
             values = []
 
-        self.current_env.insert_symbol(
-            node.identifier, VarSymbol(node.identifier, RunTimeObject("array", values))
-        )
+        self.assign_variable(node, node.identifier, RunTimeObject("array", values))
 
     def visit_array_access(self, node: ArrayNode):
         """
@@ -328,8 +664,14 @@ class Interpreter:
                 node.end_pos,
             )
 
-        index = self.__test_for_identifier(node.index.accept(self)).value
-        array = self.current_env.lookup_symbol(node.identifier).value
+        return self.handle_array_access(node, node.index.accept(self))
+
+    def handle_array_access(
+        self, node: ArrayNode, index_object: RunTimeObject
+    ) -> RunTimeObject:
+        """Returns the value at the evaluated index of an array"""
+        index = self._test_for_identifier(index_object).value
+        array = self.lookup_variable(node, node.identifier).value
 
         if index < 0 or index >= len(array):
             raise InterpreterError(
@@ -346,6 +688,14 @@ class Interpreter:
         Interprets an array update by visiting the array node
         and updating the value at the specified index
         """
+        self.check_array_update(node)
+        self.handle_array_update(node, node.index.accept(self), node.value.accept(self))
+
+    def check_array_update(self, node: ArrayNode):
+        """
+        Checks the index and value of an array update are provided
+        @raise InterpreterError: If the index or value is missing
+        """
         self.node_start_pos = node.start_pos
         self.node_end_pos = node.end_pos
 
@@ -365,10 +715,15 @@ class Interpreter:
                 self.node_end_pos,
             )
 
-        index = self.__test_for_identifier(node.index.accept(self)).value
-        value_runtime = node.value.accept(self)
-
-        array_symbol = self.current_env.lookup_symbol(node.identifier).value
+    def handle_array_update(
+        self,
+        node: ArrayNode,
+        index_object: RunTimeObject,
+        value_runtime: RunTimeObject,
+    ):
+        """Stores a copy of the evaluated value at the evaluated index of an array"""
+        index = self._test_for_identifier(index_object).value
+        array_symbol = self.lookup_variable(node, node.identifier).value
         if int(index) < 0 or int(index) >= len(array_symbol):
             raise InterpreterError(
                 ErrorType.RUNTIME,
@@ -379,21 +734,57 @@ class Interpreter:
 
         array_symbol[index] = RunTimeObject(value_runtime.label, value_runtime.value)
 
+    def visit_array_store(self, node: ArrayStoreNode):
+        """Interprets a fused array update, storing to indexes within the array directly"""
+        index_node, value_node = node.operands
+        self.node_start_pos = node.start_pos
+        self.node_end_pos = node.end_pos
+        index_object = index_node.accept(self)
+        value_runtime = value_node.accept(self)
+
+        array_symbol = self.lookup_variable(node, node.identifier).value
+        index = index_object.value
+        if index.__class__ is int and 0 <= index < len(array_symbol):
+            array_symbol[index] = RunTimeObject(
+                value_runtime.label, value_runtime.value
+            )
+        else:
+            self.handle_array_update(node.statement, index_object, value_runtime)
+
     def visit_assignment(self, node: AssignmentNode):
         """
         Interprets a variable assignment by visiting the left and right nodes
         and assigning the value of the right node to the identifier in the left node
         """
-        lhs = node.left.accept(self)
-        rhs = node.right.accept(self)
+        self.handle_assignment(node, node.right.accept(self))
+
+    def handle_assignment(self, node: AssignmentNode, rhs: RunTimeObject):
+        """
+        Assigns the evaluated right side to the identifier of the left side.
+        Values are copied, unless the right side evaluated to a new runtime object,
+        and functions are assigned by reference.
+        """
+        if rhs.label not in "function" and (
+            rhs.shared or node.right.label not in FRESH_LABELS
+        ):
+            rhs = RunTimeObject(rhs.label, rhs.value)
+        self.assign_variable(node, node.left.value, rhs)
 
-        if rhs.label in "function":
-            self.current_env.insert_symbol(lhs.value, VarSymbol(lhs.value, rhs))
+    def visit_add_constant(self, node: AddConstantNode):
+        """
+        Interprets a fused assignment of an operand plus a number,
+        numbers are added directly and other operands by the binary operation
+        """
+        operand_node, operation = node.operands
+        operand = operand_node.accept(self)
+        if operand.label == "number":
+            result = RunTimeObject("number", operand.value + node.offset)
+            self.assign_variable(node, node.identifier, result)
         else:
-            runtime_object = RunTimeObject(rhs.label, rhs.value)
-            self.current_env.insert_symbol(
-                lhs.value, VarSymbol(lhs.value, runtime_object)
+            result = self.handle_binary_op(
+                operation, operand, operation.right.accept(self)
             )
+            self.handle_assignment(node.statement, result)
 
     def visit_call(self, node: CallNode):
         """
@@ -401,58 +792,252 @@ class Interpreter:
         and returns the result of the function call
         """
         self.check_for_stack_overflow(node)
+        function_symbol = self.lookup_function(node)
+        function_args = node.args.accept(self) if node.args else None
+        local_env = self.bind_arguments(node, function_symbol, function_args)
 
-        function_symbol = self.current_env.lookup_symbol(node.identifier)
-        if function_symbol.label != "function":
+        old_env = self.current_env
+        memoized = []  # Memo keys of the calls returning the result
+        while True:
+            body = self.function_body(function_symbol)
+            self.current_env = local_env
+
+            # Return the result of a previous call of a pure function, else walk through its body
+            memo_key = self.memo_key(function_symbol, function_args)
+            if memo_key is not None:
+                result = function_symbol.memo.get(memo_key)
+                if result is not None:
+                    break
+                memoized.append((function_symbol, memo_key))
+
+            # Break and continue statements outside loops end the function as well
+            completion = body.accept(self)
+            if completion is None or completion.kind != "tail_call":
+                result = completion.value if completion is not None else None
+                break
+
+            # The call returned by the function runs in this frame
+            node, function_symbol, function_args, local_env = self.bind_tail_call(
+                completion, function_symbol
+            )
+
+        for function_symbol, memo_key in memoized:
+            function_symbol.memo.put(memo_key, result)
+        self.current_env = old_env
+        self.__stack_pointer -= 1
+        return result
+
+    def bind_tail_call(self, completion: Completion, function_symbol: FunctionSymbol):
+        """
+        Binds the arguments of a call returned by a function (a tail call),
+        a function calling itself reuses its local environment
+        @param function_symbol: The function returning the call
+        @return: The call node, the function called, its arguments and local environment
+        """
+        node, callee, function_args = completion.value
+        local_env = self.current_env if callee is function_symbol else None
+        local_env = self.bind_arguments(node, callee, function_args, local_env)
+        return node, callee, function_args, local_env
+
+    def lookup_function(self, node: CallNode) -> FunctionSymbol:
+        """
+        Looks up the function called by a call node,
+        global functions through the inline cache of the node
+        @raise InterpreterError: If the identifier is not a function
+        """
+        if node.depth != GLOBAL_SCOPE:
+            return self.check_callable(
+                node, self.lookup_variable(node, node.identifier)
+            )
+
+        global_env = self.global_env
+        if node.cache_version == global_env.version:
+            return node.cached_value
+        function_symbol = self.check_callable(
+            node, global_env.lookup_symbol(node.identifier)
+        )
+        node.cached_value, node.cache_version = function_symbol, global_env.version
+        return function_symbol
+
+    @staticmethod
+    def check_callable(node: CallNode, runtime_object: RunTimeObject) -> FunctionSymbol:
+        """
+        Returns the function held by the runtime object a call node looked up
+        @raise InterpreterError: If the runtime object is not a function
+        """
+        if runtime_object.label != "function":
             raise InterpreterError(
                 ErrorType.RUNTIME,
                 f"'{node.identifier}' is not a function and cannot be called",
                 node.start_pos,
                 node.end_pos,
             )
+        return runtime_object.value
+
+    def bind_arguments(
+        self,
+        node: CallNode,
+        function_symbol: FunctionSymbol,
+        function_args: Optional[list[RunTimeObject]],
+        local_env: Optional[Environment] = None,
+    ) -> Environment:
+        """
+        Creates the local environment of a function call, with the evaluated
+        arguments assigned to the parameters of the function
+        @param local_env: The environment of a call of the function to reuse (cleared)
+        @raise InterpreterError: If the number of arguments does not match the parameters
+        """
+        slots = self.function_slots(function_symbol)
+        if local_env is not None:
+            local_env.clear()
+        elif slots is None:
+            local_env = Environment(
+                name=node.identifier,
+                level=self.current_env.level + 1,
+                parent=self.global_env,
+            )
+        else:
+            local_env = SlotEnvironment(
+                name=node.identifier,
+                level=self.current_env.level + 1,
+                parent=self.global_env,
+                slot_indexes=slots,
+            )
+        if function_args is None:
+            return local_env
 
-        self.__stack_pointer += 1
-        local_env = Environment(
-            name=node.identifier,
-            level=self.current_env.level + 1,
-            parent=self.global_env,
-        )
-        old_env = self.current_env
-
-        function_symbol = function_symbol.value
-        if node.args:
-            function_args = node.args.accept(self)
-            if len(function_args) != len(function_symbol.params):
-                raise InterpreterError(
-                    ErrorType.RUNTIME,
-                    f"Invalid number of arguments provided...\n"
-                    f"Expected {len(function_symbol.params)} "
-                    f"but got {len(function_args)}",
-                    node.args.start_pos,
-                    node.args.end_pos,
-                )
+        if len(function_args) != len(function_symbol.params):
+            raise InterpreterError(
+                ErrorType.RUNTIME,
+                f"Invalid number of arguments provided...\n"
+                f"Expected {len(function_symbol.params)} "
+                f"but got {len(function_args)}",
+                node.args.start_pos,
+                node.args.end_pos,
+            )
 
-            # assign arg values to local variables
-            for i, param in enumerate(function_symbol.params):
-                local_env.insert_symbol(param, VarSymbol(param, function_args[i]))
-        self.current_env = local_env
+        # assign arg values to local variables (parameters take the first slots),
+        # shared runtime objects are copied as parameters may be mutated
+        for i, param in enumerate(function_symbol.params):
+            value = function_args[i]
+            if value.shared:
+                value = RunTimeObject(value.label, value.value)
+            local_env.assign_slot(i, param, value)
+        return local_env
 
-        # Check cache for previously stored value, else walk through the function body
-        env_hash = self.current_env.hash()
-        result = cache_mem.get(env_hash)
-        if result is None:
-            function_symbol.body.accept(self)
+    @staticmethod
+    def function_slots(function_symbol: FunctionSymbol) -> Optional[dict[str, int]]:
+        """Returns the slot indexes of the local variables of a function, if resolved"""
+        body = function_symbol.body
+        if isinstance(body, LazyBodyNode):
+            body = body.body
+        if isinstance(body, BodyNode):
+            return body.slots
+        return None
+
+    def function_body(self, function_symbol: FunctionSymbol) -> BodyNode:
+        """Returns the body of a function, parsing it first if it was skimmed by a lazy parser"""
+        body = function_symbol.body
+        if isinstance(body, LazyBodyNode):
+            body = self.parse_lazy_body(body)
+            if body.slots is None:
+                self.resolver.resolve_function(function_symbol.params, body)
+                self.fuse(body)
+        return body
+
+    def memo_key(
+        self,
+        function_symbol: FunctionSymbol,
+        function_args: Optional[list[RunTimeObject]],
+    ) -> Optional[tuple]:
+        """
+        Returns the key of the result of a call in the memo table of the function called.
+        Calls are not memoized (None is returned) if memoization is disabled,
+        if the function or a function it calls is impure, or if the function is called
+        without arguments for its parameters (which are then read from the globals).
+        The body of the function must be parsed.
+        """
+        if self.memo_size <= 0 or (function_args is None and function_symbol.params):
+            return None
+
+        memo = function_symbol.memo
+        if memo is None:
+            memo = function_symbol.memo = FunctionMemo(self.memo_size)
+        if memo.dependencies is None or any(
+            self.global_function(name) is not callee
+            for name, callee in memo.dependencies.items()
+        ):
+            # Results memoized before a called function was redefined are stale
+            memo.clear()
+            memo.pure, memo.dependencies = self.memo_dependencies(function_symbol)
+        if not memo.pure:
+            return None
+
+        # Arrays and files are mutable (and unhashable), calls reading them are not memoized
+        if function_args and any(
+            arg.label in UNMEMOIZED_LABELS for arg in function_args
+        ):
+            return None
+
+        # Values are keyed with their type, as 1 and 1.0 are equal but print differently
+        return tuple(
+            [(arg.label, type(arg.value), arg.value) for arg in function_args or ()]
+        )
 
-            if self.return_flag:
-                result = self.return_value
-                self.return_flag = False
-                self.return_value = None
+    def memo_dependencies(
+        self, function_symbol: FunctionSymbol
+    ) -> tuple[bool, dict[str, Optional[FunctionSymbol]]]:
+        """
+        Finds the functions called by a function, directly or through the functions it calls
+        @return: Whether the function and all the functions it calls are pure,
+        and the functions bound to the names called
+        """
+        pure = True
+        dependencies = {}
+        pending = [function_symbol]
+        while pending:
+            callees = self.function_callees(pending.pop())
+            if callees is None:
+                pure = False
+                continue
 
-            cache_mem.put(env_hash, result)
+            for name in callees:
+                if name not in dependencies:
+                    callee = dependencies[name] = self.global_function(name)
+                    if callee is None:
+                        pure = False
+                    else:
+                        pending.append(callee)
+        return pure, dependencies
+
+    def function_callees(
+        self, function_symbol: FunctionSymbol
+    ) -> Optional[frozenset[str]]:
+        """
+        Returns the names of the global functions a function calls,
+        None if it is impure (or its body is not parsed yet)
+        """
+        body = function_symbol.body
+        if isinstance(body, LazyBodyNode):
+            body = body.body
+        if not isinstance(body, BodyNode):
+            return None
+        return self.effect_analyser.callees(function_symbol.params, body)
+
+    def global_function(self, name: str) -> Optional[FunctionSymbol]:
+        """Returns the function bound to a global variable, None if it is not a function"""
+        try:
+            runtime_object = self.global_env.lookup_symbol(name)
+        except Exception:
+            return None
+        return runtime_object.value if runtime_object.label == "function" else None
 
-        self.current_env = old_env
-        self.__stack_pointer -= 1
-        return result
+    @staticmethod
+    def parse_lazy_body(node: LazyBodyNode) -> BodyNode:
+        """Parses the body of a function skimmed by a lazy parser, on its first call"""
+        if node.body:
+            return node.body
+        return Parser(lexer=Lexer(), **node.parser_options).parse_lazy_body(node)
 
     @staticmethod
     def visit_input(node: InputNode):
@@ -462,7 +1047,11 @@ class Interpreter:
 
     def visit_print(self, node: PrintNode):
         """Interprets a print statement to the console"""
-        args = node.args.accept(self)
+        self.handle_print(node, node.args.accept(self))
+
+    @staticmethod
+    def handle_print(node: PrintNode, args: list[RunTimeObject]):
+        """Prints the evaluated arguments of a print statement"""
         for i, arg in enumerate(args):
             spacing = " " if (i < len(args) - 1 and len(args) > 1) else ""
             runtime_value = arg.value
@@ -473,6 +1062,17 @@ class Interpreter:
 
     def visit_file_open(self, node: FileNode):
         """Interprets file open operation"""
+        self.check_file_open(node)
+        self.handle_file_open(
+            node, node.filepath.accept(self), node.access_mode.accept(self)
+        )
+
+    @staticmethod
+    def check_file_open(node: FileNode):
+        """
+        Checks the operands of a file open operation are provided
+        @raise InterpreterError: If an operand is missing
+        """
         if not node.filepath:
             error = "File path must be provided..."
             raise InterpreterError(
@@ -485,21 +1085,44 @@ class Interpreter:
                 ErrorType.RUNTIME, error, node.start_pos, node.end_pos
             )
 
+        Interpreter.check_file_identifier(node)
+
+    @staticmethod
+    def check_file_identifier(node: FileNode):
+        """
+        Checks the identifier of a file operation is provided
+        @raise InterpreterError: If the identifier is missing
+        """
         if not node.identifier:
             error = "File identifier must be provided..."
             raise InterpreterError(
                 ErrorType.RUNTIME, error, node.start_pos, node.end_pos
             )
 
+    def handle_file_open(
+        self,
+        node: FileNode,
+        filepath_object: RunTimeObject,
+        access_mode_object: RunTimeObject,
+    ):
+        """Opens the file at the evaluated path and stores it in the current scope"""
+        file_object = self.open_file(node, filepath_object, access_mode_object)
+        self.assign_variable(node, node.identifier, file_object)
+
+    def open_file(
+        self,
+        node: FileNode,
+        filepath_object: RunTimeObject,
+        access_mode_object: RunTimeObject,
+    ) -> RunTimeObject:
+        """Opens the file at the evaluated path and returns its runtime object"""
         try:
-            filepath_object = node.filepath.accept(self)
             if not isinstance(filepath_object.value, str):
                 error = "File path must be a string..."
                 raise InterpreterError(
                     ErrorType.TYPE, error, node.start_pos, node.end_pos
                 )
 
-            access_mode_object = node.access_mode.accept(self)
             if not isinstance(access_mode_object.value, str):
                 error = "File access mode must be a string..."
                 raise InterpreterError(
@@ -519,12 +1142,9 @@ class Interpreter:
             except IOError:
                 raise
 
-            file_object = RunTimeObject("file", FileSymbol(filepath, file))
-            self.current_env.insert_symbol(
-                node.identifier, VarSymbol(node.identifier, file_object)
-            )
-            log = f"File {filepath} opened with access mode '{access_mode}'"
-            self.__log(success_msg(log))
+            if self.__logger:
+                self.__log(f"File {filepath} opened with access mode '{access_mode}'")
+            return RunTimeObject("file", FileSymbol(filepath, file))
         except (ValueError, TypeError, IOError) as e:
             raise InterpreterError(
                 ErrorType.RUNTIME,
@@ -535,11 +1155,17 @@ class Interpreter:
 
     def visit_file_write(self, node: FileNode):
         """Interprets file write operation"""
-        if not node.identifier:
-            error = "File identifier must be provided..."
-            raise InterpreterError(
-                ErrorType.RUNTIME, error, node.start_pos, node.end_pos
-            )
+        self.check_file_write(node)
+        file = self.lookup_file(node)
+        self.handle_file_write(node, file, node.write_buffer.accept(self))
+
+    @staticmethod
+    def check_file_write(node: FileNode):
+        """
+        Checks the operands of a file write operation are provided
+        @raise InterpreterError: If an operand is missing
+        """
+        Interpreter.check_file_identifier(node)
 
         if not node.write_buffer:
             error = "No bytes were provided to write to file"
@@ -547,11 +1173,19 @@ class Interpreter:
                 ErrorType.RUNTIME, error, node.start_pos, node.end_pos
             )
 
-        file_runtime_object = self.current_env.lookup_symbol(node.identifier)
-        file_symbol = self.__test_for_identifier(file_runtime_object).value
-
-        file: TextIO = file_symbol.file
-        write_buffer_runtime_object = node.write_buffer.accept(self)
+    def lookup_file(self, node: FileNode) -> TextIO:
+        """Returns the file stored under the identifier of a file node"""
+        file_runtime_object = self.lookup_variable(node, node.identifier)
+        file_symbol = self._test_for_identifier(file_runtime_object).value
+        return file_symbol.file
+
+    def handle_file_write(
+        self,
+        node: FileNode,
+        file: TextIO,
+        write_buffer_runtime_object: RunTimeObject,
+    ):
+        """Writes the evaluated buffer to a file"""
         buffer = write_buffer_runtime_object.value
 
         try:
@@ -573,8 +1207,8 @@ class Interpreter:
             if node.is_write_line:
                 file.write("\n")
 
-            log = f"Message '{buffer}' written to file {file.name}"
-            self.__log(success_msg(log))
+            if self.__logger:
+                self.__log(f"Message '{buffer}' written to file {file.name}")
         except IOError as e:
             raise InterpreterError(
                 ErrorType.RUNTIME,
@@ -585,16 +1219,21 @@ class Interpreter:
 
     def visit_file_read(self, node: FileNode):
         """Interprets file read operation"""
-        if not node.identifier:
-            error = "File identifier must be provided..."
-            raise InterpreterError(
-                ErrorType.RUNTIME, error, node.start_pos, node.end_pos
-            )
-
-        file_runtime_object = self.current_env.lookup_symbol(node.identifier)
-        file_symbol = self.__test_for_identifier(file_runtime_object).value
-        file: TextIO = file_symbol.file
-
+        self.check_file_identifier(node)
+
+        file = self.lookup_file(node)
+        n_chars_object = None
+        if node.n_chars_to_read:
+            n_chars_object = node.n_chars_to_read.accept(self)
+        return self.handle_file_read(node, file, n_chars_object)
+
+    def handle_file_read(
+        self,
+        node: FileNode,
+        file: TextIO,
+        n_chars_object: Optional[RunTimeObject],
+    ) -> RunTimeObject:
+        """Reads the evaluated number of characters (or the whole file) from a file"""
         try:
             if file.closed:
                 raise IOError("Cannot read from a closed file")
@@ -602,13 +1241,13 @@ class Interpreter:
             if not file.readable():
                 raise IOError("File is not readable")
 
-            if node.n_chars_to_read:
-                buffer = file.read(node.n_chars_to_read.accept(self).value)
+            if n_chars_object:
+                buffer = file.read(n_chars_object.value)
             else:
                 buffer = file.read()
 
-            log = f"Message '{buffer}' read from file {file.name}"
-            self.__log(success_msg(log))
+            if self.__logger:
+                self.__log(f"Message '{buffer}' read from file {file.name}")
             return RunTimeObject("string", buffer)
         except IOError as e:
             raise InterpreterError(
@@ -617,16 +1256,12 @@ class Interpreter:
 
     def visit_file_readline(self, node: FileNode):
         """Interprets file read line operation"""
-        if not node.identifier:
-            error = "File identifier must be provided..."
-            raise InterpreterError(
-                ErrorType.RUNTIME, error, node.start_pos, node.end_pos
-            )
+        self.check_file_identifier(node)
 
-        file_runtime_object = self.current_env.lookup_symbol(node.identifier)
-        file_symbol = self.__test_for_identifier(file_runtime_object).value
-        file: TextIO = file_symbol.file
+        return self.handle_file_readline(node, self.lookup_file(node))
 
+    def handle_file_readline(self, node: FileNode, file: TextIO) -> RunTimeObject:
+        """Reads the next line of a file"""
         try:
             if file.closed:
                 raise IOError("Cannot read from a closed file")
@@ -635,8 +1270,8 @@ class Interpreter:
                 raise IOError("File is not readable")
 
             buffer = file.readline()
-            log = f"Message '{buffer}' read from file {file.name}"
-            self.__log(success_msg(log))
+            if self.__logger:
+                self.__log(f"Message '{buffer}' read from file {file.name}")
             return RunTimeObject("string", buffer)
         except IOError as e:
             raise InterpreterError(
@@ -645,16 +1280,12 @@ class Interpreter:
 
     def visit_file_close(self, node: FileNode):
         """Interprets file close operation"""
-        if not node.identifier:
-            error = "File identifier must be provided..."
-            raise InterpreterError(
-                ErrorType.RUNTIME, error, node.start_pos, node.end_pos
-            )
+        self.check_file_identifier(node)
 
-        runtime_object = self.current_env.lookup_symbol(node.identifier)
-        file_symbol: FileSymbol = self.__test_for_identifier(runtime_object).value
-        file = file_symbol.file
+        self.handle_file_close(node, self.lookup_file(node))
 
+    def handle_file_close(self, node: FileNode, file: TextIO):
+        """Closes a file"""
         try:
             file.close()
         except IOError as e:
@@ -662,12 +1293,18 @@ class Interpreter:
                 ErrorType.RUNTIME, e.args[0], node.start_pos, node.end_pos
             )
 
-        log = f"File {file.name} closed"
-        self.__log(success_msg(log))
+        if self.__logger:
+            self.__log(f"File {file.name} closed")
 
     def visit_char_repr(self, node: CharReprNode) -> RunTimeObject:
         """Interprets an ascii code and returns the character representation"""
-        expression: RunTimeObject = node.expr.accept(self)
+        return self.handle_char_repr(node, node.expr.accept(self))
+
+    @staticmethod
+    def handle_char_repr(
+        node: CharReprNode, expression: RunTimeObject
+    ) -> RunTimeObject:
+        """Returns the character represented by an evaluated ascii code"""
         if expression.label != "number":
             raise InterpreterError(
                 ErrorType.TYPE,
@@ -689,7 +1326,11 @@ class Interpreter:
 
     def visit_int_repr(self, node: IntReprNode) -> RunTimeObject:
         """Interprets a character and returns the ascii code representation"""
-        expression: RunTimeObject = node.expr.accept(self)
+        return self.handle_int_repr(node, node.expr.accept(self))
+
+    @staticmethod
+    def handle_int_repr(node: IntReprNode, expression: RunTimeObject) -> RunTimeObject:
+        """Returns the ascii code of an evaluated character"""
         if expression.label != "string" or len(expression.value) != 1:
             raise InterpreterError(
                 ErrorType.TYPE,
@@ -712,7 +1353,11 @@ class Interpreter:
 
     def visit_length(self, node: LengthNode) -> RunTimeObject:
         """Interprets a length expression and returns the result of the operation"""
-        expression: RunTimeObject = node.expr.accept(self)
+        return self.handle_length(node, node.expr.accept(self))
+
+    @staticmethod
+    def handle_length(node: LengthNode, expression: RunTimeObject) -> RunTimeObject:
+        """Returns the length of an evaluated string or array"""
         if expression.label != "string" and expression.label != "array":
             raise InterpreterError(
                 ErrorType.TYPE,
@@ -730,11 +1375,19 @@ class Interpreter:
                 ErrorType.RUNTIME, error, node.start_pos, node.end_pos
             )
 
-        lhs = node.left.accept(self)
-        runtime_object = self.__test_for_identifier(lhs)
+        if isinstance(node.left, IdentifierNode):
+            runtime_object = self.lookup_variable(node, node.left.value)
+        else:
+            runtime_object = self._test_for_identifier(node.left.accept(self))
+            if runtime_object.shared:
+                runtime_object = runtime_object.copy()
         runtime_object.value += 1 if node.operator == "++" else -1
         return RunTimeObject("number", runtime_object.value)
 
+    def visit_increment(self, node: IncrementNode):
+        """Interprets a fused x++ or x-- statement"""
+        self.lookup_variable(node, node.identifier).value += node.step
+
     def visit_args(self, node: ArgsNode) -> list[RunTimeObject]:
         """
         Interprets the arguments of a function call and returns a list of runtime objects
@@ -767,7 +1420,7 @@ class Interpreter:
             )
 
         left = node.left.accept(self)
-        left = self.__test_for_identifier(left)
+        left = self._test_for_identifier(left)
 
         if node.operator:
             if not node.right:
@@ -777,121 +1430,65 @@ class Interpreter:
                 )
 
             right = node.right.accept(self)
-            right = self.__test_for_identifier(right)
-
-            # Handle operation
-            if node.operator in ["+", "-", "or"]:
-                return self.handle_additive_expressions(left, right, node.operator)
-            elif node.operator in ["*", "/", "and", "%"]:
-                return self.handle_multiplicative_expressions(
-                    left, right, node.operator
-                )
-            elif node.operator in ["==", "!=", "<", ">", "<=", ">="]:
-                return self.handle_relational_expressions(left, right, node.operator)
-
-            # Invalid operation
-            return throw_invalid_operation_err(
-                left.label,
-                node.operator,
-                right.label,
-                self.node_start_pos,
-                self.node_end_pos,
-            )
+            return self.handle_operation(node, left, self._test_for_identifier(right))
         return left
 
-    def handle_additive_expressions(
-        self, left: RunTimeObject, right: RunTimeObject, op: str
+    def handle_operation(
+        self, node: ExprNode, left: RunTimeObject, right: RunTimeObject
     ) -> RunTimeObject:
         """
-        Handles additive expressions and returns the result of the operation
-        @param left: The left operand of the expression
-        @param right: The right operand of the expression
-        @param op: The operation to be performed on the operands
-        @return: A RunTimeObject representing the result of the operation
+        Applies the operator of an expression to its evaluated operands
+        @raise InterpreterError: If the operation is invalid
         """
-        if op == "+":
-            if left.label == "string" and left.label == right.label:  # String concat
-                return RunTimeObject("string", left.value + right.value)
-            elif left.label == "number" and left.label == right.label:
-                return RunTimeObject("number", left.value + right.value)
-
-        elif op == "-":
-            if left.label == "number" and left.label == right.label:
-                return RunTimeObject("number", left.value - right.value)
-
-        elif op == "or":
-            return RunTimeObject(left.label, left.value or right.value)
+        handler = self.__binary_op_handlers.get(node.operator)
+        if handler:
+            return handler(left, right, node.operator)
 
         # Invalid operation
         return throw_invalid_operation_err(
-            left.label, op, right.label, self.node_start_pos, self.node_end_pos
+            left.label,
+            node.operator,
+            right.label,
+            self.node_start_pos,
+            self.node_end_pos,
         )
 
-    def handle_multiplicative_expressions(
+    def handle_binary_operation(
         self, left: RunTimeObject, right: RunTimeObject, op: str
     ) -> RunTimeObject:
         """
-        Handles multiplicative expressions and returns the result of the operation
-        as a runtime object
+        Handles additive, multiplicative and relational expressions and returns
+        the result of the operation as a runtime object
         @param left: The left operand of the expression
         @param right: The right operand of the expression
         @param op: The operation to be performed on the operands
         @return: A RunTimeObject representing the result of the operation
+        @raise InterpreterError: If the operation is invalid, or divides by zero
         """
-        if op == "*":
-            if (left.label == "string" and right.label == "number") or (
-                left.label == "number" and right.label == "string"
-            ):
-                return RunTimeObject("string", left.value * right.value)
-            elif left.label == "number" and left.label == right.label:
-                return RunTimeObject("number", left.value * right.value)
-
-        elif op == "/":
-            if left.label == "number" and left.label == right.label:
-                if right.value != 0:
-                    return RunTimeObject("number", left.value / right.value)
-                else:
-                    raise InterpreterError(
-                        ErrorType.RUNTIME,
-                        "Division by zero is not kawaii, please don't do that.",
-                        self.node_start_pos,
-                        self.node_end_pos,
-                    )
+        operation = BINARY_OPERATIONS.get((op, left.label, right.label))
+        if operation:
+            function, label = operation
+            try:
+                result = function(left.value, right.value)
+            except ZeroDivisionError:
+                if op != "/":
+                    raise
+                raise InterpreterError(
+                    ErrorType.RUNTIME,
+                    "Division by zero is not kawaii, please don't do that.",
+                    self.node_start_pos,
+                    self.node_end_pos,
+                ) from None
+            if label == "boolean":
+                return HAI if result else IIE
+            return RunTimeObject(label, result)
+
+        elif op == "or":
+            return RunTimeObject(left.label, left.value or right.value)
 
         elif op == "and":
             return RunTimeObject(right.label, left.value and right.value)
 
-        elif op == "%":
-            if left.label == "number" and left.label == right.label:
-                return RunTimeObject("number", left.value % right.value)
-
-        # Invalid operation
-        return throw_invalid_operation_err(
-            left.label, op, right.label, self.node_start_pos, self.node_end_pos
-        )
-
-    def handle_relational_expressions(
-        self, left: RunTimeObject, right: RunTimeObject, op: str
-    ) -> RunTimeObject:
-        """
-        Handles relational expressions and returns the result of the operation
-        as a runtime object
-        @param left: The left operand of the expression
-        @param right: The right operand of the expression
-        @param op: The operation to be performed on the operands
-        @return: A RunTimeObject representing the result of the operation
-        """
-        if left.label == "string" and right.label == "number":
-            res = eval(f"{len(left.value)} {op} {right.value}")
-            return RunTimeObject("boolean", res)
-
-        elif left.label == right.label:
-            if left.label == "string":
-                res = eval(f"{repr(left.value)} {op} {repr(right.value)}")
-            else:
-                res = eval(f"{left.value} {op} {right.value}")
-            return RunTimeObject("boolean", res)
-
         # Invalid operation
         return throw_invalid_operation_err(
             left.label, op, right.label, self.node_start_pos, self.node_end_pos
@@ -908,12 +1505,20 @@ class Interpreter:
             )
 
         left_factor = node.left.accept(self)
-        left_factor = self.__test_for_identifier(left_factor)
+        left_factor = self._test_for_identifier(left_factor)
         if not node.right:
             return left_factor
 
         right_factor = node.right.accept(self)
-        right_factor = self.__test_for_identifier(right_factor)
+        return self.handle_factor(left_factor, self._test_for_identifier(right_factor))
+
+    def handle_factor(
+        self, left_factor: RunTimeObject, right_factor: RunTimeObject
+    ) -> RunTimeObject:
+        """
+        Applies the unary operator of a factor (the left side) to its evaluated operand
+        @raise InterpreterError: If the operand type is invalid
+        """
         if left_factor.value == "not":
             if right_factor.label in ["string", "number", "identifier", "boolean"]:
                 return RunTimeObject("boolean", not right_factor.value)
@@ -934,6 +1539,121 @@ class Interpreter:
                 )
         return left_factor
 
+    def visit_binary_op(self, node: BinaryOpNode) -> RunTimeObject:
+        """
+        Interprets a binary operation and returns the result of the evaluated operation.
+        Operations that ran a few times are quickened for the labels of their operands.
+        """
+        left = node.left.accept(self)
+        right = node.right.accept(self)
+        node.executions += 1
+        if node.executions == QUICKENING_THRESHOLD and self.quickening:
+            self.quicken(node, left, right)
+        return self.handle_binary_op(node, left, right)
+
+    def quicken(self, node: BinaryOpNode, left: RunTimeObject, right: RunTimeObject):
+        """
+        Specialises a binary operation for the labels of the operands it was evaluated with,
+        an operation of other operands tries again after a while
+        """
+        operation = BINARY_OPERATIONS.get((node.operator, left.label, right.label))
+        if operation is None:
+            node.executions = -QUICKENING_BACKOFF
+            return
+
+        function, label = operation
+        node.quickened = (left.label, right.label, function, label)
+        node.label = "quick_comparison" if label == "boolean" else "quick_arithmetic"
+        self.quickening_stats["quickened"] += 1
+
+    def deoptimise(
+        self, node: BinaryOpNode, left: RunTimeObject, right: RunTimeObject
+    ) -> RunTimeObject:
+        """
+        Reverts a specialised binary operation whose operands missed its guard
+        (or which failed) and applies the generic operation to the operands
+        """
+        node.label = "binary_op"
+        node.executions = -QUICKENING_BACKOFF
+        self.quickening_stats["deopts"] += 1
+        return self.handle_binary_op(node, left, right)
+
+    def visit_quick_arithmetic(self, node: BinaryOpNode) -> RunTimeObject:
+        """Interprets a binary operation specialised for the labels of its operands"""
+        left = node.left.accept(self)
+        right = node.right.accept(self)
+        left_label, right_label, function, label = node.quickened
+        if left.label == left_label and right.label == right_label:
+            try:
+                return RunTimeObject(label, function(left.value, right.value))
+            except ZeroDivisionError:
+                pass
+        return self.deoptimise(node, left, right)
+
+    def visit_quick_comparison(self, node: BinaryOpNode) -> RunTimeObject:
+        """Interprets a comparison specialised for the labels of its operands"""
+        left = node.left.accept(self)
+        right = node.right.accept(self)
+        left_label, right_label, function, _ = node.quickened
+        if left.label == left_label and right.label == right_label:
+            return HAI if function(left.value, right.value) else IIE
+        return self.deoptimise(node, left, right)
+
+    def handle_binary_op(
+        self, node: BinaryOpNode, left: RunTimeObject, right: RunTimeObject
+    ) -> RunTimeObject:
+        """
+        Applies the operator of a binary operation to its evaluated operands
+        @raise InterpreterError: If the operation is invalid
+        """
+        self.node_start_pos = node.start_pos
+        self.node_end_pos = node.end_pos
+        handler = self.__binary_op_handlers.get(node.operator)
+        if not handler:
+            return throw_invalid_operation_err(
+                left.label, node.operator, right.label, node.start_pos, node.end_pos
+            )
+        return handler(left, right, node.operator)
+
+    def visit_unary_op(self, node: UnaryOpNode) -> RunTimeObject:
+        """Interprets a unary operation and returns the result of the evaluated operation"""
+        return self.handle_unary_op(node, node.operand.accept(self))
+
+    @staticmethod
+    def handle_unary_op(node: UnaryOpNode, operand: RunTimeObject) -> RunTimeObject:
+        """
+        Applies the operator of a unary operation to its evaluated operand
+        @raise InterpreterError: If the operand type is invalid
+        """
+        if node.operator == "not":
+            if operand.label in ["string", "number", "identifier", "boolean"]:
+                return IIE if operand.value else HAI
+
+            # Invalid operation
+            return throw_unary_type_err(
+                node.operator, operand.value, node.start_pos, node.end_pos
+            )
+
+        try:
+            return RunTimeObject("number", -operand.value)
+        except TypeError as e:
+            raise InterpreterError(
+                ErrorType.TYPE, e.args[0], node.start_pos, node.end_pos
+            )
+
+    @staticmethod
+    def visit_literal(node: LiteralNode) -> RunTimeObject:
+        return node.constant
+
+    def visit_load(self, node: LoadNode) -> RunTimeObject:
+        if node.depth == LOCAL_SCOPE:
+            return self.current_env.lookup_slot(node.slot, node.identifier)
+        if node.depth == GLOBAL_SCOPE:
+            if node.cache_version == self.global_env.version:
+                return node.cached_value
+            return self.lookup_global(node, node.identifier)
+        return self.current_env.lookup_symbol(node.identifier)
+
     @staticmethod
     def visit_operator(node: OperatorNode) -> RunTimeObject:
         return RunTimeObject("operator", node.value)
@@ -944,21 +1664,53 @@ class Interpreter:
 
     @staticmethod
     def visit_numeric_literal(node: NumericLiteralNode) -> RunTimeObject:
-        return RunTimeObject("number", node.value)
+        return node.constant
 
     @staticmethod
     def visit_string_literal(node: StringLiteralNode) -> RunTimeObject:
-        return RunTimeObject("string", node.value)
+        return node.constant
 
     @staticmethod
     def visit_boolean_literal(node: BooleanNode) -> RunTimeObject:
-        return RunTimeObject("boolean", node.value)
+        return node.constant
 
     @staticmethod
     def generic_visit(node: Node):
         raise NotImplementedError(f"No visit_{node.label} method defined")
 
-    def __test_for_identifier(
+    def lookup_variable(self, node: Node, identifier: str) -> RunTimeObject:
+        """
+        Looks up the variable of a node in the scope the resolver resolved it to
+        (in the scope chain, if the node was not resolved)
+        @raise Exception: If the variable is not found
+        """
+        if node.depth == LOCAL_SCOPE:
+            return self.current_env.lookup_slot(node.slot, identifier)
+        if node.depth == GLOBAL_SCOPE:
+            return self.lookup_global(node, identifier)
+        return self.current_env.lookup_symbol(identifier)
+
+    def lookup_global(self, node: Node, identifier: str) -> RunTimeObject:
+        """
+        Looks up a global variable through the inline cache of the node,
+        which is refilled when the global scope changed since it was filled
+        @raise Exception: If the variable is not found
+        """
+        global_env = self.global_env
+        if node.cache_version == global_env.version:
+            return node.cached_value
+        runtime_object = global_env.lookup_symbol(identifier)
+        node.cached_value, node.cache_version = runtime_object, global_env.version
+        return runtime_object
+
+    def assign_variable(self, node: Node, identifier: str, value: RunTimeObject):
+        """Assigns a runtime object to the variable of a node, in its resolved scope"""
+        if node.depth == LOCAL_SCOPE:
+            self.current_env.assign_slot(node.slot, identifier, value)
+        else:
+            self.current_env.insert_symbol(identifier, VarSymbol(identifier, value))
+
+    def _test_for_identifier(
         self, runtime_object: RunTimeObject, current_scope=False
     ) -> RunTimeObject:
         """Checks if the runtime object is an identifier, and returns its value"""
@@ -983,3 +1735,7 @@ class Interpreter:
                 node.end_pos,
             )
         self.__stack_pointer += 1
+
+    def release_stack_frame(self):
+        """Pops the frame of a returned function call off the internal stack"""
+        self.__stack_pointer -= 1
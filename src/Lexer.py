@@ -1,8 +1,19 @@
+import re
+import sys
 from pathlib import Path
-from src.core.Token import Token, Position
+from typing import Iterator, Optional, TextIO
+
+from src.core.Token import Token, SourceMap
 from src.core.Types import TokenType
-from src.utils.Constants import EOF, MAX_ID_LEN, MAX_STR_LEN
+from src.utils.Constants import (
+    EOF,
+    MAX_ID_LEN,
+    MAX_STR_LEN,
+    MAX_BULK_READ_SIZE,
+    SOURCE_CHUNK_SIZE,
+)
 from src.utils.ErrorHandler import LexerError
+from src.utils.Logger import Logger, LogLevel, subsystem_logger
 
 RESERVED_WORDS = {
     "uWu_nyaa": TokenType.MAIN,
@@ -33,80 +44,231 @@ RESERVED_WORDS = {
     "len": TokenType.LEN,
 }
 
+# Characters that matter when matching the braces of a block without tokenizing it
+BLOCK_PATTERN = re.compile(r'[{}"#]')
+STRING_END_PATTERN = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+
+
+def match_braces(source: str, start: int) -> int:
+    """
+    Finds the brace closing the block opened at source[start], skipping over
+    strings and comments (with the same rules as the lexer)
+    @param source: The source containing the block
+    @param start: The index of the opening brace
+    @return: The index following the closing brace, or -1 if the block is not closed
+    """
+    search = BLOCK_PATTERN.search
+    find = source.find
+    depth = 0
+    index = start
+    while match := search(source, index):
+        char = match.group()
+        index = match.end()
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return index
+        elif char == '"':
+            string_end = STRING_END_PATTERN.match(source, index)
+            if not string_end:
+                return -1
+            index = string_end.end()
+        elif source.startswith("#", index):
+            # A block comment ends after two more '#' characters
+            index = find("#", index + 1)
+            if index == -1:
+                return -1
+            index = find("#", index + 1)
+            if index == -1:
+                return -1
+            index += 1
+        else:
+            index = find("\n", index)
+            if index == -1:
+                return -1
+    return -1
+
 
 class Lexer:
     """Represents a Lexer that tokenizes the source code"""
 
-    def __init__(self, verbose: bool = False) -> None:
+    def __init__(self, verbose: bool = False, logger: Optional[Logger] = None) -> None:
         """
         Initializes the Lexer
-        @param verbose: Flag to enable logging
+        @param verbose: Flag to enable logging (to the console, if no logger is given)
+        @param logger: Logger of the lexer subsystem
         """
         self.__char = ""
-        self.__last_read_char = ""
-        self.__line_number = 1
-        self.__column_number = 0
-        self.__token_position = Position(
-            line=self.__line_number, col=self.__column_number
-        )
-
-        self.__program_buffer: list[str] = []
-        self.__token_buffer: list[Token] = []
-        self.__verbose = verbose
+        self.__token_offset = -1
+
+        # The source is scanned with an integer cursor over a string buffer.
+        # For streamed sources the buffer only holds the current chunk,
+        # starting at the source offset __buffer_base.
+        self.__program_buffer = ""
+        self.__buffer_length = 0
+        self.__buffer_base = 0
+        self.__cursor = 0
+        self.source_map = SourceMap()
+        self.__source_stream: Optional[TextIO] = None
+
+        self.__logger = subsystem_logger("lexer", verbose, logger)
+        if self.__logger and self.__logger.enabled_for(LogLevel.TRACE):
+            self.get_token = self.__get_logged_token
+            self.iter_tokens = self.__iter_logged_tokens
 
     def init(self) -> None:
-        self.__init__(self.__verbose)
+        self.__close_stream()
+        self.__init__(logger=self.__logger)
 
     def __next_char(self) -> None:
-        """Get the next character from the program file"""
-        if self.__last_read_char == "\n":
-            self.__line_number += 1
-            self.__column_number = 0
-
-        if len(self.__program_buffer) == 0:
+        """Get the next character from the program source"""
+        if self.__cursor >= self.__buffer_length and not self.__read_chunk():
             self.__char = EOF
             return
 
-        self.__char = self.__program_buffer.pop(0)
-        self.__last_read_char = self.__char
-        self.__column_number += 1
+        self.__char = self.__program_buffer[self.__cursor]
+        self.__cursor += 1
+
+    def __load_buffer(self, source: str) -> None:
+        """Replaces the program buffer and rewinds the cursor"""
+        self.__buffer_base += self.__buffer_length
+        self.source_map.extend(source)
+        self.__program_buffer = source
+        self.__buffer_length = len(source)
+        self.__cursor = 0
+
+    def __read_chunk(self) -> bool:
+        """
+        Loads the next chunk of a streamed source into the program buffer
+        @return: True if a new chunk was loaded, False once the stream is exhausted
+        """
+        if not self.__source_stream:
+            return False
+
+        chunk = self.__source_stream.read(SOURCE_CHUNK_SIZE)
+        if not chunk:
+            self.__close_stream()
+            return False
+
+        self.__load_buffer(chunk)
+        return True
+
+    def __close_stream(self) -> None:
+        """Closes the streamed source (if any)"""
+        if self.__source_stream:
+            self.__source_stream.close()
+            self.__source_stream = None
 
     def analyze_src_file(self, source_file: Path) -> None:
-        """Reads in the source file for tokenization"""
+        """
+        Reads in the source file for tokenization.
+        Files up to MAX_BULK_READ_SIZE bytes are read in a single call,
+        larger files are streamed in chunks of SOURCE_CHUNK_SIZE characters.
+        """
+        self.init()
+        source_file = Path(source_file)
+        if source_file.stat().st_size > MAX_BULK_READ_SIZE:
+            self.analyze_stream(open(source_file, "r"))
+            return
+
         with open(source_file, "r") as source:
-            c = source.read(1)
-            while c:
-                self.__program_buffer.append(c)
-                c = source.read(1)
+            self.__load_buffer(source.read())
+        self.__next_char()
+
+    def analyze_stream(self, source: TextIO) -> None:
+        """
+        Tokenizes a text stream (e.g. a pipe or a very large file) chunk by chunk.
+        The lexer takes ownership of the stream and closes it once exhausted.
+        """
+        self.init()
+        self.__source_stream = source
+        self.__next_char()
+
+    def analyze_string(self, source: str) -> None:
+        """Reads in source code held in a string for tokenization"""
+        self.init()
+        self.__load_buffer(source)
         self.__next_char()
 
     def analyze_repl(self, repl_input: str) -> None:
         """Reads in the REPL input for tokenization"""
         self.init()
-        self.__program_buffer = list(repl_input)
+        self.__load_buffer(repl_input)
         self.__next_char()
 
-    def peek_token(self) -> Token:
-        """Looks ahead at the next token to be processed (used during parsing)"""
-        token = self.get_token()
-        self.__token_buffer.append(token)
-        return token
+    def analyze_span(self, source: str, offset: int, source_map: SourceMap) -> None:
+        """
+        Reads in part of a source for tokenization (e.g. a lazily parsed function body)
+        @param source: The part of the source to tokenize
+        @param offset: The source offset of the first character of the part
+        @param source_map: The source map of the whole source
+        """
+        self.init()
+        self.__program_buffer = source
+        self.__buffer_length = len(source)
+        self.__buffer_base = offset
+        self.source_map = source_map
+        self.__next_char()
+
+    def skim_block(self) -> Optional[tuple[str, int]]:
+        """
+        Skips the block opened by the last token scanned (a '{') up to its matching '}',
+        without tokenizing it
+        @return: The source of the block (braces included) and its offset, or None if
+        the block cannot be skipped (it is not closed or the source is streamed)
+        """
+        start = self.__token_offset - self.__buffer_base
+        if self.__source_stream or not 0 <= start < self.__buffer_length:
+            return None
+        if self.__program_buffer[start] != "{":
+            return None
+
+        end = match_braces(self.__program_buffer, start)
+        if end == -1:
+            return None
+
+        self.__cursor = end
+        self.__next_char()
+        return self.__program_buffer[start:end], self.__token_offset
 
     def get_token(self) -> Token:
+        """Scans and returns the next token from the source"""
+        return self._scan_token()
+
+    def iter_tokens(self) -> Iterator[Token]:
+        """Lazily yields the tokens of the source, up to and including the end marker"""
+        scan_token = self._scan_token
+        while True:
+            token = scan_token()
+            yield token
+            if token.type is TokenType.ENDMARKER:
+                return
+
+    def __get_logged_token(self) -> Token:
+        """get_token, logging the token (installed when tokens are traced)"""
+        token = self._scan_token()
+        self.__logger.trace(f"Token: {token}")
+        return token
+
+    def __iter_logged_tokens(self) -> Iterator[Token]:
+        """iter_tokens, logging each token (installed when tokens are traced)"""
+        for token in Lexer.iter_tokens(self):
+            self.__logger.trace(f"Token: {token}")
+            yield token
+
+    def _scan_token(self) -> Token:
         """
         Scans through the source until a recognized symbol or
         keyword is found and returns it as a token object.
         """
-        if len(self.__token_buffer) > 0:
-            return self.__token_buffer.pop(0)
-
         token = Token()
         while self.__char.isspace():
             self.__next_char()
 
-        self.__token_position = Position(
-            line=self.__line_number, col=self.__column_number
-        )
+        # Offset of the current character (the last one read at the end of the source)
+        self.__token_offset = self.__buffer_base + self.__cursor - 1
 
         if self.__char != EOF:
             if self.__char.isalpha() or self.__char == "_":
@@ -222,7 +384,7 @@ class Lexer:
                         self.__skip_comment_block(count=2)
                     else:
                         self.__skip_comment()
-                    token = self.get_token()
+                    token = self._scan_token()
                 else:
                     raise LexerError(
                         f"Unrecognized character '{self.__char}'",
@@ -233,9 +395,7 @@ class Lexer:
             token.type = TokenType.ENDMARKER
 
         # Remember position for error reporting
-        token.position = self.__token_position
-
-        self.__log(f"Token: {token}")
+        token.offset = self.__token_offset
         return token
 
     def __process_word(self, token: Token) -> None:
@@ -257,7 +417,8 @@ class Lexer:
             token.type = RESERVED_WORDS[processed_word]
             return
 
-        token.word = processed_word
+        # Identifiers repeat throughout a program, share a single copy of each name
+        token.word = sys.intern(processed_word)
         token.type = TokenType.ID
 
     def __process_number(self, token: Token) -> None:
@@ -275,7 +436,7 @@ class Lexer:
 
     def __process_float(self, token: Token) -> None:
         """Scan through the source code and process a found float number into a token"""
-        if not isinstance(token.number, int):
+        if not isinstance(token.number, int) or not self.__char.isdigit():
             raise LexerError("Invalid float number", self.line_number, self.col_number)
 
         processed_number = float(self.__char)
@@ -337,13 +498,13 @@ class Lexer:
 
     def __skip_comment(self) -> None:
         """Skip a single line comment"""
-        while self.__char != "\n":
+        while self.__char != "\n" and self.__char != EOF:
             self.__next_char()
 
     def __skip_comment_block(self, count: int) -> None:
         """Skip a block comment"""
         while True:
-            if count == 0:
+            if count == 0 or self.__char == EOF:
                 break
 
             if self.__char == "#":
@@ -353,14 +514,9 @@ class Lexer:
     @property
     def line_number(self) -> int:
         """Returns the line number of the current token"""
-        return self.__token_position.line_number
+        return self.source_map.position(self.__token_offset).line_number
 
     @property
     def col_number(self) -> int:
         """Returns the column number of the current token"""
-        return self.__token_position.column_number
-
-    def __log(self, message: str) -> None:
-        """Logs a message if verbose is enabled"""
-        if self.__verbose:
-            print(message)
+        return self.source_map.position(self.__token_offset).column_number
@@ -1,6 +1,7 @@
+from contextlib import contextmanager
 from pathlib import Path
 import sys
-from typing import Optional
+from typing import Generator, Iterator, Optional, TextIO
 
 from src.Lexer import Lexer
 from src.core.ASTNodes import (
@@ -35,9 +36,28 @@ from src.core.ASTNodes import (
     CharReprNode,
     LengthNode,
     IntReprNode,
+    BinaryOpNode,
+    UnaryOpNode,
+    LiteralNode,
+    LoadNode,
+    LazyBodyNode,
+    mark_tail_calls,
+)
+from src.core.Token import Token, SourceMap
+from src.core.TokenStream import TokenStream
+from src.core.Types import (
+    TokenType,
+    ADDITIVE_OPERATOR_TOKENS,
+    BINARY_OPERATOR_TOKENS,
+    CALLABLE_TOKENS,
+    CONDITIONAL_STATEMENT_START_TOKENS,
+    FACTOR_START_TOKENS,
+    FILE_IO_TOKENS,
+    MULTIPLICATIVE_OPERATOR_TOKENS,
+    POSTFIX_OPERATOR_TOKENS,
+    RELATIONAL_OPERATOR_TOKENS,
+    STATEMENT_START_TOKENS,
 )
-from src.core.Token import Token
-from src.core.Types import TokenType
 from src.utils.ErrorHandler import (
     success_msg,
     warning_msg,
@@ -45,32 +65,197 @@ from src.utils.ErrorHandler import (
     ParserError,
     LexerError,
 )
+from src.utils.Logger import Logger, LogLevel, subsystem_logger
+
+OPERATOR_SYMBOLS = {
+    TokenType.PLUS: "+",
+    TokenType.MINUS: "-",
+    TokenType.MULTIPLY: "*",
+    TokenType.DIVIDE: "/",
+    TokenType.AND: "and",
+    TokenType.OR: "or",
+    TokenType.LT: "<",
+    TokenType.GT: ">",
+    TokenType.LTE: "<=",
+    TokenType.GTE: ">=",
+    TokenType.EQ: "==",
+    TokenType.NEQ: "!=",
+    TokenType.MODULO: "%",
+}
+
+# Parse steps of a nested block. A step generator yields the steps of the blocks
+# nested in it and is sent back their nodes (see Parser.__run).
+ParseSteps = Generator["ParseSteps", Optional[Node], Optional[Node]]
+
+
+# Binding power of binary operators for the precedence-climbing expression parser.
+# Relational (and logical) operators bind the loosest and are right associative,
+# as in the grammar rule  expr: simpleExpr (relationalOp expr)?
+RELATIONAL_PRECEDENCE = 1
+ADDITIVE_PRECEDENCE = 2
+MULTIPLICATIVE_PRECEDENCE = 3
+BINARY_PRECEDENCE = {
+    **dict.fromkeys(RELATIONAL_OPERATOR_TOKENS, RELATIONAL_PRECEDENCE),
+    **dict.fromkeys(ADDITIVE_OPERATOR_TOKENS, ADDITIVE_PRECEDENCE),
+    **dict.fromkeys(MULTIPLICATIVE_OPERATOR_TOKENS, MULTIPLICATIVE_PRECEDENCE),
+}
+# Expected token hint reported when the operand following an operator is missing
+OPERAND_EXPECTED = {
+    RELATIONAL_PRECEDENCE: "[EXPRESSION_TYPE]",
+    ADDITIVE_PRECEDENCE: "[TERM_TYPE]",
+    MULTIPLICATIVE_PRECEDENCE: "[FACTOR_TYPE]",
+}
+
+
+# Recursion limit while parsing, as expressions are parsed recursively
+# (the stack interpreter runs with the default limit of Python).
+# Before Python 3.11, nested Python calls also recursed on the C stack, which overflows
+# (segfaults) long before a higher limit is reached.
+PARSE_RECURSION_LIMIT = 1000000 if sys.version_info >= (3, 11) else 15000
+
+
+@contextmanager
+def parse_recursion_limit() -> Iterator[None]:
+    """Raises the recursion limit of Python to PARSE_RECURSION_LIMIT while parsing"""
+    recursion_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(recursion_limit, PARSE_RECURSION_LIMIT))
+    try:
+        yield
+    finally:
+        sys.setrecursionlimit(recursion_limit)
 
 
 class Parser:
-    def __init__(self, *, lexer: Lexer, verbose=False):
+    def __init__(
+        self,
+        *,
+        lexer: Lexer,
+        verbose=False,
+        flat_expressions=True,
+        lazy_bodies=False,
+        logger: Optional[Logger] = None,
+    ):
+        """
+        @param lexer: The lexer providing the tokens
+        @param verbose: Flag to enable logging (to the console, if no logger is given)
+        @param flat_expressions: Parse expressions into flat BinaryOp/UnaryOp/Literal/Load
+        nodes with precedence climbing. Otherwise, expressions are parsed into the
+        Expr/SimpleExpr/Term/Factor node hierarchy of the grammar.
+        @param lazy_bodies: Only match the braces of function bodies, leaving them to be
+        parsed when the function is first called (see parse_lazy_body).
+        Syntax errors within functions that are never called are not reported.
+        @param logger: Logger of the parser subsystem
+        """
         self.curr_tkn: Token = Token()
         self.__lexer = lexer
-        self.__verbose = verbose
+        self.__tokens = TokenStream(iter(()))
+        self.__logger = subsystem_logger("parser", verbose, logger)
+        if self.__logger and self.__logger.enabled_for(LogLevel.TRACE):
+            self.__consume_token = self.__consume_logged_token
+        self.__flat_expressions = flat_expressions
+        self.__lazy_bodies = lazy_bodies
+
+        # Dispatch tables, each token only costs a single lookup to find its parse method
+        self.__statement_parsers = {
+            TokenType.RET: self.parse_return,
+            TokenType.ID: self.__parse_id_statement,
+            TokenType.WHILE: self.parse_while,
+            TokenType.FOR: self.parse_for,
+            TokenType.IF: self.parse_if,
+        }
+        self.__statement_parsers.update(
+            dict.fromkeys(CALLABLE_TOKENS, self.parse_callable)
+        )
+
+        # Statements containing nested blocks are parsed in steps, without recursion
+        self.__block_statement_steps = {
+            TokenType.WHILE: self.__while_steps,
+            TokenType.FOR: self.__for_steps,
+            TokenType.IF: self.__if_steps,
+        }
+
+        # Statements starting with an identifier are dispatched on the token following it
+        self.__id_statement_parsers = {
+            TokenType.ASSIGN: self.parse_assignment,
+            TokenType.LPAR: self.parse_func_call,
+            TokenType.TO: self.parse_pointer_assignment,
+            TokenType.LBRACKET: self.parse_array_assignment,
+        }
+        self.__id_statement_parsers.update(
+            dict.fromkeys(POSTFIX_OPERATOR_TOKENS, self.parse_postfix)
+        )
 
-    def __log(self, msg, success=True) -> None:
+        self.__callable_parsers = {
+            TokenType.PRINT: self.parse_print,
+            TokenType.PRINTLN: self.parse_print,
+            TokenType.INPUT: self.parse_input,
+            TokenType.GET_CHAR: self.parse_char_repr,
+            TokenType.GET_INT: self.parse_int_repr,
+            TokenType.LEN: self.parse_length,
+            TokenType.ID: self.parse_func_call,
+        }
+        self.__callable_parsers.update(
+            dict.fromkeys(FILE_IO_TOKENS, self.parse_file_IO)
+        )
+
+        self.__factor_parsers = {
+            TokenType.ID: self.__parse_id_factor,
+            TokenType.INT: self.__parse_numeric_literal,
+            TokenType.FLOAT: self.__parse_numeric_literal,
+            TokenType.STR: self.__parse_string_literal,
+            TokenType.TRUE: self.__parse_boolean,
+            TokenType.FALSE: self.__parse_boolean,
+            TokenType.LPAR: self.__parse_parenthesised_expr,
+            TokenType.NOT: self.__parse_negation,
+            TokenType.MINUS: self.__parse_negation,
+        }
+
+        self.__operand_parsers = {
+            TokenType.ID: self.__parse_id_operand,
+            TokenType.INT: self.__parse_number_operand,
+            TokenType.FLOAT: self.__parse_number_operand,
+            TokenType.STR: self.__parse_string_operand,
+            TokenType.TRUE: self.__parse_boolean_operand,
+            TokenType.FALSE: self.__parse_boolean_operand,
+            TokenType.LPAR: self.__parse_parenthesised_operand,
+            TokenType.NOT: self.__parse_unary_op,
+            TokenType.MINUS: self.__parse_unary_op,
+        }
+
+    def __log(self, msg: str) -> None:
         """
-        Log a message to the console
+        Logs the construct being parsed
         @param msg: The message to display
-        @param success: Whether the message is a success message or not
         """
-        if not self.__verbose:
-            return
-
-        message = success_msg(msg) if success else warning_msg(msg)
-        print(message)
+        if self.__logger:
+            self.__logger.info(success_msg(msg))
 
     def __expected_token(self, expected_type: TokenType) -> bool:
         return self.curr_tkn.type == expected_type
 
+    @property
+    def options(self) -> str:
+        """Describes the parser settings that affect the shape of the AST"""
+        return f"flat_expressions={self.__flat_expressions},lazy_bodies={self.__lazy_bodies}"
+
+    @property
+    def source_map(self) -> SourceMap:
+        """Returns the map from source offsets to positions of the last parsed source"""
+        return self.__lexer.source_map
+
+    @property
+    def __line_number(self) -> int:
+        """Returns the line number of the current token"""
+        return self.source_map.position(self.curr_tkn.offset).line_number
+
+    @property
+    def __col_number(self) -> int:
+        """Returns the column number of the current token"""
+        return self.source_map.position(self.curr_tkn.offset).column_number
+
     def __peek_token(self) -> Token:
         """Peek at the next token to be parsed"""
-        return self.__lexer.peek_token()
+        return self.__tokens.peek()
 
     def __expect_and_consume(self, expected_type: TokenType) -> None:
         """
@@ -81,8 +266,8 @@ class Parser:
             return throw_unexpected_token_err(
                 self.curr_tkn.type,
                 expected_type.__str__(),
-                self.curr_tkn.line_num,
-                self.curr_tkn.column_num,
+                self.__line_number,
+                self.__col_number,
             )
         self.__consume_token()
 
@@ -91,12 +276,15 @@ class Parser:
         Check the current token is of an operator type.
         Consume the token if it matches, otherwise throw an error
         """
-        if not (TokenType.bin_op(self.curr_tkn) or TokenType(self.curr_tkn.type)):
+        if not (
+            self.curr_tkn.type in BINARY_OPERATOR_TOKENS
+            or TokenType(self.curr_tkn.type)
+        ):
             return throw_unexpected_token_err(
                 self.curr_tkn.type,
                 "[OPERATOR_TYPE]",
-                self.curr_tkn.line_num,
-                self.curr_tkn.column_num,
+                self.__line_number,
+                self.__col_number,
             )
         self.__consume_token()
 
@@ -104,8 +292,17 @@ class Parser:
         """
         Consumes the current token and prepares the next token to be parsed
         """
-        self.__log(f"Consuming {self.curr_tkn}...", success=False)
-        self.curr_tkn = self.__lexer.get_token()
+        self.curr_tkn = next(self.__tokens)
+
+    def __consume_logged_token(self) -> None:
+        """__consume_token, logging the token (installed when tokens are traced)"""
+        self.__logger.trace(warning_msg(f"Consuming {self.curr_tkn}..."))
+        self.curr_tkn = next(self.__tokens)
+
+    def __open_token_stream(self) -> None:
+        """Starts reading tokens from the source the lexer was prepared with"""
+        self.__tokens = TokenStream(self.__lexer.iter_tokens())
+        self.__consume_token()
 
     def __handle_op_token(self) -> str:
         """
@@ -114,49 +311,46 @@ class Parser:
         """
         token_type = self.curr_tkn.type
         self.__expect_and_consume_op()
-        match token_type:
-            case TokenType.PLUS:
-                return "+"
-            case TokenType.MINUS:
-                return "-"
-            case TokenType.MULTIPLY:
-                return "*"
-            case TokenType.DIVIDE:
-                return "/"
-            case TokenType.AND:
-                return "and"
-            case TokenType.OR:
-                return "or"
-            case TokenType.LT:
-                return "<"
-            case TokenType.GT:
-                return ">"
-            case TokenType.LTE:
-                return "<="
-            case TokenType.GTE:
-                return ">="
-            case TokenType.EQ:
-                return "=="
-            case TokenType.NEQ:
-                return "!="
-            case TokenType.MODULO:
-                return "%"
-            case _:
-                return throw_unexpected_token_err(
-                    token_type,
-                    "[OPERATOR_TYPE]",
-                    self.curr_tkn.line_num,
-                    self.curr_tkn.column_num,
-                )
+        if operator := OPERATOR_SYMBOLS.get(token_type):
+            return operator
+
+        return throw_unexpected_token_err(
+            token_type,
+            "[OPERATOR_TYPE]",
+            self.__line_number,
+            self.__col_number,
+        )
+
+    @staticmethod
+    def __run(steps: ParseSteps) -> Optional[Node]:
+        """
+        Runs the parse steps of a block with an explicit stack,
+        so deeply nested blocks do not recurse on the Python stack
+        @param steps: The parse steps of the outermost block
+        @return: The node of the outermost block
+        """
+        frames = [steps]
+        node = None
+        while frames:
+            try:
+                nested_steps = frames[-1].send(node)
+            except StopIteration as stop:
+                frames.pop()
+                node = stop.value
+                continue
+
+            frames.append(nested_steps)
+            node = None
+        return node
 
     def parse_program(self) -> ProgramNode:
         """program: funcDef* MAIN LPAR RPAR TO (LBRACE body RBRACE | statement ';') | EOF;"""
         program_node = ProgramNode()
-        program_node.start_pos = self.curr_tkn.position
+        program_node.start_pos = self.curr_tkn.offset
 
         if self.curr_tkn.type == TokenType.ENDMARKER:
             program_node.set_eof()
-            program_node.end_pos = self.curr_tkn.position
+            program_node.end_pos = self.curr_tkn.offset
             return program_node
 
         # parse function definitions
@@ -169,7 +363,7 @@ class Parser:
         self.__expect_and_consume(TokenType.TO)
 
         # Parse single statement or multiple statements
-        if TokenType.statement_start(self.curr_tkn):
+        if self.curr_tkn.type in STATEMENT_START_TOKENS:
             program_node.set_body(self.parse_body())
             self.__expect_and_consume(TokenType.SEMICOLON)
         else:
@@ -179,31 +373,43 @@ class Parser:
             self.__expect_and_consume(TokenType.RBRACE)
 
         self.__expect_and_consume(TokenType.ENDMARKER)
-        program_node.end_pos = self.curr_tkn.position
+        program_node.end_pos = self.curr_tkn.offset
         return program_node
 
     def parse_body(self) -> BodyNode:
         """body:   statement*"""
+        return self.__run(self.__body_steps())
+
+    def __body_steps(self) -> ParseSteps:
         self.__log("<Body>")
 
         body = BodyNode()
-        start_pos = self.curr_tkn.position
-        while TokenType.statement_start(self.curr_tkn):
-            body.append(self.parse_statement())
+        start_pos = self.curr_tkn.offset
+        while self.curr_tkn.type in STATEMENT_START_TOKENS:
+            if self.curr_tkn.type in self.__block_statement_steps:
+                body.append((yield self.__statement_steps()))
+            else:
+                body.append(self.__parse_simple_statement())
 
         self.__log("</Body>")
         body.start_pos = start_pos
-        body.end_pos = self.curr_tkn.position
+        body.end_pos = self.curr_tkn.offset
         return body
 
     def parse_conditional_body(self) -> Node:
         """conditionalBody:  statement conditionalBody? | BREAK | CONTINUE"""
+        return self.__run(self.__conditional_body_steps())
+
+    def __conditional_body_steps(self) -> ParseSteps:
         self.__log("<ConditionalBody>")
         body = BodyNode()
-        body.start_pos = self.curr_tkn.position
+        body.start_pos = self.curr_tkn.offset
 
-        while TokenType.statement_start(self.curr_tkn):
-            body.append(self.parse_statement())
+        while self.curr_tkn.type in STATEMENT_START_TOKENS:
+            if self.curr_tkn.type in self.__block_statement_steps:
+                body.append((yield self.__statement_steps()))
+            else:
+                body.append(self.__parse_simple_statement())
 
         if self.__expected_token(TokenType.BREAK):
             self.__expect_and_consume(TokenType.BREAK)
@@ -213,7 +419,7 @@ class Parser:
             body.append(ContinueNode())
 
         self.__log("</ConditionalBody>")
-        body.end_pos = self.curr_tkn.position
+        body.end_pos = self.curr_tkn.offset
         return body
 
     def parse_statement(self) -> Node:
@@ -222,60 +428,53 @@ class Parser:
                     | whileStatement | ifStatement | printStatement
                     | inputStatement | callStatement | postfixStatement
         """
-        start_pos = self.curr_tkn.position
-
-        if self.__expected_token(TokenType.RET):
-            statement_node = self.parse_return()
-
-        elif self.__expected_token(TokenType.ID):
-            if self.__peek_token().type == TokenType.ASSIGN:
-                statement_node = self.parse_assignment()
-
-            elif TokenType.postfix(self.__peek_token()):
-                statement_node = self.parse_postfix()
+        return self.__run(self.__statement_steps())
 
-            elif self.__peek_token().type == TokenType.LPAR:
-                statement_node = self.parse_func_call()
+    def __statement_steps(self) -> ParseSteps:
+        block_steps = self.__block_statement_steps.get(self.curr_tkn.type)
+        if not block_steps:
+            return self.__parse_simple_statement()
 
-            elif self.__peek_token().type == TokenType.TO:
-                statement_node = self.parse_pointer_assignment()
-
-            elif self.__peek_token().type == TokenType.LBRACKET:
-                statement_node = self.parse_array_assignment()
+        start_pos = self.curr_tkn.offset
+        statement_node = yield block_steps()
+        statement_node.start_pos = start_pos
+        statement_node.end_pos = self.curr_tkn.offset
+        return statement_node
 
-            else:
-                self.__expect_and_consume(TokenType.ID)
-                return throw_unexpected_token_err(
-                    self.curr_tkn.type,
-                    "[ASSIGNMENT_TYPE or POSTFIX_TYPE or FUNC_CALL_TYPE]",
-                    self.curr_tkn.line_num,
-                    self.curr_tkn.column_num,
-                )
-        else:
-            if self.__expected_token(TokenType.WHILE):
-                statement_node = self.parse_while()
-            elif self.__expected_token(TokenType.FOR):
-                statement_node = self.parse_for()
-            elif self.__expected_token(TokenType.IF):
-                statement_node = self.parse_if()
-            elif TokenType.callable(self.curr_tkn):
-                statement_node = self.parse_callable()
-            else:
-                return throw_unexpected_token_err(
-                    self.curr_tkn.type,
-                    "[STATEMENT_TYPE]",
-                    self.curr_tkn.line_num,
-                    self.curr_tkn.column_num,
-                )
+    def __parse_simple_statement(self) -> Node:
+        """Parses a statement without nested blocks"""
+        start_pos = self.curr_tkn.offset
+        statement_parser = self.__statement_parsers.get(self.curr_tkn.type)
+        if not statement_parser:
+            return throw_unexpected_token_err(
+                self.curr_tkn.type,
+                "[STATEMENT_TYPE]",
+                self.__line_number,
+                self.__col_number,
+            )
 
+        statement_node = statement_parser()
         statement_node.start_pos = start_pos
-        statement_node.end_pos = self.curr_tkn.position
+        statement_node.end_pos = self.curr_tkn.offset
         return statement_node
 
+    def __parse_id_statement(self) -> Node:
+        """Parses a statement starting with an identifier"""
+        statement_parser = self.__id_statement_parsers.get(self.__peek_token().type)
+        if not statement_parser:
+            self.__expect_and_consume(TokenType.ID)
+            return throw_unexpected_token_err(
+                self.curr_tkn.type,
+                "[ASSIGNMENT_TYPE or POSTFIX_TYPE or FUNC_CALL_TYPE]",
+                self.__line_number,
+                self.__col_number,
+            )
+        return statement_parser()
+
     def parse_pointer_assignment(self):
         """PointerAssignment: ID TO array_def | file_open"""
         pointer_node = Node("null")
-        pointer_node.start_pos = self.curr_tkn.position
+        pointer_node.start_pos = self.curr_tkn.offset
 
         identifier = self.curr_tkn.word
         self.__expect_and_consume(TokenType.ID)
@@ -290,18 +489,18 @@ class Parser:
                 return throw_unexpected_token_err(
                     self.curr_tkn.type,
                     "[ARRAY_DEF_TYPE or FILE_OPEN_TYPE]",
-                    self.curr_tkn.line_num,
-                    self.curr_tkn.column_num,
+                    self.__line_number,
+                    self.__col_number,
                 )
 
-        pointer_node.end_pos = self.curr_tkn.position
+        pointer_node.end_pos = self.curr_tkn.offset
         return pointer_node
 
     def parse_func_def(self) -> FuncDefNode:
         """
         FuncDef:  DEF ID args TO (LBRACE body RBRACE | statement ';')
         """
-        start_pos = self.curr_tkn.position
+        start_pos = self.curr_tkn.offset
         self.__expect_and_consume(TokenType.DEF)
         identifier = self.curr_tkn.word
         self.__expect_and_consume(TokenType.ID)
@@ -313,38 +512,94 @@ class Parser:
         else:
             args = self.parse_params()
         self.__expect_and_consume(TokenType.TO)
-        if TokenType.statement_start(self.curr_tkn):
+        if self.curr_tkn.type in STATEMENT_START_TOKENS:
             body = self.parse_body()
+        elif self.__lazy_bodies:
+            body = self.__skim_body()
         else:
             self.__expect_and_consume(TokenType.LBRACE)
             body = self.parse_body()
             self.__expect_and_consume(TokenType.RBRACE)
+        mark_tail_calls(body)
 
         func_def_node = FuncDefNode(identifier, args, body)
         func_def_node.start_pos = start_pos
-        func_def_node.end_pos = self.curr_tkn.position
+        func_def_node.end_pos = self.curr_tkn.offset
         return func_def_node
 
+    def __skim_body(self) -> Node:
+        """
+        LazyBody: LBRACE (any source with matching braces) RBRACE
+        Falls back to parsing the body if the lexer cannot skip it.
+        """
+        self.__log("<LazyBody>")
+        start_pos = self.curr_tkn.offset
+        block = None
+        if self.__expected_token(TokenType.LBRACE) and not self.__tokens.buffered:
+            block = self.__lexer.skim_block()
+
+        if not block:
+            self.__expect_and_consume(TokenType.LBRACE)
+            body = self.parse_body()
+            self.__expect_and_consume(TokenType.RBRACE)
+            return body
+
+        # The token following the block
+        self.__consume_token()
+
+        source, offset = block
+        lazy_body = LazyBodyNode(
+            source,
+            offset,
+            self.source_map,
+            {"flat_expressions": self.__flat_expressions},
+        )
+        lazy_body.start_pos = start_pos
+        lazy_body.end_pos = self.curr_tkn.offset
+        self.__log("</LazyBody>")
+        return lazy_body
+
+    def parse_lazy_body(self, lazy_body: LazyBodyNode) -> BodyNode:
+        """
+        Parses a function body skimmed by a lazy parser.
+        The body is parsed once, later calls return the same node.
+        @raise ParserError: If the body has a syntax error
+        @raise LexerError: If the body has an invalid token
+        """
+        if lazy_body.body:
+            return lazy_body.body
+
+        self.__lexer.analyze_span(
+            lazy_body.source, lazy_body.offset, lazy_body.source_map
+        )
+        with parse_recursion_limit():
+            self.__open_token_stream()
+            self.__expect_and_consume(TokenType.LBRACE)
+            lazy_body.body = self.parse_body()
+            self.__expect_and_consume(TokenType.RBRACE)
+        mark_tail_calls(lazy_body.body)
+        return lazy_body.body
+
     def parse_func_call(self) -> CallNode:
         """funcCall: ID args"""
         self.__log("<FuncCall>")
 
         identifier = self.curr_tkn.word
-        start_pos = self.curr_tkn.position
+        start_pos = self.curr_tkn.offset
         self.__expect_and_consume(TokenType.ID)
         args = self.parse_args()
 
         self.__log("</FuncCall>")
         call_node = CallNode(identifier, args)
         call_node.start_pos = start_pos
-        call_node.end_pos = self.curr_tkn.position
+        call_node.end_pos = self.curr_tkn.offset
         return call_node
 
     def parse_postfix(self) -> PostfixExprNode:
         """PostfixExpr: ID (UN_ADD | UN_SUB)"""
         self.__log("<Postfix>")
 
-        start_pos = self.curr_tkn.position
+        start_pos = self.curr_tkn.offset
         left_node = IdentifierNode(self.curr_tkn)
         self.__expect_and_consume(TokenType.ID)
 
@@ -359,13 +614,13 @@ class Parser:
             return throw_unexpected_token_err(
                 self.curr_tkn.type,
                 "[UN_ADD or UN_SUB]",
-                self.curr_tkn.line_num,
-                self.curr_tkn.column_num,
+                self.__line_number,
+                self.__col_number,
             )
 
         self.__log("</Postfix>")
         postfix_node.start_pos = start_pos
-        postfix_node.end_pos = self.curr_tkn.position
+        postfix_node.end_pos = self.curr_tkn.offset
         return postfix_node
 
     def parse_index(self) -> ExprNode:
@@ -382,7 +637,7 @@ class Parser:
     def parse_array_def(self, identifier: str) -> ArrayNode:
         """ArrayDef: [ expr ] | { values* }"""
         self.__log("<ArrDef>")
-        start_pos = self.curr_tkn.position
+        start_pos = self.curr_tkn.offset
 
         size = None
         values: list[ExprNode] = []
@@ -404,7 +659,7 @@ class Parser:
         elif self.__expected_token(TokenType.STR_SPLIT):
             self.__expect_and_consume(TokenType.STR_SPLIT)
             self.__expect_and_consume(TokenType.LPAR)
-            if TokenType.callable(self.curr_tkn):
+            if self.curr_tkn.type in CALLABLE_TOKENS:
                 string_value = self.parse_callable()
             elif self.__expected_token(TokenType.STR):
                 string_value = self.parse_expr()
@@ -414,8 +669,8 @@ class Parser:
             return throw_unexpected_token_err(
                 self.curr_tkn.type,
                 "[LBRACKET or LBRACE or STR_SPLIT]",
-                self.curr_tkn.line_num,
-                self.curr_tkn.column_num,
+                self.__line_number,
+                self.__col_number,
             )
 
         self.__log("<ArrDef>")
@@ -427,12 +682,12 @@ class Parser:
             string_value=string_value,
         )
         array_node.start_pos = start_pos
-        array_node.end_pos = self.curr_tkn.position
+        array_node.end_pos = self.curr_tkn.offset
         return array_node
 
     def parse_file_open(self, identifier: str) -> FileNode:
         """FileDef: FILE_OPEN LPAR ID COMMA MODE RPAR"""
-        start_pos = self.curr_tkn.position
+        start_pos = self.curr_tkn.offset
         self.__expect_and_consume(TokenType.FILE_OPEN)
         self.__expect_and_consume(TokenType.LPAR)
         filepath = self.parse_expr()
@@ -448,14 +703,14 @@ class Parser:
         )
 
         file_node.start_pos = start_pos
-        file_node.end_pos = self.curr_tkn.position
+        file_node.end_pos = self.curr_tkn.offset
         return file_node
 
     def parse_array_access(self) -> ArrayNode:
         """ArrayAccess: ID index"""
         self.__log("<ArrayAccess>")
 
-        start_pos = self.curr_tkn.position
+        start_pos = self.curr_tkn.offset
         identifier = self.curr_tkn.word
         self.__expect_and_consume(TokenType.ID)
         index = self.parse_index()
@@ -463,14 +718,14 @@ class Parser:
         self.__log("</ArrayAccess>")
         array_node = ArrayNode(label="array_access", identifier=identifier, index=index)
         array_node.start_pos = start_pos
-        array_node.end_pos = self.curr_tkn.position
+        array_node.end_pos = self.curr_tkn.offset
         return array_node
 
     def parse_array_assignment(self) -> ArrayNode:
         """ArrayAssignment: ID index ASSIGN expr"""
         self.__log("<ArrayAssign>")
 
-        start_pos = self.curr_tkn.position
+        start_pos = self.curr_tkn.offset
         identifier = self.curr_tkn.word
         self.__expect_and_consume(TokenType.ID)
         index = self.parse_index()
@@ -482,20 +737,20 @@ class Parser:
             label="array_update", identifier=identifier, index=index, value=expression
         )
         array_node.start_pos = start_pos
-        array_node.end_pos = self.curr_tkn.position
+        array_node.end_pos = self.curr_tkn.offset
         return array_node
 
     def parse_assignment(self) -> AssignmentNode:
         """Assignment: ID ASSIGN (expr | callable)"""
         self.__log("<Assignment>")
 
-        start_pos = self.curr_tkn.position
+        start_pos = self.curr_tkn.offset
         left_node = IdentifierNode(self.curr_tkn)
         self.__expect_and_consume(TokenType.ID)
 
         self.__expect_and_consume(TokenType.ASSIGN)
         if (
-            TokenType.callable(self.curr_tkn)
+            self.curr_tkn.type in CALLABLE_TOKENS
             and self.__peek_token().type == TokenType.LPAR
         ):
             right_node = self.parse_callable()
@@ -505,13 +760,16 @@ class Parser:
         self.__log("<Assignment>")
         assignment_node = AssignmentNode(left_node, right_node)
         assignment_node.start_pos = start_pos
-        assignment_node.end_pos = self.curr_tkn.position
+        assignment_node.end_pos = self.curr_tkn.offset
         return assignment_node
 
     def parse_while(self) -> WhileNode:
         """WhileStatement: WHILE ( expr ) { ( body | BREAK | CONTINUE) }"""
+        return self.__run(self.__while_steps())
+
+    def __while_steps(self) -> ParseSteps:
         self.__log("<While>")
-        start_pos = self.curr_tkn.position
+        start_pos = self.curr_tkn.offset
 
         right_node = None
         self.__expect_and_consume(TokenType.WHILE)
@@ -520,20 +778,23 @@ class Parser:
         self.__expect_and_consume(TokenType.RPAR)
 
         self.__expect_and_consume(TokenType.LBRACE)
-        if TokenType.conditional_stmt_start(self.curr_tkn):
-            right_node = self.parse_conditional_body()
+        if self.curr_tkn.type in CONDITIONAL_STATEMENT_START_TOKENS:
+            right_node = yield self.__conditional_body_steps()
         self.__expect_and_consume(TokenType.RBRACE)
 
         self.__log("</While>")
         while_node = WhileNode(left_node, right_node)
         while_node.start_pos = start_pos
-        while_node.end_pos = self.curr_tkn.position
+        while_node.end_pos = self.curr_tkn.offset
         return while_node
 
     def parse_for(self) -> ForNode:
         """ForStatement: FOR ID TO ( NUM, NUM ) { body }"""
+        return self.__run(self.__for_steps())
+
+    def __for_steps(self) -> ParseSteps:
         self.__log("<For>")
-        start_pos = self.curr_tkn.position
+        start_pos = self.curr_tkn.offset
 
         body = None
         self.__expect_and_consume(TokenType.FOR)
@@ -548,20 +809,23 @@ class Parser:
         self.__expect_and_consume(TokenType.RPAR)
 
         self.__expect_and_consume(TokenType.LBRACE)
-        if TokenType.conditional_stmt_start(self.curr_tkn):
-            body = self.parse_conditional_body()
+        if self.curr_tkn.type in CONDITIONAL_STATEMENT_START_TOKENS:
+            body = yield self.__conditional_body_steps()
         self.__expect_and_consume(TokenType.RBRACE)
 
         self.__log("</For>")
         for_node = ForNode(identifier, range_start, range_end, body)
         for_node.start_pos = start_pos
-        for_node.end_pos = self.curr_tkn.position
+        for_node.end_pos = self.curr_tkn.offset
         return for_node
 
     def parse_if(self) -> IfNode:
         """IfStatement: IF ( expr ) { body }"""
+        return self.__run(self.__if_steps())
+
+    def __if_steps(self) -> ParseSteps:
         self.__log("<If>")
-        start_pos = self.curr_tkn.position
+        start_pos = self.curr_tkn.offset
 
         body_node = None
         self.__expect_and_consume(TokenType.IF)
@@ -570,27 +834,30 @@ class Parser:
         self.__expect_and_consume(TokenType.RPAR)
 
         self.__expect_and_consume(TokenType.LBRACE)
-        if TokenType.conditional_stmt_start(self.curr_tkn):
-            body_node = self.parse_conditional_body()
+        if self.curr_tkn.type in CONDITIONAL_STATEMENT_START_TOKENS:
+            body_node = yield self.__conditional_body_steps()
         self.__expect_and_consume(TokenType.RBRACE)
 
         # Parse elif and else statements
         if_node = IfNode(expr_node, body_node)
         while self.__expected_token(TokenType.ELIF):
-            if_node.append_else_if(self.parse_elif())
+            if_node.append_else_if((yield self.__elif_steps()))
 
         if self.__expected_token(TokenType.ELSE):
-            if_node.set_else_body(self.parse_else())
+            if_node.set_else_body((yield self.__else_steps()))
 
         self.__log("</If>")
         if_node.start_pos = start_pos
-        if_node.end_pos = self.curr_tkn.position
+        if_node.end_pos = self.curr_tkn.offset
         return if_node
 
     def parse_elif(self) -> ElifNode:
         """ElifStatement: ELIF ( expr ) { body }"""
+        return self.__run(self.__elif_steps())
+
+    def __elif_steps(self) -> ParseSteps:
         self.__log("<Elif>")
-        start_pos = self.curr_tkn.position
+        start_pos = self.curr_tkn.offset
         body_node = None
 
         self.__expect_and_consume(TokenType.ELIF)
@@ -599,25 +866,28 @@ class Parser:
         self.__expect_and_consume(TokenType.RPAR)
 
         self.__expect_and_consume(TokenType.LBRACE)
-        if TokenType.conditional_stmt_start(self.curr_tkn):
-            body_node = self.parse_conditional_body()
+        if self.curr_tkn.type in CONDITIONAL_STATEMENT_START_TOKENS:
+            body_node = yield self.__conditional_body_steps()
         self.__expect_and_consume(TokenType.RBRACE)
 
         self.__log("</Elif>")
         elif_node = ElifNode(expr_node, body_node)
         elif_node.start_pos = start_pos
-        elif_node.end_pos = self.curr_tkn.position
+        elif_node.end_pos = self.curr_tkn.offset
         return elif_node
 
     def parse_else(self) -> Optional[Node]:
         """ElseStatement: ELSE { body }"""
+        return self.__run(self.__else_steps())
+
+    def __else_steps(self) -> ParseSteps:
         self.__log("<Else>")
 
         body = None
         self.__expect_and_consume(TokenType.ELSE)
         self.__expect_and_consume(TokenType.LBRACE)
-        if TokenType.conditional_stmt_start(self.curr_tkn):
-            body = self.parse_conditional_body()
+        if self.curr_tkn.type in CONDITIONAL_STATEMENT_START_TOKENS:
+            body = yield self.__conditional_body_steps()
         self.__expect_and_consume(TokenType.RBRACE)
 
         self.__log("</Else>")
@@ -626,25 +896,25 @@ class Parser:
     def parse_return(self) -> ReturnNode:
         """ReturnStatement: RETURN expr?"""
         self.__log("<Return>")
-        start_pos = self.curr_tkn.position
+        start_pos = self.curr_tkn.offset
 
         self.__expect_and_consume(TokenType.RET)
         return_node = ReturnNode()
         if (
-            TokenType.expression(self.curr_tkn)
+            self.curr_tkn.type in FACTOR_START_TOKENS
             and self.__peek_token().type != TokenType.ASSIGN
         ):
             return_node.set_expr(self.parse_expr())
 
         self.__log("</Return>")
         return_node.start_pos = start_pos
-        return_node.end_pos = self.curr_tkn.position
+        return_node.end_pos = self.curr_tkn.offset
         return return_node
 
     def parse_print(self, print_ln=False) -> PrintNode:
         """PrintStatement: PRINT args"""
         self.__log("<Print>")
-        start_pos = self.curr_tkn.position
+        start_pos = self.curr_tkn.offset
 
         # PrintlnStatement: PRINTLN args
         if self.curr_tkn.type == TokenType.PRINTLN:
@@ -658,13 +928,13 @@ class Parser:
 
         self.__log("</Print>")
         print_node.start_pos = start_pos
-        print_node.end_pos = self.curr_tkn.position
+        print_node.end_pos = self.curr_tkn.offset
         return print_node
 
     def parse_input(self) -> InputNode:
         """InputStatement: INPUT (STR)?"""
         self.__log("<Input>")
-        start_pos = self.curr_tkn.position
+        start_pos = self.curr_tkn.offset
 
         self.__expect_and_consume(TokenType.INPUT)
         self.__expect_and_consume(TokenType.LPAR)
@@ -678,14 +948,14 @@ class Parser:
 
         self.__log("</Input>")
         input_node.start_pos = start_pos
-        input_node.end_pos = self.curr_tkn.position
+        input_node.end_pos = self.curr_tkn.offset
         return input_node
 
     def parse_params(self) -> ArgsNode:
         """params: param (',' param)*"""
         self.__log("<Params>")
         params = ArgsNode()
-        params.start_pos = self.curr_tkn.position
+        params.start_pos = self.curr_tkn.offset
 
         self.__expect_and_consume(TokenType.LPAR)
         if not (
@@ -694,8 +964,8 @@ class Parser:
             return throw_unexpected_token_err(
                 self.curr_tkn.type,
                 "[ID or RPAR]",
-                self.curr_tkn.line_num,
-                self.curr_tkn.column_num,
+                self.__line_number,
+                self.__col_number,
             )
 
         if self.__expected_token(TokenType.ID):
@@ -714,17 +984,20 @@ class Parser:
         self.__expect_and_consume(TokenType.RPAR)
 
         self.__log("</Params>")
-        params.end_pos = self.curr_tkn.position
+        params.end_pos = self.curr_tkn.offset
         return params
 
     def parse_args(self) -> ArgsNode:
         """args: arg (',' arg)*"""
         self.__log("<Args>")
         args = ArgsNode()
-        args.start_pos = self.curr_tkn.position
+        args.start_pos = self.curr_tkn.offset
 
         self.__expect_and_consume(TokenType.LPAR)
-        if TokenType.expression(self.curr_tkn) or TokenType.callable(self.curr_tkn):
+        if (
+            self.curr_tkn.type in FACTOR_START_TOKENS
+            or self.curr_tkn.type in CALLABLE_TOKENS
+        ):
             args.append(self.parse_arg())
 
             while self.__expected_token(TokenType.COMMA):
@@ -733,7 +1006,7 @@ class Parser:
         self.__expect_and_consume(TokenType.RPAR)
 
         self.__log("</Args>")
-        args.end_pos = self.curr_tkn.position
+        args.end_pos = self.curr_tkn.offset
         return args
 
     def parse_arg(self):
@@ -752,37 +1025,23 @@ class Parser:
         """callable: PRINT | INPUT | ID args"""
         self.__log("<Callable>")
 
-        is_print_token = self.__expected_token(TokenType.PRINT)
-        is_print_token |= self.__expected_token(TokenType.PRINTLN)
-        if is_print_token:
-            call_node = self.parse_print()
-        elif self.__expected_token(TokenType.INPUT):
-            call_node = self.parse_input()
-        elif TokenType.file_IO(self.curr_tkn):
-            call_node = self.parse_file_IO()
-        elif self.__expected_token(TokenType.GET_CHAR):
-            call_node = self.parse_char_repr()
-        elif self.__expected_token(TokenType.GET_INT):
-            call_node = self.parse_int_repr()
-        elif self.__expected_token(TokenType.LEN):
-            call_node = self.parse_length()
-        elif self.__expected_token(TokenType.ID):
-            call_node = self.parse_func_call()
-        else:
+        callable_parser = self.__callable_parsers.get(self.curr_tkn.type)
+        if not callable_parser:
             return throw_unexpected_token_err(
                 self.curr_tkn.type,
                 "CALLABLE_TYPE",
-                self.curr_tkn.line_num,
-                self.curr_tkn.column_num,
+                self.__line_number,
+                self.__col_number,
             )
 
+        call_node = callable_parser()
         self.__log("</Callable>")
         return call_node
 
     def parse_file_IO(self) -> FileNode:
         """File IO: FILE_OPEN | FILE_CLOSE | FILE_READ | FILE_READLINE | FILE_WRITE | FILE_WRITELINE"""
         self.__log("<FileIO>")
-        start_pos = self.curr_tkn.position
+        start_pos = self.curr_tkn.offset
 
         match self.curr_tkn.type:
             case TokenType.FILE_CLOSE:
@@ -802,7 +1061,7 @@ class Parser:
                 n_chars_to_read = None
                 if self.__expected_token(TokenType.COMMA):
                     self.__expect_and_consume(TokenType.COMMA)
-                    if TokenType.expression(self.curr_tkn):
+                    if self.curr_tkn.type in FACTOR_START_TOKENS:
                         n_chars_to_read = self.parse_expr()
                 self.__expect_and_consume(TokenType.RPAR)
 
@@ -848,24 +1107,24 @@ class Parser:
                 return throw_unexpected_token_err(
                     self.curr_tkn.type,
                     "FILE_IO_TYPE",
-                    self.curr_tkn.line_num,
-                    self.curr_tkn.column_num,
+                    self.__line_number,
+                    self.__col_number,
                 )
         self.__log("</FileIO>")
         file_node.start_pos = start_pos
-        file_node.end_pos = self.curr_tkn.position
+        file_node.end_pos = self.curr_tkn.offset
         return file_node
 
     def parse_char_repr(self) -> CharReprNode:
         """char_repr: GET_CHAR LPAR expr RPAR"""
         self.__expect_and_consume(TokenType.GET_CHAR)
         self.__expect_and_consume(TokenType.LPAR)
-        if not TokenType.expression(self.curr_tkn):
+        if not self.curr_tkn.type in FACTOR_START_TOKENS:
             return throw_unexpected_token_err(
                 self.curr_tkn.type,
                 "[EXPRESSION_TYPE]",
-                self.curr_tkn.line_num,
-                self.curr_tkn.column_num,
+                self.__line_number,
+                self.__col_number,
             )
 
         expr_node = self.parse_expr()
@@ -876,12 +1135,12 @@ class Parser:
         """int_repr: GET_INT LPAR expr RPAR"""
         self.__expect_and_consume(TokenType.GET_INT)
         self.__expect_and_consume(TokenType.LPAR)
-        if not TokenType.expression(self.curr_tkn):
+        if not self.curr_tkn.type in FACTOR_START_TOKENS:
             return throw_unexpected_token_err(
                 self.curr_tkn.type,
                 "[EXPRESSION_TYPE]",
-                self.curr_tkn.line_num,
-                self.curr_tkn.column_num,
+                self.__line_number,
+                self.__col_number,
             )
 
         expr_node = self.parse_expr()
@@ -892,87 +1151,93 @@ class Parser:
         """length: LEN LPAR (expr | ID) RPAR"""
         self.__expect_and_consume(TokenType.LEN)
         self.__expect_and_consume(TokenType.LPAR)
-        if not TokenType.expression(self.curr_tkn):
+        if not self.curr_tkn.type in FACTOR_START_TOKENS:
             return throw_unexpected_token_err(
                 self.curr_tkn.type,
                 "[EXPRESSION_TYPE]",
-                self.curr_tkn.line_num,
-                self.curr_tkn.column_num,
+                self.__line_number,
+                self.__col_number,
             )
 
         expr_node = self.parse_expr()
         self.__expect_and_consume(TokenType.RPAR)
         return LengthNode(expr_node)
 
-    def parse_expr(self) -> ExprNode:
+    def parse_expr(self) -> Node:
         """expr: simpleExpr | simpleExpr relationalOp simpleExpr"""
+        if self.__flat_expressions:
+            return self.__parse_flat_expr(RELATIONAL_PRECEDENCE, "[EXPRESSION_TYPE]")
+
         self.__log("<Expr>")
         expr_node = ExprNode()
-        expr_node.start_pos = self.curr_tkn.position
+        expr_node.start_pos = self.curr_tkn.offset
 
-        if not TokenType.expression(self.curr_tkn):
+        if not self.curr_tkn.type in FACTOR_START_TOKENS:
             return throw_unexpected_token_err(
                 self.curr_tkn.type,
                 "[EXPRESSION_TYPE]",
-                self.curr_tkn.line_num,
-                self.curr_tkn.column_num,
+                self.__line_number,
+                self.__col_number,
             )
 
         expr_node.left = self.parse_simple_expr()
-        if TokenType.rel_op(self.curr_tkn):
+        if self.curr_tkn.type in RELATIONAL_OPERATOR_TOKENS:
             expr_node.operator = self.__handle_op_token()
             expr_node.right = self.parse_expr()
 
-        expr_node.end_pos = self.curr_tkn.position
+        expr_node.end_pos = self.curr_tkn.offset
         self.__log("</Expr>")
         return expr_node
 
-    def parse_simple_expr(self) -> ExprNode:
+    def parse_simple_expr(self) -> Node:
         """simpleExpr: term | term addOp simpleExpr"""
+        if self.__flat_expressions:
+            return self.__parse_flat_expr(ADDITIVE_PRECEDENCE, "[SIMPLE_EXPR_TYPE]")
+
         self.__log("<SimpleExpr>")
-        start_pos = self.curr_tkn.position
+        start_pos = self.curr_tkn.offset
 
-        if not TokenType.term(self.curr_tkn):
+        if not self.curr_tkn.type in FACTOR_START_TOKENS:
             return throw_unexpected_token_err(
                 self.curr_tkn.type,
                 "[SIMPLE_EXPR_TYPE]",
-                self.curr_tkn.line_num,
-                self.curr_tkn.column_num,
+                self.__line_number,
+                self.__col_number,
             )
 
         left = self.parse_term()
-        while TokenType.add_op(self.curr_tkn):
+        while self.curr_tkn.type in ADDITIVE_OPERATOR_TOKENS:
             op = self.__handle_op_token()
             right = self.parse_term()
             left = SimpleExprNode(left, right, op)
 
         self.__log("</SimpleExpr>")
         left.start_pos = start_pos
-        left.end_pos = self.curr_tkn.position
+        left.end_pos = self.curr_tkn.offset
         return left
 
     def parse_term(self) -> ExprNode:
         """term: factor | factor mulOp terme"""
         self.__log("<Term>")
-        start_pos = self.curr_tkn.position
+        start_pos = self.curr_tkn.offset
 
-        if not TokenType.factor(self.curr_tkn):
+        if not self.curr_tkn.type in FACTOR_START_TOKENS:
             return throw_unexpected_token_err(
                 self.curr_tkn.type,
                 "[TERM_TYPE]",
-                self.curr_tkn.line_num,
-                self.curr_tkn.column_num,
+                self.__line_number,
+                self.__col_number,
             )
 
         left = self.parse_factor()
-        while TokenType.mul_op(self.curr_tkn):
+        while self.curr_tkn.type in MULTIPLICATIVE_OPERATOR_TOKENS:
             op = self.__handle_op_token()
             right = self.parse_factor()
             left = TermNode(left, right, op)
 
         self.__log("</Term>")
         left.start_pos = start_pos
-        left.end_pos = self.curr_tkn.position
+        left.end_pos = self.curr_tkn.offset
         return left
 
     def parse_factor(self) -> ExprNode:
@@ -983,114 +1248,246 @@ class Parser:
         """
         self.__log("<Factor>")
 
-        if not TokenType.factor(self.curr_tkn):
+        if not self.curr_tkn.type in FACTOR_START_TOKENS:
             return throw_unexpected_token_err(
                 self.curr_tkn.type,
                 "[FACTOR_TYPE]",
-                self.curr_tkn.line_num,
-                self.curr_tkn.column_num,
+                self.__line_number,
+                self.__col_number,
             )
 
-        if self.__expected_token(TokenType.ID):
-            if self.__peek_token().type == TokenType.LPAR:
-                factor_node = FactorNode(self.parse_func_call())
+        factor_parser = self.__factor_parsers.get(self.curr_tkn.type)
+        if not factor_parser:
+            if self.curr_tkn.type in CALLABLE_TOKENS:
+                return self.parse_callable()
 
-            elif self.__peek_token().type == TokenType.LBRACKET:
-                start_pos = self.curr_tkn.position
-                array_access_node = self.parse_array_access()
-                array_access_node.start_pos = start_pos
-                array_access_node.end_pos = self.curr_tkn.position
-                factor_node = FactorNode(array_access_node)
+            return throw_unexpected_token_err(
+                self.curr_tkn.type,
+                "[ID or INT or FLOAT or STR or TRUE or FALSE or LPAR or NOT or MINUS]",
+                self.__line_number,
+                self.__col_number,
+            )
 
-            else:
-                factor_node = IdentifierNode(self.curr_tkn)
-                self.__expect_and_consume(TokenType.ID)
+        factor_node = factor_parser()
+        self.__log("</Factor>")
+        return factor_node
 
-        elif self.__expected_token(TokenType.INT) or self.__expected_token(
-            TokenType.FLOAT
-        ):
-            factor_node = NumericLiteralNode(self.curr_tkn)
-            if self.curr_tkn.type == TokenType.INT:
-                self.__expect_and_consume(TokenType.INT)
-            else:
-                self.__expect_and_consume(TokenType.FLOAT)
+    def __parse_id_factor(self) -> ExprNode:
+        """factor: ID | Func_Call | ID '[' expr ']'"""
+        if self.__peek_token().type == TokenType.LPAR:
+            return FactorNode(self.parse_func_call())
 
-        elif self.__expected_token(TokenType.STR):
-            factor_node = StringLiteralNode(self.curr_tkn)
-            self.__expect_and_consume(TokenType.STR)
+        if self.__peek_token().type == TokenType.LBRACKET:
+            start_pos = self.curr_tkn.offset
+            array_access_node = self.parse_array_access()
+            array_access_node.start_pos = start_pos
+            array_access_node.end_pos = self.curr_tkn.offset
+            return FactorNode(array_access_node)
 
-        elif self.__expected_token(TokenType.TRUE) or self.__expected_token(
-            TokenType.FALSE
-        ):
-            if self.curr_tkn.type == TokenType.TRUE:
-                self.__expect_and_consume(TokenType.TRUE)
-                factor_node = BooleanNode(True)
-            else:
-                self.__expect_and_consume(TokenType.FALSE)
-                factor_node = BooleanNode(False)
+        identifier_node = IdentifierNode(self.curr_tkn)
+        self.__expect_and_consume(TokenType.ID)
+        return identifier_node
 
-        elif self.__expected_token(TokenType.LPAR):
-            self.__expect_and_consume(TokenType.LPAR)
-            factor_node = FactorNode(self.parse_expr())
-            self.__expect_and_consume(TokenType.RPAR)
+    def __parse_numeric_literal(self) -> ExprNode:
+        """factor: INT | INT '.' INT"""
+        numeric_node = NumericLiteralNode(self.curr_tkn)
+        self.__consume_token()
+        return numeric_node
 
-        elif self.__expected_token(TokenType.NOT):
-            self.__consume_token()
-            left_node = OperatorNode("not")
-            right_node = self.parse_factor()
-            factor_node = FactorNode(left_node, right_node)
+    def __parse_string_literal(self) -> ExprNode:
+        """factor: STR"""
+        string_node = StringLiteralNode(self.curr_tkn)
+        self.__expect_and_consume(TokenType.STR)
+        return string_node
 
-        elif self.__expected_token(TokenType.MINUS):
-            self.__consume_token()
-            left_node = OperatorNode("-")
-            right_node = self.parse_factor()
-            factor_node = FactorNode(left_node, right_node)
+    def __parse_boolean(self) -> ExprNode:
+        """factor: TRUE | FALSE"""
+        boolean_node = BooleanNode(self.curr_tkn.type == TokenType.TRUE)
+        self.__consume_token()
+        return boolean_node
 
-        elif TokenType.callable(self.curr_tkn):
-            return self.parse_callable()
+    def __parse_parenthesised_expr(self) -> ExprNode:
+        """factor: LPAR expr RPAR"""
+        self.__expect_and_consume(TokenType.LPAR)
+        factor_node = FactorNode(self.parse_expr())
+        self.__expect_and_consume(TokenType.RPAR)
+        return factor_node
+
+    def __parse_negation(self) -> ExprNode:
+        """factor: NOT factor | MINUS factor"""
+        operator = "not" if self.curr_tkn.type == TokenType.NOT else "-"
+        self.__consume_token()
+        left_node = OperatorNode(operator)
+        right_node = self.parse_factor()
+        return FactorNode(left_node, right_node)
+
+    def __parse_flat_expr(self, min_precedence: int, expected: str) -> Node:
+        """
+        Parses an expression into flat operation nodes
+        @param min_precedence: The loosest binding operator that is part of the expression
+        @param expected: The expected token hint reported if no expression is found
+        """
+        self.__log("<Expr>")
+        start_pos = self.curr_tkn.offset
+        if self.curr_tkn.type not in FACTOR_START_TOKENS:
+            return throw_unexpected_token_err(
+                self.curr_tkn.type,
+                expected,
+                self.__line_number,
+                self.__col_number,
+            )
+
+        expr_node = self.__parse_binary_op(min_precedence)
+        if expr_node.start_pos is None:
+            # Operands only carry a position when they make up the whole expression
+            expr_node.start_pos = start_pos
+            expr_node.end_pos = self.curr_tkn.offset
+
+        self.__log("</Expr>")
+        return expr_node
+
+    def __parse_binary_op(self, min_precedence: int) -> Node:
+        """
+        Precedence climbing: parses an operand followed by any operators
+        binding at least as tightly as min_precedence
+        """
+        start_pos = self.curr_tkn.offset
+        left = self.__parse_operand()
+
+        while BINARY_PRECEDENCE.get(self.curr_tkn.type, 0) >= min_precedence:
+            precedence = BINARY_PRECEDENCE[self.curr_tkn.type]
+            operator = self.__handle_op_token()
+            if self.curr_tkn.type not in FACTOR_START_TOKENS:
+                return throw_unexpected_token_err(
+                    self.curr_tkn.type,
+                    OPERAND_EXPECTED[precedence],
+                    self.__line_number,
+                    self.__col_number,
+                )
+
+            if precedence == RELATIONAL_PRECEDENCE:
+                right = self.__parse_binary_op(precedence)
+            else:
+                right = self.__parse_binary_op(precedence + 1)
+
+            left = BinaryOpNode(left, operator, right)
+            left.start_pos = start_pos
+            left.end_pos = self.curr_tkn.offset
+        return left
+
+    def __parse_operand(self) -> Node:
+        """
+        operand: ID | INT | INT '.' INT | STR
+                | TRUE | FALSE | LPAR expr RPAR
+                | NOT operand | MINUS operand | Func_Call
+        """
+        if self.curr_tkn.type not in FACTOR_START_TOKENS:
+            return throw_unexpected_token_err(
+                self.curr_tkn.type,
+                "[FACTOR_TYPE]",
+                self.__line_number,
+                self.__col_number,
+            )
+
+        operand_parser = self.__operand_parsers.get(self.curr_tkn.type)
+        if not operand_parser:
+            if self.curr_tkn.type in CALLABLE_TOKENS:
+                return self.parse_callable()
 
-        else:
             return throw_unexpected_token_err(
                 self.curr_tkn.type,
                 "[ID or INT or FLOAT or STR or TRUE or FALSE or LPAR or NOT or MINUS]",
-                self.curr_tkn.line_num,
-                self.curr_tkn.column_num,
+                self.__line_number,
+                self.__col_number,
             )
+        return operand_parser()
 
-        self.__log("</Factor>")
-        return factor_node
+    def __parse_id_operand(self) -> Node:
+        """operand: ID | Func_Call | ID '[' expr ']'"""
+        if self.__peek_token().type == TokenType.LPAR:
+            return self.parse_func_call()
+
+        if self.__peek_token().type == TokenType.LBRACKET:
+            start_pos = self.curr_tkn.offset
+            array_access_node = self.parse_array_access()
+            array_access_node.start_pos = start_pos
+            array_access_node.end_pos = self.curr_tkn.offset
+            return array_access_node
+
+        load_node = LoadNode(self.curr_tkn.word)
+        self.__consume_token()
+        return load_node
+
+    def __parse_number_operand(self) -> Node:
+        """operand: INT | INT '.' INT"""
+        literal_node = LiteralNode("number", self.curr_tkn.number)
+        self.__consume_token()
+        return literal_node
+
+    def __parse_string_operand(self) -> Node:
+        """operand: STR"""
+        literal_node = LiteralNode("string", self.curr_tkn.word)
+        self.__consume_token()
+        return literal_node
+
+    def __parse_boolean_operand(self) -> Node:
+        """operand: TRUE | FALSE"""
+        literal_node = LiteralNode("boolean", self.curr_tkn.type == TokenType.TRUE)
+        self.__consume_token()
+        return literal_node
+
+    def __parse_parenthesised_operand(self) -> Node:
+        """operand: LPAR expr RPAR"""
+        self.__expect_and_consume(TokenType.LPAR)
+        expr_node = self.parse_expr()
+        self.__expect_and_consume(TokenType.RPAR)
+        return expr_node
+
+    def __parse_unary_op(self) -> Node:
+        """operand: NOT operand | MINUS operand"""
+        start_pos = self.curr_tkn.offset
+        operator = "not" if self.curr_tkn.type == TokenType.NOT else "-"
+        self.__consume_token()
+
+        unary_node = UnaryOpNode(operator, self.__parse_operand())
+        unary_node.start_pos = start_pos
+        unary_node.end_pos = self.curr_tkn.offset
+        return unary_node
 
     def parse_repl(self, repl_input: str) -> Node:
         """
         Entry point for the parser to parse a REPL input string
         and return the respective AST
         """
+        with parse_recursion_limit():
+            return self.__parse_repl_input(repl_input)
+
+    def __parse_repl_input(self, repl_input: str) -> Node:
+        """Parses a REPL input string"""
         self.__log("<Repl>")
         # Prepare lexer
         self.__lexer.analyze_repl(repl_input)
-        self.__consume_token()
+        self.__open_token_stream()
 
         if self.__expected_token(TokenType.DEF):
             repl_node = self.parse_func_def()
-        elif TokenType.statement_start(self.curr_tkn):
-            if TokenType.bin_op(self.__peek_token()):
+        elif self.curr_tkn.type in STATEMENT_START_TOKENS:
+            if self.__peek_token().type in BINARY_OPERATOR_TOKENS:
                 repl_node = self.parse_expr()
             else:
                 repl_node = self.parse_body()
-        elif TokenType.expression(self.curr_tkn):
+        elif self.curr_tkn.type in FACTOR_START_TOKENS:
             repl_node = self.parse_expr()
         else:
             return throw_unexpected_token_err(
                 self.curr_tkn.type,
                 "[EXPR or STATEMENT_TYPE or DEFINE]",
-                self.curr_tkn.line_num,
-                self.curr_tkn.column_num,
+                self.__line_number,
+                self.__col_number,
             )
 
         if self.curr_tkn.type != TokenType.ENDMARKER:
-            raise ParserError(
-                "Invalid syntax", self.curr_tkn.line_num, self.curr_tkn.column_num
-            )
+            raise ParserError("Invalid syntax", self.__line_number, self.__col_number)
 
         self.__log("</Repl>")
         return repl_node
@@ -1098,22 +1495,46 @@ class Parser:
     def parse_source(self, filepath: str):
         """Entry point for the parser to parse a Nyaa source file"""
         source = Path(filepath)
-        if source.exists():
-            try:
-                # Prepare lexer
-                self.__lexer.analyze_src_file(source)
-                self.__consume_token()
+        if not source.exists():
+            print(f"Error: '{source}' not found!", file=sys.stderr)
+            exit(1)
+
+        self.__lexer.analyze_src_file(source)
+        return self.__parse_tokens()
+
+    def parse_stream(self, stream: TextIO):
+        """
+        Entry point for the parser to parse Nyaa source code from a text stream (e.g. a pipe).
+        Tokens are lexed on demand, as the parser consumes them.
+        """
+        self.__lexer.analyze_stream(stream)
+        return self.__parse_tokens()
+
+    def parse_string(self, source: str):
+        """Entry point for the parser to parse Nyaa source code held in a string"""
+        self.__lexer.analyze_string(source)
+        return self.__parse_tokens()
+
+    def __parse_tokens(self):
+        """Parses a program from the source the lexer was prepared with"""
+        try:
+            with parse_recursion_limit():
+                self.__open_token_stream()
 
                 self.__log("<Program>")
                 ast = self.parse_program()
                 self.__log("</Program>")
-                return ast
-            except ParserError as e:
-                print(e, file=sys.stderr)
-                exit(1)
-            except LexerError as e:
-                print(e, file=sys.stderr)
-                exit(1)
-        else:
-            print(f"Error: '{source}' not found!", file=sys.stderr)
+            return ast
+        except RecursionError:
+            error = "Expression nested too deeply"
+            print(
+                ParserError(error, self.__line_number, self.__col_number),
+                file=sys.stderr,
+            )
+            exit(1)
+        except ParserError as e:
+            print(e, file=sys.stderr)
+            exit(1)
+        except LexerError as e:
+            print(e, file=sys.stderr)
             exit(1)
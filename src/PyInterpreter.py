@@ -0,0 +1,474 @@
+import linecache
+import re
+from types import TracebackType
+from typing import Optional, TextIO
+
+from src.Interpreter import Interpreter, DEFAULT_MEMO_SIZE
+from src.PyTranspiler import PyTranspiler, MAIN_FUNCTION, demangle, mangle
+from src.core.ASTNodes import Node, LazyBodyNode
+from src.core.Completion import Completion
+from src.core.PyModule import LineMap, PyModule
+from src.core.RuntimeObject import RunTimeObject
+from src.core.Symbol import FunctionSymbol
+from src.core.Token import SourceMap
+from src.utils.ErrorHandler import (
+    InterpreterError,
+    ErrorType,
+    throw_invalid_operation_err,
+)
+from src.utils.Logger import Logger, LogLevel
+
+
+class Unlocated:
+    """
+    Stands in for the node given to the handlers of the tree interpreter,
+    with the attributes they read. The errors they raise have no position,
+    the engine locates them with the line map of the module.
+    """
+
+    start_pos = end_pos = None
+
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+class Unbound:
+    """A parameter missing from a call without arguments, with no global of its name"""
+
+    def __init__(self, name: str):
+        self.__name = name
+
+    def __getattr__(self, attribute: str):
+        raise Exception(f"Variable '{self.__name}' not found in 'global' scope")
+
+    def __repr__(self) -> str:
+        return self.__getattr__("__repr__")
+
+
+UNLOCATED = Unlocated()
+UNSET = object()  # Value of the locals of a function before they are assigned
+CALL_SITE = Unlocated(identifier="", args=UNLOCATED)
+PRINT_SITES = {
+    False: Unlocated(is_write_line=False),
+    True: Unlocated(is_write_line=True),
+}
+
+
+class PyInterpreter(Interpreter):
+    """
+    Runs programs transpiled to Python source by the transpiler.
+
+    The program is compiled by CPython and executed as a module, whose code calls
+    back into the engine for the operations it does not apply inline. Calls,
+    arguments, the memoization of results and errors go through the handlers of
+    the tree interpreter. Errors raised by the handlers have no position, they are
+    located with the line map of the module, from the line of the innermost
+    frame of the module in their traceback.
+
+    REPL inputs are transpiled to modules executed in the same namespace,
+    function bodies skimmed by a lazy parser are transpiled on their first call.
+    """
+
+    def __init__(
+        self,
+        verbose: bool = False,
+        logger: Optional[Logger] = None,
+        memo_size: int = DEFAULT_MEMO_SIZE,
+    ):
+        """
+        @param verbose: Flag to enable logging (to the console, if no logger is given)
+        @param logger: Logger of the interpreter subsystem
+        @param memo_size: Maximum number of results memoized per pure function
+        """
+        # Fused and quickened nodes are only run by the tree interpreter
+        super().__init__(
+            verbose=verbose,
+            logger=logger,
+            memo_size=memo_size,
+            fusion=False,
+            quickening=False,
+        )
+
+        # Traced programs are walked by the tree interpreter, which logs every node visited
+        self.__trace = self.logger is not None and self.logger.enabled_for(
+            LogLevel.TRACE
+        )
+
+        self.transpiler = PyTranspiler()
+        self.namespace: dict = {}
+        self.install(self.namespace)
+        # Line maps of the executed modules, indexed by filename
+        self.__line_maps: dict[str, LineMap] = {}
+        # Functions of the lazily parsed function bodies, indexed by their body node
+        self.__functions: dict[Node, callable] = {}
+
+    def install(self, namespace: dict) -> None:
+        """Installs the runtime helpers called by transpiled code in the namespace of a module"""
+        namespace.update(
+            _RTO=RunTimeObject,
+            _FunctionSymbol=FunctionSymbol,
+            _UNSET=UNSET,
+            _lazy_bodies=self.transpiler.lazy_bodies,
+            _lookup=self.lookup_callee,
+            _call=self.call_function,
+            _tail_call=self.tail_call,
+            _call_without_args=self.call_without_arguments,
+            _binary_op=self.binary_operation,
+            _unary_op=self.unary_operation,
+            _factor=self.handle_factor,
+            _range_value=self.range_value,
+            _array_access=self.array_access,
+            _array_update=self.array_update,
+            _postfix=self.postfix,
+            _values=self.values,
+            _characters=self.characters,
+            _char_repr=self.char_repr,
+            _int_repr=self.int_repr,
+            _length=self.length,
+            _file_open=self.file_open,
+            _file_write=self.file_write,
+            _file_read=self.file_read,
+            _file_readline=self.file_readline,
+            _file_close=self.file_close,
+            _error=self.error,
+            _not_implemented=self.not_implemented,
+        )
+
+    def evaluate(self, node: Node | dict):
+        """
+        Transpiles a node and runs the module, returning the result.
+        The namespace of a module written by the transpiler is run as it is.
+        """
+        if isinstance(node, dict):
+            return self.run_namespace(node)
+        if self.__trace:
+            return super().evaluate(node)
+        return self.run(self.transpiler.transpile_module(node), node)
+
+    def run(self, module: PyModule, node: Optional[Node] = None):
+        """
+        Executes a module in the namespace of the engine and runs its main function
+        @param node: The node the module was transpiled from, located by compile errors
+        """
+        self.load(module, node)
+        return self.call_main(self.namespace[MAIN_FUNCTION])
+
+    def run_namespace(self, namespace: dict):
+        """Runs the main function of a module written by the transpiler, in its namespace"""
+        self.namespace = namespace
+        self.install(namespace)
+        main = namespace[MAIN_FUNCTION]
+        self.__line_maps[main.__code__.co_filename] = LineMap(namespace["_LINE_MAP"])
+        return self.call_main(main)
+
+    def load(self, module: PyModule, node: Optional[Node] = None) -> None:
+        """
+        Compiles a module and executes it in the namespace of the engine
+        @raise InterpreterError: If CPython cannot compile the module (e.g. too deeply nested)
+        """
+        try:
+            code = compile(module.source, module.filename, "exec")
+        except (SyntaxError, RecursionError, MemoryError) as e:
+            raise InterpreterError(
+                ErrorType.NOT_IMPLEMENTED,
+                f"The program cannot be transpiled to Python: {e}",
+                node.start_pos if node else None,
+                node.end_pos if node else None,
+            )
+
+        # Generated lines are shown in the tracebacks of Python errors
+        lines = module.source.splitlines(keepends=True)
+        linecache.cache[module.filename] = (len(module.source), None, lines, "")
+        self.__line_maps[module.filename] = module.line_map
+        exec(code, self.namespace)
+
+    def call_main(self, main: callable):
+        """
+        Calls the main function of a module, translating the errors raised by its code
+        @raise InterpreterError: The errors of the handlers, located with the line map
+        @raise Exception: If a variable is not found
+        """
+        try:
+            return main()
+        except InterpreterError as e:
+            if e.start_pos is None and e.end_pos is None:
+                self.__locate(e, e.__traceback__)
+            raise
+        except NameError as e:
+            # Locals of the main function read before assignment have no name attribute
+            name = e.name or next(iter(re.findall(r"'(\w+)'", str(e))), None)
+            frame = self.__module_frame(e.__traceback__, innermost_only=True)
+            if frame is None or not name or name[:2] not in ("v_", "l_"):
+                raise
+            error = f"Variable '{demangle(name)}' not found in 'global' scope"
+            raise Exception(error) from None
+
+    def __module_frame(
+        self, traceback: Optional[TracebackType], innermost_only: bool = False
+    ) -> Optional[tuple[LineMap, int]]:
+        """
+        Returns the line map and line of the innermost frame of a transpiled module
+        @param innermost_only: Only return the frame that raised the error
+        """
+        found = None
+        while traceback:
+            line_map = self.__line_maps.get(traceback.tb_frame.f_code.co_filename)
+            found = (line_map, traceback.tb_lineno) if line_map else found
+            if innermost_only and not line_map:
+                found = None
+            traceback = traceback.tb_next
+        return found
+
+    def __locate(self, error: InterpreterError, traceback: TracebackType) -> None:
+        """Sets the position of an error to the node of the line it was raised from"""
+        frame = self.__module_frame(traceback)
+        if frame is None:
+            return
+
+        line_map, line = frame
+        site = line_map.site(line)
+        if site:
+            _, error.start_pos, error.end_pos = site
+
+    # Calls
+
+    def lookup_callee(self, runtime_object: RunTimeObject, identifier: str):
+        """
+        Returns the function called by a call, pushing its frame
+        @raise InterpreterError: If the call is too deep, or the variable is not a function
+        """
+        self.check_for_stack_overflow(UNLOCATED)
+        if runtime_object.label == "function":
+            return runtime_object.value
+        return self.check_callable(Unlocated(identifier=identifier), runtime_object)
+
+    def call_function(
+        self,
+        function_symbol: FunctionSymbol,
+        *args: RunTimeObject,
+        position: Optional[tuple[int, int]] = None,
+    ):
+        """
+        Calls a function with the evaluated arguments, or returns its memoized result.
+        The calls returned by the function (see tail_call) are made in this frame.
+        @param position: The start and end of the arguments of a tail call, whose
+        errors are not located by the line of the module calling the function
+        """
+        memoized = []  # Memo keys of the calls returning the result
+        while True:
+            # Reports invalid numbers of arguments
+            try:
+                self.bind_arguments(CALL_SITE, function_symbol, list(args))
+            except InterpreterError as e:
+                if position is not None:
+                    e.start_pos, e.end_pos = position
+                raise
+            function = function_symbol.body
+            if isinstance(function, LazyBodyNode):
+                function = self.lazy_function(function_symbol)
+
+            # Return the result of a previous call of a pure function, else call it
+            memo_key = self.memo_key(function_symbol, args)
+            if memo_key is not None:
+                result = function_symbol.memo.get(memo_key)
+                if result is not None:
+                    break
+                memoized.append((function_symbol, memo_key))
+
+            result = function(*args)
+            if result.__class__ is not Completion:
+                break
+
+            # Pop the frame the call returned pushed, when it looked its function up
+            self.release_stack_frame()
+            position, function_symbol, args = result.value
+
+        for function_symbol, memo_key in memoized:
+            function_symbol.memo.put(memo_key, result)
+        self.release_stack_frame()
+        return result
+
+    @staticmethod
+    def tail_call(
+        position: tuple[int, int], function_symbol: FunctionSymbol, *args: RunTimeObject
+    ) -> Completion:
+        """
+        Returns the call a function returns the result of, as a completion record,
+        for its caller to make the call without recursing
+        @param position: The start and end of the arguments of the call
+        """
+        return Completion("tail_call", (position, function_symbol, args))
+
+    def call_without_arguments(self, function_symbol: FunctionSymbol):
+        """
+        Calls a function without arguments, as the tree interpreter calls nodes without
+        an arguments node: its parameters are then read from the globals
+        """
+        function = function_symbol.body
+        if isinstance(function, LazyBodyNode):
+            function = self.lazy_function(function_symbol)
+
+        memo_key = self.memo_key(function_symbol, None)
+        result = function_symbol.memo.get(memo_key) if memo_key is not None else None
+        if result is None:
+            args = [
+                self.namespace.get("v_" + param, Unbound(param))
+                for param in function_symbol.params
+            ]
+            result = function(*args)
+            if result.__class__ is Completion:
+                position, callee, callee_args = result.value
+                result = self.call_function(callee, *callee_args, position=position)
+            if memo_key is not None:
+                function_symbol.memo.put(memo_key, result)
+
+        self.release_stack_frame()
+        return result
+
+    def function_callees(self, function_symbol: FunctionSymbol) -> Optional[frozenset]:
+        function = function_symbol.body
+        if isinstance(function, LazyBodyNode):
+            function = self.__functions.get(function)
+        return getattr(function, "callees", None)
+
+    def global_function(self, name: str) -> Optional[FunctionSymbol]:
+        runtime_object = self.namespace.get(mangle("v_", name))
+        if runtime_object is None or runtime_object.label != "function":
+            return None
+        return runtime_object.value
+
+    def lazy_function(self, function_symbol: FunctionSymbol) -> callable:
+        """Returns the function of a lazily parsed body, transpiling it on the first call"""
+        body = function_symbol.body
+        function = self.__functions.get(body)
+        if function is None:
+            module, name = self.transpiler.transpile_function(
+                function_symbol.name,
+                list(function_symbol.params),
+                self.function_body(function_symbol),
+            )
+            self.load(module)
+            function = self.__functions[body] = self.namespace[name]
+        return function
+
+    # Operations
+
+    def binary_operation(
+        self, operator: str, left: RunTimeObject, right: RunTimeObject
+    ) -> RunTimeObject:
+        """Applies a binary operator with its handler, which reports invalid operations"""
+        handler = self.binary_op_handler(operator)
+        if not handler:
+            return throw_invalid_operation_err(
+                left.label, operator, right.label, None, None
+            )
+        # Transpiled code binds the results of operations without copying them
+        result = handler(left, right, operator)
+        return result.copy() if result.shared else result
+
+    def unary_operation(self, operator: str, operand: RunTimeObject) -> RunTimeObject:
+        """Applies a unary operator with its handler, which reports invalid operands"""
+        result = self.handle_unary_op(Unlocated(operator=operator), operand)
+        return result.copy() if result.shared else result
+
+    def range_value(self, runtime_object: RunTimeObject) -> int:
+        """Returns a for range value, checking it is an integer"""
+        return self.handle_range_value(UNLOCATED, runtime_object)
+
+    @staticmethod
+    def postfix(runtime_object: RunTimeObject, step: int) -> RunTimeObject:
+        """Increments (or decrements) a variable and returns its new value"""
+        runtime_object.value += step
+        return RunTimeObject("number", runtime_object.value)
+
+    # Comprehensions cannot be emitted, as the temporaries of expressions
+    # (assignment expressions) are not allowed in their iterable
+
+    @staticmethod
+    def values(runtime_objects: tuple[RunTimeObject, ...]) -> list:
+        """Returns the values of the arguments of a print"""
+        return [runtime_object.value for runtime_object in runtime_objects]
+
+    @staticmethod
+    def characters(string: RunTimeObject) -> list[RunTimeObject]:
+        """Returns the characters of a string, as the values of an array"""
+        return [RunTimeObject("string", char) for char in string.value]
+
+    def char_repr(self, expression: RunTimeObject) -> RunTimeObject:
+        return self.handle_char_repr(UNLOCATED, expression)
+
+    def int_repr(self, expression: RunTimeObject) -> RunTimeObject:
+        return self.handle_int_repr(UNLOCATED, expression)
+
+    def length(self, expression: RunTimeObject) -> RunTimeObject:
+        return self.handle_length(UNLOCATED, expression)
+
+    # Arrays
+
+    @staticmethod
+    def array_access(index: int, array: RunTimeObject) -> RunTimeObject:
+        """
+        Returns the value at an index of an array
+        @raise InterpreterError: If the index is out of bounds
+        """
+        if index < 0 or index >= len(array.value):
+            raise InterpreterError(
+                ErrorType.RUNTIME, "Array index out of bounds", None, None
+            )
+        return array.value[index]
+
+    @staticmethod
+    def array_update(index: int, value: RunTimeObject, array: list) -> None:
+        """
+        Stores a copy of a value at an index of an array
+        @raise InterpreterError: If the index is out of bounds
+        """
+        if int(index) < 0 or int(index) >= len(array):
+            raise InterpreterError(
+                ErrorType.RUNTIME, "Array index out of bounds", None, None
+            )
+        array[index] = RunTimeObject(value.label, value.value)
+
+    # Files
+
+    def file_open(
+        self, filepath_object: RunTimeObject, access_mode_object: RunTimeObject
+    ) -> RunTimeObject:
+        return self.open_file(UNLOCATED, filepath_object, access_mode_object)
+
+    def file_write(
+        self, file: TextIO, buffer_object: RunTimeObject, is_write_line: bool
+    ) -> None:
+        self.handle_file_write(PRINT_SITES[is_write_line], file, buffer_object)
+
+    def file_read(
+        self, file: TextIO, n_chars_object: Optional[RunTimeObject] = None
+    ) -> RunTimeObject:
+        return self.handle_file_read(UNLOCATED, file, n_chars_object)
+
+    def file_readline(self, file: TextIO) -> RunTimeObject:
+        return self.handle_file_readline(UNLOCATED, file)
+
+    def file_close(self, file: TextIO) -> None:
+        self.handle_file_close(UNLOCATED, file)
+
+    # Invalid nodes
+
+    @staticmethod
+    def error(error_type: str, message: str):
+        """Raises the error of an invalid node"""
+        raise InterpreterError(ErrorType[error_type], message, None, None)
+
+    @staticmethod
+    def not_implemented(message: str):
+        """Raises the error of a node the interpreter has no visit method for"""
+        raise NotImplementedError(message)
+
+
+def run_module(namespace: dict) -> None:
+    """
+    Runs a module written by the transpiler (called by its main function)
+    @param namespace: The globals of the module
+    """
+    source_map = SourceMap.from_line_starts(namespace["_LINE_STARTS"])
+    PyInterpreter().interpret(namespace, source_map)
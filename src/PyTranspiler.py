@@ -0,0 +1,879 @@
+import math
+import re
+from typing import Callable, Optional
+
+from src.EffectAnalyser import EffectAnalyser
+from src.Interpreter import Interpreter, OPERATIONS, FRESH_LABELS
+from src.core.ASTNodes import (
+    Node,
+    ProgramNode,
+    FuncDefNode,
+    LazyBodyNode,
+    BodyNode,
+    ReturnNode,
+    BreakNode,
+    ContinueNode,
+    IfNode,
+    WhileNode,
+    ForNode,
+    ArrayNode,
+    AssignmentNode,
+    PostfixExprNode,
+    CallNode,
+    PrintNode,
+    InputNode,
+    FileNode,
+    CharReprNode,
+    IntReprNode,
+    LengthNode,
+    ExprNode,
+    FactorNode,
+    BinaryOpNode,
+    UnaryOpNode,
+    LiteralNode,
+    LoadNode,
+    IdentifierNode,
+    OperatorNode,
+    walk,
+)
+from src.core.PyModule import LineMap, PyModule
+from src.core.Token import SourceMap
+from src.utils.Constants import WARNING
+from src.utils.ErrorHandler import ErrorType, InterpreterError
+
+# Function of the module running the program (or REPL input)
+MAIN_FUNCTION = "_nyaa_main"
+# Precedes the index of the node a line of generated code is mapped to
+MARK = "\x00"
+INDENT = "    "
+# Levels of indentation CPython compiles, deeper programs are rejected before they are
+# emitted (the size of their indentation grows with the square of their depth)
+MAX_INDENTATION = 100
+
+# Python operators of the binary operations applied directly to their operands
+PY_OPERATORS = {
+    op: op for op in ("+", "-", "*", "/", "%", "==", "!=", "<", ">", "<=", ">=")
+}
+NOT_OPERAND_LABELS = ("string", "number", "identifier", "boolean")
+# Nodes which may evaluate to None (a call returning no value)
+VOID_LABELS = {"call", "print", "file_open", "file_write", "file_close"}
+# Runtime helpers called by file operations, indexed by node label
+FILE_HELPERS = {
+    "file_read": "_file_read",
+    "file_readline": "_file_readline",
+    "file_close": "_file_close",
+}
+
+RUNNER = '''\
+def main():
+    """Runs the program, the Nyaa repository must be on the module search path"""
+    from src.PyInterpreter import run_module
+
+    run_module(globals())
+
+
+if __name__ == "__main__":
+    main()
+'''
+
+
+def mangle(prefix: str, name: str) -> str:
+    """
+    Returns the Python name of a Nyaa identifier.
+    Identifiers hold no digits, characters that are not ASCII letters are
+    escaped as their code point between underscores.
+    """
+    return prefix + "".join(
+        char if char.isascii() else f"_{ord(char)}_" for char in name
+    )
+
+
+def demangle(name: str) -> str:
+    """Returns the Nyaa identifier of a Python name returned by mangle"""
+    return re.sub(r"_(\d+)_", lambda match: chr(int(match[1])), name[2:])
+
+
+def literal(value) -> str:
+    """Returns the Python source of a literal value"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return f"float({str(value)!r})"
+    return repr(value)
+
+
+class PyTranspiler:
+    """
+    Transpiles the AST into Python source, run by the Python engine.
+
+    The program becomes a module: a Python function per Nyaa function and a main
+    function running the program. Nyaa variables become Python variables holding
+    the runtime objects of the tree interpreter, locals of the functions assigning
+    them and module globals otherwise. Operations on operands of the same type are
+    applied inline, other operations, calls, arrays and file operations go through
+    runtime helpers keeping the semantics (and errors) of the tree interpreter.
+
+    Break, continue and return become Python breaks, continues and returns. Outside
+    loops, break and continue return from the function (or the main function).
+
+    Every node that can report an error starts a new line of the module, the line
+    map records the node of the line so errors are located from tracebacks.
+    """
+
+    def __init__(self, parse_lazy_bodies: bool = False):
+        """
+        @param parse_lazy_bodies: Parse the bodies skimmed by a lazy parser while transpiling,
+        instead of referencing them in lazy_bodies (modules written to disk run without the AST)
+        """
+        self.__parse_lazy_bodies = parse_lazy_bodies
+        # Lazily parsed bodies referenced by transpiled modules, by index
+        self.lazy_bodies: list[LazyBodyNode] = []
+        self.__modules = 0
+        self.__functions = 0
+
+        # Transpile methods of statements and expressions, indexed by node label
+        # (statements without one are emitted as expressions)
+        self.__statements: dict[str, Callable[[Node], None]] = {
+            name.removeprefix("statement_"): getattr(self, name)
+            for name in dir(self)
+            if name.startswith("statement_")
+        }
+        self.__expressions: dict[str, Callable[[Node], str]] = {
+            name.removeprefix("expression_"): getattr(self, name)
+            for name in dir(self)
+            if name.startswith("expression_")
+        }
+        for label in ("simple_expr", "term"):
+            self.__expressions[label] = self.expression_expr
+        for label in ("file_read", "file_readline", "file_close"):
+            self.__expressions[label] = self.expression_file_operation
+
+        # Module being transpiled
+        self.__lines: list[str] = []
+        self.__line_map = LineMap()
+        self.__sites: list[Node] = []
+        self.__depth = 0
+
+        # Function being transpiled
+        self.__in_function = False
+        self.__locals: set[str] = set()
+        self.__definite: set[str] = set()
+        self.__loops = 0
+        self.__temps = 0
+
+    def transpile_module(
+        self,
+        node: Node,
+        name: str = "<repl>",
+        source_map: Optional[SourceMap] = None,
+    ) -> PyModule:
+        """
+        Transpiles a program, or a REPL input, to a module.
+        Its main function runs the program, or returns the value of an expression.
+        @param node: The root node of the program or REPL input
+        @param name: The name of the program source
+        @param source_map: The source map of the program, given to write a standalone module
+        (with its line map and a runner)
+        """
+        self.__begin_module(name)
+        program = isinstance(node, ProgramNode)
+        if program:
+            functions = [] if node.eof else node.functions
+            body = node.body.statements if node.body and not node.eof else []
+        else:
+            functions = [node] if isinstance(node, FuncDefNode) else []
+            body = [] if isinstance(node, FuncDefNode) else [node]
+        python_functions = [self.__function_def(function) for function in functions]
+
+        # Variables of the program read by functions are globals of the module, the
+        # others are locals of the main function. REPL inputs share their variables.
+        assigned = self.__assigned(*body)
+        global_names = set(assigned)
+        if program and not self.lazy_bodies:
+            global_names &= self.__read(*functions)
+        global_names |= {function.identifier for function in functions}
+
+        self.__begin_function(assigned - global_names, in_function=False)
+
+        def emit_main() -> None:
+            if global_names:
+                names = ", ".join(mangle("v_", name) for name in sorted(global_names))
+                self.__emit(f"global {names}")
+            for function, python_function in zip(functions, python_functions):
+                self.__function_symbol(function, python_function)
+
+            if program:
+                self.__body(body)
+            elif isinstance(node, BodyNode):
+                self.__body(node.statements)
+            elif isinstance(node, FuncDefNode):
+                pass
+            elif node.label in self.__statements:
+                self.__statement(node)
+            else:
+                self.__emit(f"return {self.__expression(node)}")
+
+        self.__emit(f"def {MAIN_FUNCTION}():")
+        self.__block(emit_main)
+        return self.__end_module(name, source_map)
+
+    def transpile_function(
+        self, name: str, params: list[str], body: Optional[BodyNode]
+    ) -> tuple[PyModule, str]:
+        """
+        Transpiles the body of a function parsed on its first call to a module
+        @return: The module and the name of the Python function it defines
+        """
+        self.__begin_module(name)
+        python_function = self.__function(name, params, body)
+        return self.__end_module(name, None), python_function
+
+    # Modules
+
+    def __begin_module(self, name: str) -> None:
+        """Starts a new module"""
+        self.__lines = [f"# Transpiled from {name} by the Nyaa transpiler", ""]
+        self.__line_map = LineMap()
+        self.__sites = []
+        self.__depth = 0
+        self.__modules += 1
+
+    def __end_module(self, name: str, source_map: Optional[SourceMap]) -> PyModule:
+        """Returns the transpiled module, with its line map and runner if standalone"""
+        filename = f"<nyaa-py:{name}#{self.__modules}>"
+        if source_map:
+            filename = name
+            self.__lines += ["", ""]
+            self.__lines.append(f"_LINE_MAP = {self.__line_map.sites!r}")
+            self.__lines.append(f"_LINE_STARTS = {source_map.line_starts!r}")
+            self.__lines += ["", ""]
+            self.__lines.extend(RUNNER.splitlines())
+        return PyModule("\n".join(self.__lines) + "\n", self.__line_map, filename)
+
+    def __emit(self, text: str, node: Optional[Node] = None) -> None:
+        """
+        Appends generated code at the current indentation.
+        Lines starting with a mark are mapped to the node the mark indexes,
+        the first line to the given node otherwise.
+        """
+        for i, line in enumerate(text.split("\n")):
+            site = node if i == 0 else None
+            if line.startswith(MARK):
+                _, index, line = line.split(MARK, 2)
+                site = self.__sites[int(index)]
+            self.__lines.append(INDENT * (self.__depth + (i > 0)) + line)
+            if site is not None:
+                self.__line_map.add(
+                    len(self.__lines), site.label, site.start_pos, site.end_pos
+                )
+
+    def __located(self, node: Node, text: str) -> str:
+        """Returns an expression starting a new line, mapped to the given node"""
+        self.__sites.append(node)
+        return f"(\n{MARK}{len(self.__sites) - 1}{MARK}{text})"
+
+    def __block(self, emit: Callable[[], None]) -> None:
+        """Emits an indented block, which holds at least a pass statement"""
+        self.__depth += 1
+        length = len(self.__lines)
+        emit()
+        if len(self.__lines) == length:
+            self.__emit("pass")
+        self.__depth -= 1
+
+    # Functions
+
+    def __begin_function(self, local_names: set[str], in_function: bool) -> None:
+        """
+        Starts transpiling the main function, or the function of a Nyaa function
+        @param local_names: The Nyaa variables that are locals of the function
+        """
+        self.__in_function = in_function
+        self.__locals = local_names
+        self.__definite = set()
+        self.__loops = 0
+        self.__temps = 0
+
+    def __function_def(self, node: FuncDefNode) -> Optional[str]:
+        """
+        Transpiles a function definition to a Python function
+        @return: The name of the Python function, None if its body is parsed on its first call
+        """
+        params = [arg.value for arg in node.args.children] if node.args else []
+        if len(set(params)) != len(params):
+            return None
+
+        body = node.body
+        if isinstance(body, LazyBodyNode):
+            if not self.__parse_lazy_bodies:
+                self.lazy_bodies.append(body)
+                return None
+            body = Interpreter.parse_lazy_body(body)
+        return self.__function(node.identifier, params, body)
+
+    def __function(self, name: str, params: list[str], body: Optional[BodyNode]) -> str:
+        """Transpiles the body of a function to a Python function and returns its name"""
+        self.__functions += 1
+        python_function = f"{mangle('f_', name)}_{self.__functions}"
+        statements = body.statements if body else []
+        assigned = self.__assigned(*statements) - set(params)
+        self.__begin_function(assigned | set(params), in_function=True)
+        self.__definite = set(params)
+
+        params_list = ", ".join(mangle("l_", param) for param in params)
+        self.__emit("")
+        self.__emit(f"def {python_function}({params_list}):")
+        self.__depth += 1
+        for local_name in sorted(assigned):
+            self.__emit(f"{mangle('l_', local_name)} = _UNSET")
+        self.__body(statements)
+        self.__emit("return None")
+        self.__depth -= 1
+
+        # The global functions it calls, for the memoization of its calls
+        callees = EffectAnalyser().analyse(params, body) if body else None
+        if callees is not None:
+            callees = f"frozenset({tuple(sorted(callees))!r})"
+        self.__emit(f"{python_function}.callees = {callees}")
+        self.__emit("")
+        return python_function
+
+    def __function_symbol(
+        self, node: FuncDefNode, python_function: Optional[str]
+    ) -> None:
+        """Emits the definition of a Nyaa function, binding its symbol to its name"""
+        params = {}
+        for arg in node.args.children if node.args else []:
+            if arg.value in params:
+                message = f"Duplicate parameter {WARNING}'{arg.value}'"
+                self.__emit(f"_error('RUNTIME', {message!r})", node.args)
+                return
+            params[arg.value] = "identifier"
+
+        if python_function is None:
+            python_function = f"_lazy_bodies[{self.lazy_bodies.index(node.body)}]"
+        self.__emit(
+            f"{mangle('v_', node.identifier)} = _RTO('function', "
+            f"_FunctionSymbol({node.identifier!r}, {params!r}, {python_function}))"
+        )
+
+    # Analysis
+
+    @staticmethod
+    def __assigned(*nodes: Node) -> set[str]:
+        """Returns the names of the variables assigned by the given nodes"""
+        names = set()
+        for root in nodes:
+            for node in walk(root):
+                if isinstance(node, AssignmentNode):
+                    names.add(node.left.value)
+                elif isinstance(node, ForNode):
+                    names.add(node.identifier.value)
+                elif node.label in ("array_def", "file_open"):
+                    names.add(node.identifier)
+        return names
+
+    @staticmethod
+    def __read(*nodes: Node) -> set[str]:
+        """
+        Returns the names of the variables the given nodes may read.
+        Parameters are included, calls without arguments read them from the globals.
+        """
+        names = set()
+        for root in nodes:
+            for node in walk(root):
+                if isinstance(node, LoadNode):
+                    names.add(node.identifier)
+                elif isinstance(node, IdentifierNode):
+                    names.add(node.value)
+                elif isinstance(node, (CallNode, ArrayNode, FileNode)):
+                    names.add(node.identifier)
+        return names
+
+    # Variables
+
+    def __load(self, name: str) -> str:
+        """Returns the expression reading a variable"""
+        if name not in self.__locals:
+            return mangle("v_", name)
+        if name in self.__definite or not self.__in_function:
+            return mangle("l_" if self.__in_function else "v_", name)
+
+        # Not assigned yet, the variable is read from the globals
+        local_name = mangle("l_", name)
+        return f"({local_name} if {local_name} is not _UNSET else {mangle('v_', name)})"
+
+    def __store(self, name: str) -> str:
+        """Returns the target assigning a variable, which is then definitely assigned"""
+        if self.__in_function:
+            self.__definite.add(name)
+            return mangle("l_", name)
+        return mangle("v_", name)
+
+    def __temp(self, prefix: str) -> str:
+        """Returns the name of a temporary of the current expression depth"""
+        return f"_{prefix}{self.__temps}"
+
+    # Bodies and control flow
+
+    def __body(self, statements: list[Node]) -> None:
+        """Emits the statements of a body"""
+        for statement in statements:
+            self.__statement(statement)
+
+    def __exit(self) -> None:
+        """Emits leaving the function (or the main function) without a value"""
+        self.__emit("return None" if self.__in_function else "return")
+
+    def __conditional_body(self, body: Optional[BodyNode]) -> None:
+        """Emits the body of a conditional statement, its assignments are not definite"""
+        definite = set(self.__definite)
+        self.__block(lambda: self.__body(body.statements if body else []))
+        self.__definite = definite
+
+    def __loop_body(self, node: WhileNode | ForNode) -> None:
+        """Emits the body of a loop"""
+        self.__loops += 1
+        self.__conditional_body(node.body)
+        self.__loops -= 1
+
+    # Statements
+
+    def __statement(self, node: Node) -> None:
+        """
+        Emits a statement
+        @raise InterpreterError: If it is nested deeper than CPython compiles
+        """
+        if self.__depth >= MAX_INDENTATION:
+            raise InterpreterError(
+                ErrorType.NOT_IMPLEMENTED,
+                "The program cannot be transpiled to Python: "
+                "too many levels of indentation",
+                node.start_pos,
+                node.end_pos,
+            )
+
+        statement = self.__statements.get(node.label)
+        if statement:
+            statement(node)
+        else:
+            self.__emit(self.__expression(node))
+
+    def statement_assignment(self, node: AssignmentNode) -> None:
+        if node.right.label in FRESH_LABELS:
+            value = self.__expression(node.right)
+        else:
+            # Assigned values are copied, functions are assigned by reference
+            temp = self.__temp("a")
+            self.__temps += 1
+            right = self.__expression(node.right)
+            self.__temps -= 1
+            value = (
+                f"{temp} if ({temp} := {right}).label in 'function' "
+                f"else _RTO({temp}.label, {temp}.value)"
+            )
+        self.__emit(f"{self.__store(node.left.value)} = {value}")
+
+    def statement_array_def(self, node: ArrayNode) -> None:
+        if node.size:
+            size = self.__expression(node.size)
+            values = f"[_RTO('number', 0)] * int({size}.value)"
+        elif node.initial_values:
+            values = f"[{', '.join(map(self.__expression, node.initial_values))}]"
+        elif node.string_value:
+            string = self.__expression(node.string_value)
+            values = f"_characters({string})"
+        else:
+            values = "[]"
+        self.__emit(f"{self.__store(node.identifier)} = _RTO('array', {values})")
+
+    def statement_array_update(self, node: ArrayNode) -> None:
+        if not node.index or not node.value:
+            missing = "Array index not provided" if not node.index else None
+            message = missing or "Value to amend to, not provided"
+            self.__emit(f"_error('RUNTIME', {message!r})", node)
+            return
+
+        self.__emit(f"_index = {self.__expression(node.index)}")
+        self.__emit(f"_value = {self.__expression(node.value)}")
+        array = self.__load(node.identifier)
+        self.__emit(
+            f"if 0 <= (_position := _index.value) < len(_array := {array}.value):"
+        )
+        self.__block(
+            lambda: self.__emit("_array[_position] = _RTO(_value.label, _value.value)")
+        )
+        self.__emit("else:")
+        self.__block(
+            lambda: self.__emit("_array_update(_position, _value, _array)", node)
+        )
+
+    def statement_return(self, node: ReturnNode) -> None:
+        if node.tail_call and node.expr.args is not None:
+            # The caller makes the call, in its frame (see PyInterpreter.call_function),
+            # errors binding its arguments are located with the position of the call
+            args = node.expr.args
+            position = f"({args.start_pos!r}, {args.end_pos!r})"
+            self.__emit(f"return {self.__call(node.expr, '_tail_call', position)}")
+            return
+        value = self.__expression(node.expr) if node.expr else "None"
+        if self.__in_function:
+            self.__emit(f"return {value}")
+        else:
+            self.__emit(value)
+            self.__emit("return")
+
+    def statement_break(self, node: BreakNode) -> None:
+        if self.__loops:
+            self.__emit("break")
+        else:
+            self.__exit()
+
+    def statement_continue(self, node: ContinueNode) -> None:
+        if self.__loops:
+            self.__emit("continue")
+        else:
+            self.__exit()
+
+    def statement_if(self, node: IfNode) -> None:
+        self.__emit(f"if {self.__truth(node.expr)}:")
+        self.__conditional_body(node.body)
+        for else_if in node.else_if_statements:
+            self.__emit(f"elif {self.__truth(else_if.expr)}:")
+            self.__conditional_body(else_if.body)
+        if node.else_body:
+            self.__emit("else:")
+            self.__conditional_body(node.else_body)
+
+    def statement_while(self, node: WhileNode) -> None:
+        self.__emit(f"while {self.__truth(node.expr)}:")
+        self.__loop_body(node)
+
+    def statement_for(self, node: ForNode) -> None:
+        loop = self.__loops
+        start = self.__expression(node.range_start)
+        self.__emit(f"_start{loop} = _range_value({start})", node.range_start)
+        end = self.__expression(node.range_end)
+        self.__emit(f"_end{loop} = _range_value({end})", node.range_end)
+        iterator = f"_it{loop}"
+        variable = self.__store(node.identifier.value)
+        self.__emit(f"{iterator} = {variable} = _RTO('number', 0)")
+        self.__emit(
+            f"for _n{loop} in range(_start{loop}, _end{loop}, "
+            f"1 if _start{loop} < _end{loop} else -1):"
+        )
+        self.__depth += 1
+        self.__emit(f"{iterator}.value = _n{loop}")
+        self.__depth -= 1
+        self.__loop_body(node)
+
+    def statement_func_def(self, node: FuncDefNode) -> None:
+        self.__function_symbol(node, None)
+
+    def statement_postfix_expr(self, node: PostfixExprNode) -> None:
+        if not isinstance(node.left, IdentifierNode):
+            self.__emit(self.__expression(node))
+            return
+        operator = "+=" if node.operator == "++" else "-="
+        self.__emit(f"{self.__load(node.left.value)}.value {operator} 1")
+
+    def statement_file_open(self, node: FileNode) -> None:
+        variable, value = self.__file_open(node)
+        self.__emit(f"{variable} = {value}" if variable else value, node)
+
+    def statement_file_write(self, node: FileNode) -> None:
+        self.__emit(self.__file_write(node), node)
+
+    def statement_file_close(self, node: FileNode) -> None:
+        self.__emit(self.__file_operation(node), node)
+
+    # Expressions
+
+    def __expression(self, node: Node) -> str:
+        """Returns the Python expression evaluating a node to its runtime object"""
+        expression = self.__expressions.get(node.label)
+        if expression is None:
+            message = f"No visit_{node.label} method defined"
+            return f"_not_implemented({message!r})"
+        return expression(node)
+
+    def __truth(self, node: Node) -> str:
+        """Returns the Python expression evaluating the truth of a condition"""
+        if isinstance(node, BinaryOpNode):
+            return self.__binary_op(node, truth=True)
+        if isinstance(node, UnaryOpNode):
+            return self.__unary_op(node, truth=True)
+        return f"{self.__expression(node)}.value"
+
+    def __binary_op(self, node: BinaryOpNode, truth: bool = False) -> str:
+        """
+        Returns the expression of a binary operation. Operations on operands of the
+        type it applies to are applied inline, the handlers apply the others.
+        @param truth: Evaluate the truth of the result rather than its runtime object
+        """
+        op, symbol = node.operator, PY_OPERATORS.get(node.operator)
+        left, right = self.__temp("l"), self.__temp("r")
+        self.__temps += 1
+        left_expression = self.__expression(node.left)
+        constant = node.right
+        if not isinstance(constant, LiteralNode):
+            constant = None
+        elif op == "/":
+            # Division by a non-zero number constant
+            if constant.kind != "number" or not constant.value:
+                constant = None
+        elif (constant.kind, op) not in OPERATIONS:
+            constant = None
+        right_expression = self.__expression(node.right) if not constant else None
+        self.__temps -= 1
+        value = ".value" if truth else ""
+
+        if constant:
+            kind, c = constant.kind, literal(constant.value)
+            label = repr("number" if op == "/" else OPERATIONS[(kind, op)][1])
+            slow = f"_binary_op({op!r}, {left}, _RTO({kind!r}, {c})){value}"
+            test = f"({left} := {left_expression}).label != {kind!r}"
+            result = f"{left}.value {symbol} {c}"
+        else:
+            labels = tuple(
+                label for label in ("number", "string") if (label, op) in OPERATIONS
+            )
+            if op == "/":
+                labels = ("number",)
+            slow = f"_binary_op({op!r}, {left}, {right}){value}"
+            if not symbol or not labels:
+                return self.__located(
+                    node,
+                    f"_binary_op({op!r}, {left_expression}, {right_expression}){value}",
+                )
+            if node.left.label in VOID_LABELS:
+                # Both operands are evaluated before the left one can be found to be None
+                test = f"(({left} := {left_expression}), ({right} := {right_expression}))[1].label != {left}.label"
+            else:
+                test = f"({left} := {left_expression}).label != ({right} := {right_expression}).label"
+            if len(labels) == 1:
+                test += f" or {left}.label != {labels[0]!r}"
+            else:
+                test += f" or {left}.label not in {labels!r}"
+            if op == "/":
+                test += f" or not {right}.value"
+            label = OPERATIONS.get((labels[0], op), (None, "number"))[1]
+            if len(labels) > 1 and label != "boolean":
+                label = f"{left}.label"
+            else:
+                label = repr(label)
+            result = f"{left}.value {symbol} {right}.value"
+
+        if not truth:
+            result = f"_RTO({label}, {result})"
+        return self.__located(node, f"{slow} if {test} else {result}")
+
+    def __unary_op(self, node: UnaryOpNode, truth: bool = False) -> str:
+        """Returns the expression of a unary operation, applied inline to valid operands"""
+        op, operand = node.operator, self.__temp("u")
+        self.__temps += 1
+        operand_expression = self.__expression(node.operand)
+        self.__temps -= 1
+        value = ".value" if truth else ""
+        if node.operand.label in VOID_LABELS:
+            # The handler reports the operation on None
+            return self.__located(
+                node, f"_unary_op({op!r}, {operand_expression}){value}"
+            )
+        if op == "not":
+            test = f"({operand} := {operand_expression}).label not in {NOT_OPERAND_LABELS!r}"
+            label, result = "boolean", f"not {operand}.value"
+        else:
+            test = f"({operand} := {operand_expression}).label != 'number'"
+            label, result = "number", f"-{operand}.value"
+
+        if not truth:
+            result = f"_RTO({label!r}, {result})"
+        return self.__located(
+            node, f"_unary_op({op!r}, {operand}){value} if {test} else {result}"
+        )
+
+    def expression_binary_op(self, node: BinaryOpNode) -> str:
+        return self.__binary_op(node)
+
+    def expression_unary_op(self, node: UnaryOpNode) -> str:
+        return self.__unary_op(node)
+
+    @staticmethod
+    def expression_literal(node: LiteralNode) -> str:
+        return f"_RTO({node.kind!r}, {literal(node.value)})"
+
+    def expression_load(self, node: LoadNode) -> str:
+        return self.__load(node.identifier)
+
+    def expression_identifier(self, node: IdentifierNode) -> str:
+        return self.__load(node.value)
+
+    @staticmethod
+    def expression_numeric_literal(node: Node) -> str:
+        return f"_RTO('number', {literal(node.value)})"
+
+    @staticmethod
+    def expression_string_literal(node: Node) -> str:
+        return f"_RTO('string', {literal(node.value)})"
+
+    @staticmethod
+    def expression_boolean_literal(node: Node) -> str:
+        return f"_RTO('boolean', {literal(node.value)})"
+
+    @staticmethod
+    def expression_operator(node: OperatorNode) -> str:
+        return f"_RTO('operator', {node.value!r})"
+
+    def expression_expr(self, node: ExprNode) -> str:
+        """Nested expression, simple expression and term nodes"""
+        left = self.__expression(node.left)
+        if not node.operator:
+            return left
+        right = self.__expression(node.right)
+        return self.__located(node, f"_binary_op({node.operator!r}, {left}, {right})")
+
+    def expression_factor(self, node: FactorNode) -> str:
+        left = self.__expression(node.left)
+        if not node.right:
+            return left
+        right = self.__expression(node.right)
+        return self.__located(node, f"_factor({left}, {right})")
+
+    def expression_call(self, node: CallNode) -> str:
+        if node.args is None:
+            return f"_call_without_args({self.__callee(node)})"
+        return self.__call(node, "_call")
+
+    def __callee(self, node: CallNode) -> str:
+        """Returns the expression looking up the function called"""
+        return self.__located(
+            node, f"_lookup({self.__load(node.identifier)}, {node.identifier!r})"
+        )
+
+    def __call(self, node: CallNode, helper: str, *prefix: str) -> str:
+        """
+        Returns the expression of a call with arguments, made by the given helper
+        @param prefix: Expressions passed to the helper before the function
+        """
+        function = self.__callee(node)
+        args = "".join(f", {self.__expression(arg)}" for arg in node.args.children)
+        helper_args = "".join(f"{expression}, " for expression in prefix)
+        return self.__located(node.args, f"{helper}({helper_args}{function}{args})")
+
+    def expression_array_access(self, node: ArrayNode) -> str:
+        if not node.index:
+            return self.__located(
+                node, f"_error('RUNTIME', {'No array index provided...'!r})"
+            )
+
+        index, array = self.__temp("i"), self.__temp("a")
+        self.__temps += 1
+        index_expression = self.__expression(node.index)
+        self.__temps -= 1
+        load = self.__load(node.identifier)
+        return self.__located(
+            node,
+            f"_array_access({index}, {array}) if not 0 <= "
+            f"({index} := {index_expression}.value) < len(({array} := {load}).value) "
+            f"else {array}.value[{index}]",
+        )
+
+    def expression_print(self, node: PrintNode) -> str:
+        args = node.args.children if node.args else []
+        end = repr("\n" if node.println else "")
+        if not args:
+            return f"print(end={end})"
+        if len(args) == 1:
+            return f"print({self.__expression(args[0])}.value, end={end})"
+        values = ", ".join(map(self.__expression, args))
+        return f"print(*_values(({values},)), end={end})"
+
+    def expression_input(self, node: InputNode) -> str:
+        return f"_RTO('string', input({node.message!r}))"
+
+    def expression_postfix_expr(self, node: PostfixExprNode) -> str:
+        step = 1 if node.operator == "++" else -1
+        return f"_postfix({self.__expression(node.left)}, {step})"
+
+    def expression_char_repr(self, node: CharReprNode) -> str:
+        return self.__located(node, f"_char_repr({self.__expression(node.expr)})")
+
+    def expression_int_repr(self, node: IntReprNode) -> str:
+        return self.__located(node, f"_int_repr({self.__expression(node.expr)})")
+
+    def expression_length(self, node: LengthNode) -> str:
+        value = self.__temp("x")
+        self.__temps += 1
+        expression = self.__expression(node.expr)
+        self.__temps -= 1
+        return self.__located(
+            node,
+            f"_length({value}) if ({value} := {expression}).label != 'string' "
+            f"and {value}.label != 'array' else _RTO('number', len({value}.value))",
+        )
+
+    def __file_open(self, node: FileNode) -> tuple[Optional[str], str]:
+        """Returns the variable a file open assigns (None if invalid) and the expression opening it"""
+        if not node.filepath or not node.access_mode or not node.identifier:
+            message = "File identifier must be provided..."
+            if not node.filepath:
+                message = "File path must be provided..."
+            elif not node.access_mode:
+                message = "File access mode must be provided..."
+            return None, f"_error('RUNTIME', {message!r})"
+
+        filepath = self.__expression(node.filepath)
+        access_mode = self.__expression(node.access_mode)
+        return self.__store(node.identifier), f"_file_open({filepath}, {access_mode})"
+
+    def __file_write(self, node: FileNode) -> str:
+        """Returns the expression writing to a file"""
+        if not node.identifier or not node.write_buffer:
+            message = "File identifier must be provided..."
+            if node.identifier:
+                message = "No bytes were provided to write to file"
+            return f"_error('RUNTIME', {message!r})"
+
+        file = f"{self.__load(node.identifier)}.value.file"
+        buffer = self.__expression(node.write_buffer)
+        return f"_file_write({file}, {buffer}, {node.is_write_line!r})"
+
+    def __file_operation(self, node: FileNode) -> str:
+        """Returns the expression reading or closing a file"""
+        if not node.identifier:
+            return f"_error('RUNTIME', {'File identifier must be provided...'!r})"
+
+        file = f"{self.__load(node.identifier)}.value.file"
+        if node.label == "file_read" and node.n_chars_to_read:
+            file += f", {self.__expression(node.n_chars_to_read)}"
+        return f"{FILE_HELPERS[node.label]}({file})"
+
+    def expression_file_open(self, node: FileNode) -> str:
+        # Evaluates to None, as its visit method
+        variable, value = self.__file_open(node)
+        if variable:
+            value = f"({variable} := {value}) and None"
+        return self.__located(node, value)
+
+    def expression_file_write(self, node: FileNode) -> str:
+        return self.__located(node, self.__file_write(node))
+
+    def expression_file_operation(self, node: FileNode) -> str:
+        return self.__located(node, self.__file_operation(node))
+
+
+def write_module(
+    path: str, program: ProgramNode, source_map: SourceMap, source_path: str
+) -> None:
+    """
+    Transpiles a program to a Python module file, which runs without the Nyaa front end
+    @param path: The path of the module
+    @param program: The root node of the program
+    @param source_map: The source map of the program, to report its errors with
+    @param source_path: The path of the program source, named by the header of the module
+    @raise InterpreterError: If the program cannot be transpiled
+    """
+    module = PyTranspiler(parse_lazy_bodies=True).transpile_module(
+        program, name=source_path, source_map=source_map
+    )
+    with open(path, "w") as module_file:
+        module_file.write(module.source)
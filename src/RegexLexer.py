@@ -0,0 +1,384 @@
+import re
+import sys
+from pathlib import Path
+from typing import Iterator, Optional, TextIO
+
+from src.Lexer import Lexer, RESERVED_WORDS, match_braces
+from src.core.Token import Token, SourceMap
+from src.core.Types import TokenType
+from src.utils.Constants import (
+    EOF,
+    MAX_ID_LEN,
+    MAX_STR_LEN,
+    MAX_BULK_READ_SIZE,
+    SOURCE_CHUNK_SIZE,
+)
+from src.utils.ErrorHandler import LexerError
+from src.utils.Logger import Logger
+
+# Master pattern: any whitespace and comments are skipped, followed by one lexeme
+# whose named group represents its family. A block comment ends after two more
+# '#' characters (or at the end of the source).
+TOKEN_PATTERN = re.compile(
+    r"""
+    (?:\s+|\#\#[^#]*(?:\#[^#]*\#?)?|\#[^\n]*)*
+    (?:
+        (?P<WORD>[^\W\d]+)
+      | (?P<NUMBER>(?P<WHOLE>\d+)(?:\.(?P<FRACTION>\d*))?)
+      | (?P<STRING>"(?P<BODY>(?:[^"\\]|\\.)*)")
+      | (?P<OPERATOR>==|=>|\+\+|--|!=|<=|>=|::|&&|\|\||[-+*/%=<>!(){}\[\];,:|&])
+    )?
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+ESCAPE_PATTERN = re.compile(r"\\(.)", re.DOTALL)
+
+OPERATORS = {
+    "(": TokenType.LPAR,
+    ")": TokenType.RPAR,
+    "{": TokenType.LBRACE,
+    "}": TokenType.RBRACE,
+    "[": TokenType.LBRACKET,
+    "]": TokenType.RBRACKET,
+    "::": TokenType.COLON,
+    ";": TokenType.SEMICOLON,
+    "=": TokenType.ASSIGN,
+    "==": TokenType.EQ,
+    "=>": TokenType.TO,
+    "+": TokenType.PLUS,
+    "++": TokenType.UN_ADD,
+    "-": TokenType.MINUS,
+    "--": TokenType.UN_SUB,
+    "*": TokenType.MULTIPLY,
+    "/": TokenType.DIVIDE,
+    "%": TokenType.MODULO,
+    "!": TokenType.NOT,
+    "!=": TokenType.NEQ,
+    "||": TokenType.OR,
+    "&&": TokenType.AND,
+    "<": TokenType.LT,
+    "<=": TokenType.LTE,
+    ">": TokenType.GT,
+    ">=": TokenType.GTE,
+    ",": TokenType.COMMA,
+    # Incomplete operators are consumed as null tokens (same as the hand-written lexer)
+    ":": TokenType.NULL,
+    "|": TokenType.NULL,
+    "&": TokenType.NULL,
+}
+
+ESCAPE_CHARACTERS = {"n": "\n", "t": "\t", '"': '"', "\\": "\\"}
+
+
+class RegexLexer(Lexer):
+    """
+    Tokenizer backend that matches whole lexemes with a compiled master pattern.
+    It is API-compatible with the hand-written Lexer and produces the same tokens
+    and error positions.
+    """
+
+    def __init__(self, verbose: bool = False, logger: Optional[Logger] = None) -> None:
+        """
+        Initializes the Lexer
+        @param verbose: Flag to enable logging (to the console, if no logger is given)
+        @param logger: Logger of the lexer subsystem
+        """
+        super().__init__(verbose, logger)
+        self.__source = ""
+        self.__source_length = 0
+        self.__source_stream: Optional[TextIO] = None
+
+        # __base is the source offset of the first buffered character
+        self.__base = 0
+        self.__cursor = 0
+        self.__token_offset = -1
+        self.source_map = SourceMap()
+
+    def init(self) -> None:
+        self.__close_stream()
+        super().init()
+
+    def __load_buffer(self, source: str) -> None:
+        """Replaces the source buffer and rewinds the cursor"""
+        self.source_map.extend(source)
+        self.__source = source
+        self.__source_length = len(source)
+
+    def __read_chunk(self) -> bool:
+        """
+        Appends the next chunk of a streamed source to the unconsumed part of the buffer
+        @return: True if a new chunk was loaded, False once the stream is exhausted
+        """
+        if not self.__source_stream:
+            return False
+
+        chunk = self.__source_stream.read(SOURCE_CHUNK_SIZE)
+        if not chunk:
+            self.__close_stream()
+            return False
+
+        self.source_map.extend(chunk)
+        self.__base += self.__cursor
+        self.__source = self.__source[self.__cursor :] + chunk
+        self.__source_length = len(self.__source)
+        self.__cursor = 0
+        return True
+
+    def __close_stream(self) -> None:
+        """Closes the streamed source (if any)"""
+        if self.__source_stream:
+            self.__source_stream.close()
+            self.__source_stream = None
+
+    def analyze_src_file(self, source_file: Path) -> None:
+        """
+        Reads in the source file for tokenization.
+        Files larger than MAX_BULK_READ_SIZE bytes are streamed in chunks.
+        """
+        self.init()
+        source_file = Path(source_file)
+        if source_file.stat().st_size > MAX_BULK_READ_SIZE:
+            self.analyze_stream(open(source_file, "r"))
+            return
+
+        with open(source_file, "r") as source:
+            self.__load_buffer(source.read())
+
+    def analyze_stream(self, source: TextIO) -> None:
+        """
+        Tokenizes a text stream chunk by chunk.
+        The lexer takes ownership of the stream and closes it once exhausted.
+        """
+        self.init()
+        self.__source_stream = source
+
+    def analyze_string(self, source: str) -> None:
+        """Reads in source code held in a string for tokenization"""
+        self.init()
+        self.__load_buffer(source)
+
+    def analyze_repl(self, repl_input: str) -> None:
+        """Reads in the REPL input for tokenization"""
+        self.init()
+        self.__load_buffer(repl_input)
+
+    def analyze_span(self, source: str, offset: int, source_map: SourceMap) -> None:
+        """Reads in part of a source for tokenization (e.g. a lazily parsed function body)"""
+        self.init()
+        self.__source = source
+        self.__source_length = len(source)
+        self.__base = offset
+        self.source_map = source_map
+
+    def skim_block(self) -> Optional[tuple[str, int]]:
+        """
+        Skips the block opened by the last token scanned (a '{') up to its matching '}',
+        without tokenizing it
+        """
+        start = self.__token_offset - self.__base
+        if self.__source_stream or not 0 <= start < self.__source_length:
+            return None
+        if self.__source[start] != "{":
+            return None
+
+        end = match_braces(self.__source, start)
+        if end == -1:
+            return None
+
+        self.__cursor = end
+        return self.__source[start:end], self.__token_offset
+
+    def iter_tokens(self) -> Iterator[Token]:
+        """
+        Lazily yields the tokens of the source, up to and including the end marker.
+        Words, integers and operators of a buffered source are built inline from their match,
+        other lexemes (and the chunks of a streamed source) are scanned by _scan_token.
+        """
+        if self.__source_stream:
+            yield from super().iter_tokens()
+            return
+
+        source, base = self.__source, self.__base
+        match = TOKEN_PATTERN.match
+        operators, reserved_words, intern = OPERATORS, RESERVED_WORDS, sys.intern
+        identifier, integer, string = TokenType.ID, TokenType.INT, TokenType.STR
+        while True:
+            # The cursor is read back from the lexer, as skim_block moves it
+            lexeme = match(source, self.__cursor)
+            kind = lexeme.lastgroup
+            if kind == "OPERATOR":
+                start = lexeme.start(kind)
+                token = Token(operators[lexeme.group(kind)], "", 0, base + start)
+            elif kind == "WORD" and lexeme.end() - lexeme.start(kind) < MAX_ID_LEN:
+                start = lexeme.start(kind)
+                word = lexeme.group(kind)
+                token_type = reserved_words.get(word)
+                if token_type is None:
+                    token = Token(identifier, intern(word), 0, base + start)
+                else:
+                    token = Token(token_type, word, 0, base + start)
+            elif kind == "NUMBER" and lexeme.group("FRACTION") is None:
+                start = lexeme.start(kind)
+                token = Token(integer, "", int(lexeme.group(kind)), base + start)
+            elif (
+                kind == "STRING"
+                and "\\" not in (body := lexeme.group("BODY"))
+                and len(body) <= MAX_STR_LEN
+                and body.isprintable()
+            ):
+                start = lexeme.start(kind)
+                token = Token(string, body, 0, base + start)
+            else:
+                token = self._scan_token()
+                yield token
+                if token.type is TokenType.ENDMARKER:
+                    return
+                continue
+
+            self.__token_offset = token.offset
+            self.__cursor = lexeme.end()
+            yield token
+
+    def _scan_token(self) -> Token:
+        """Matches the next lexeme with the master pattern and returns it as a token object"""
+        match = TOKEN_PATTERN.match(self.__source, self.__cursor)
+
+        # A lexeme that is unmatched or touching the end of the buffer
+        # may continue in the next chunk
+        while self.__source_stream and (
+            match.lastgroup is None or match.end() == self.__source_length
+        ):
+            if not self.__read_chunk():
+                break
+            match = TOKEN_PATTERN.match(self.__source, self.__cursor)
+
+        source = self.__source
+        kind = match.lastgroup
+        start = match.start(kind) if kind else match.end()
+
+        self.__token_offset = self.__base + start
+        if start == self.__source_length:
+            # The end marker sits on the last character read (as in the hand-written lexer)
+            self.__token_offset -= 1
+        self.__cursor = start
+
+        token = Token()
+        if kind == "WORD":
+            self.__process_word(token, match.group(kind))
+        elif kind == "OPERATOR":
+            token.type = OPERATORS[match.group(kind)]
+        elif kind == "NUMBER":
+            self.__process_number(token, match)
+        elif kind == "STRING":
+            self.__process_string(token, match.group("BODY"))
+        elif start < self.__source_length:
+            # Strings that could not be matched report their specific error
+            if source[start] == '"':
+                self.__process_string(token, None)
+
+            raise LexerError(
+                f"Unrecognized character '{source[start]}'",
+                self.line_number,
+                self.col_number,
+            )
+        else:
+            token.type = TokenType.ENDMARKER
+
+        self.__cursor = match.end()
+        token.offset = self.__token_offset
+        return token
+
+    def __process_word(self, token: Token, word: str) -> None:
+        """Convert a matched word into an identifier or reserved word token"""
+        if len(word) >= MAX_ID_LEN:
+            raise LexerError(
+                f"Identifier exceeds the maximum length of {MAX_ID_LEN} characters",
+                self.line_number,
+                self.col_number,
+            )
+
+        token.type = RESERVED_WORDS.get(word, TokenType.ID)
+        token.word = sys.intern(word) if token.type is TokenType.ID else word
+
+    def __process_number(self, token: Token, match: re.Match) -> None:
+        """Convert a matched number into an integer or float token"""
+        token.number = int(match.group("WHOLE"))
+        token.type = TokenType.INT
+
+        fraction = match.group("FRACTION")
+        if fraction is None:
+            return
+
+        if not fraction:
+            raise LexerError("Invalid float number", self.line_number, self.col_number)
+        token.number += float(int(fraction)) / 10 ** len(fraction)
+        token.type = TokenType.FLOAT
+
+    def __process_string(self, token: Token, body: Optional[str]) -> None:
+        """
+        Convert a matched string into a string token.
+        Strings containing anything unusual are re-scanned character by character
+        so that the same error is reported as by the hand-written lexer.
+        """
+        if body is not None and body.isprintable():
+            try:
+                processed_string = ESCAPE_PATTERN.sub(
+                    lambda escape: ESCAPE_CHARACTERS[escape.group(1)], body
+                )
+                if len(processed_string) <= MAX_STR_LEN:
+                    token.word = processed_string
+                    token.type = TokenType.STR
+                    return
+            except KeyError:
+                pass
+
+        self.__validate_string()
+
+    def __validate_string(self) -> None:
+        """Scans a string literal starting at the cursor and raises the first error found"""
+        processed_length = 0
+        index = self.__cursor + 1
+        while True:
+            char = self.__char_at(index)
+            if char == '"':
+                return
+
+            if char == EOF:
+                raise LexerError(
+                    "Unterminated string", self.line_number, self.col_number
+                )
+
+            if not char.isprintable():
+                raise LexerError(
+                    f"Non-printable ascii character with code: {ord(char)}",
+                    self.line_number,
+                    self.col_number,
+                )
+
+            if processed_length + 1 > MAX_STR_LEN:
+                raise LexerError("String too long", self.line_number, self.col_number)
+
+            if char == "\\":
+                index += 1
+                if self.__char_at(index) not in ESCAPE_CHARACTERS:
+                    raise LexerError(
+                        "Invalid escape character", self.line_number, self.col_number
+                    )
+            processed_length += 1
+            index += 1
+
+    def __char_at(self, index: int) -> str:
+        """Returns the buffered character at the given index, or EOF"""
+        if index < self.__source_length:
+            return self.__source[index]
+        return EOF
+
+    @property
+    def line_number(self) -> int:
+        """Returns the line number of the current token"""
+        return self.source_map.position(self.__token_offset).line_number
+
+    @property
+    def col_number(self) -> int:
+        """Returns the column number of the current token"""
+        return self.source_map.position(self.__token_offset).column_number
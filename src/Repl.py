@@ -60,7 +60,7 @@ class Repl:
             if not AST:  # Empty input
                 return
 
-            res = self.interpreter.interpret(AST)
+            res = self.interpreter.interpret(AST, self.parser.source_map)
             readline.add_history(line)
 
             if not res or res.label == "null":
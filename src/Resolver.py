@@ -0,0 +1,129 @@
+from typing import Iterable, Optional
+
+from src.core.ASTNodes import (
+    Node,
+    FuncDefNode,
+    LazyBodyNode,
+    BodyNode,
+    ForNode,
+    ArrayNode,
+    AssignmentNode,
+    PostfixExprNode,
+    CallNode,
+    FileNode,
+    LoadNode,
+    IdentifierNode,
+    children,
+    walk,
+)
+
+# Scope depths of resolved variables
+LOCAL_SCOPE = 0  # A slot of the local scope of the function
+GLOBAL_SCOPE = 1  # The global scope, where variables are looked up by name
+
+
+class Resolver:
+    """
+    Static pass run on the AST before it is interpreted, which resolves each variable
+    read or written by a node to its scope.
+
+    A function has a slot for each of its parameters and each variable it assigns.
+    Nodes of a function referring to these are annotated with their slot index,
+    the others refer to global variables, as do all nodes outside functions.
+    A variable read before its slot is assigned is still looked up in the global
+    scope at runtime, as the scope chain was walked before.
+    For loops whose body does not reassign their iterator are marked as counted loops.
+    """
+
+    def resolve(self, node: Node) -> None:
+        """
+        Resolves the variables of a program (or REPL input)
+        @param node: The root node
+        """
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, FuncDefNode):
+                params = (
+                    [param.value for param in node.args.children] if node.args else []
+                )
+                self.resolve_function(params, node.body)
+                continue
+
+            self.__annotate(node, None)
+            stack.extend(children(node))
+
+    def resolve_function(self, params: Iterable[str], body: Optional[Node]) -> None:
+        """
+        Assigns the slots of a function and resolves the variables of its body.
+        Bodies skimmed by a lazy parser are resolved once parsed.
+        @param params: The names of the parameters of the function
+        @param body: The body of the function
+        """
+        if isinstance(body, LazyBodyNode):
+            body = body.body
+        if not isinstance(body, BodyNode):
+            return
+
+        # Parameters take the first slots, in order
+        slots = dict.fromkeys(params)
+        for node in walk(body):
+            name = self.assigned_name(node)
+            if name is not None:
+                slots.setdefault(name)
+        body.slots = {name: index for index, name in enumerate(slots)}
+
+        for node in walk(body):
+            self.__annotate(node, body.slots)
+
+    @staticmethod
+    def assigned_name(node: Node) -> Optional[str]:
+        """Returns the name of the variable a node assigns, if any"""
+        if isinstance(node, AssignmentNode) and isinstance(node.left, IdentifierNode):
+            return node.left.value
+        if isinstance(node, ForNode) and isinstance(node.identifier, IdentifierNode):
+            return node.identifier.value
+        if node.label in ("array_def", "file_open"):
+            return node.identifier
+        return None
+
+    @classmethod
+    def reassigns(cls, body: Optional[Node], name: str) -> bool:
+        """Checks if a statement of a body assigns (or increments) a variable"""
+        if body is None:
+            return False
+        for node in walk(body):
+            if cls.assigned_name(node) == name:
+                return True
+            if isinstance(node, PostfixExprNode) and isinstance(
+                node.left, IdentifierNode
+            ):
+                if node.left.value == name:
+                    return True
+        return False
+
+    @staticmethod
+    def variable_name(node: Node) -> Optional[str]:
+        """Returns the name of the variable a node reads or writes, if any"""
+        if isinstance(node, (LoadNode, CallNode, ArrayNode, FileNode)):
+            return node.identifier
+        if isinstance(node, PostfixExprNode) and isinstance(node.left, IdentifierNode):
+            return node.left.value
+        return Resolver.assigned_name(node)
+
+    def __annotate(self, node: Node, slots: Optional[dict[str, int]]) -> None:
+        """
+        Annotates a node with the scope depth and slot index of its variable
+        @param slots: The slot indexes of the local variables, None outside functions
+        """
+        name = self.variable_name(node)
+        if name is None:
+            return
+        if isinstance(node, ForNode):
+            node.counted = not self.reassigns(node.body, name)
+
+        index = slots.get(name) if slots else None
+        if index is None:
+            node.depth, node.slot = GLOBAL_SCOPE, None
+        else:
+            node.depth, node.slot = LOCAL_SCOPE, index
@@ -0,0 +1,384 @@
+import sys
+from typing import Callable, Generator, Optional
+
+from src.Interpreter import Interpreter, DEFAULT_MEMO_SIZE
+from src.core.ASTNodes import (
+    Node,
+    ProgramNode,
+    BodyNode,
+    ReturnNode,
+    IfNode,
+    WhileNode,
+    ForNode,
+    ArrayNode,
+    AssignmentNode,
+    CallNode,
+    PrintNode,
+    ArgsNode,
+    FileNode,
+    CharReprNode,
+    IntReprNode,
+    LengthNode,
+    ExprNode,
+    FactorNode,
+    BinaryOpNode,
+    UnaryOpNode,
+)
+from src.core.Completion import Completion, BREAK, CONTINUE
+from src.core.RuntimeObject import RunTimeObject
+from src.utils.ErrorHandler import (
+    warning_msg,
+    InterpreterError,
+    ErrorType,
+)
+from src.utils.Logger import Logger, LogLevel
+
+# Maximum number of pending evaluation frames (heap allocated generators).
+# A recursive Nyaa function uses a few frames per call, one for the call itself
+# and one for each statement and expression it is evaluating at that moment.
+DEFAULT_FRAME_BUDGET = 200_000
+
+# A frame yields the child nodes it needs evaluated and is sent back their values
+Frame = Generator[Node, Optional[RunTimeObject], Optional[RunTimeObject]]
+
+
+class StackInterpreter(Interpreter):
+    """
+    Interprets the AST without recursing on the Python stack.
+
+    Every node with children is evaluated by a step generator (a frame),
+    which yields its children to the evaluation loop and receives their values.
+    Pending frames are kept on an explicit stack, so the depth of Nyaa programs
+    is only limited by the frame budget and not by the recursion limit of Python.
+    Leaf nodes are evaluated directly by the visit methods of the tree interpreter.
+    """
+
+    def __init__(
+        self,
+        verbose: bool = False,
+        frame_budget: int = DEFAULT_FRAME_BUDGET,
+        logger: Optional[Logger] = None,
+        memo_size: int = DEFAULT_MEMO_SIZE,
+    ):
+        """
+        @param verbose: Flag to enable logging (to the console, if no logger is given)
+        @param frame_budget: Maximum number of pending evaluation frames
+        @param logger: Logger of the interpreter subsystem
+        @param memo_size: Maximum number of results memoized per pure function
+        """
+        recursion_limit = sys.getrecursionlimit()
+        # Fused and quickened nodes are only run by the tree interpreter
+        super().__init__(
+            verbose=verbose,
+            logger=logger,
+            memo_size=memo_size,
+            fusion=False,
+            quickening=False,
+        )
+        sys.setrecursionlimit(recursion_limit)
+
+        self.frame_budget = frame_budget
+        self.__step_methods: dict[str, Callable[[Node], Frame]] = {
+            "program": self.step_program,
+            "body": self.step_body,
+            "return": self.step_return,
+            "if": self.step_if,
+            "while": self.step_while,
+            "for": self.step_for,
+            "array_def": self.step_array_def,
+            "array_access": self.step_array_access,
+            "array_update": self.step_array_update,
+            "assignment": self.step_assignment,
+            "call": self.step_call,
+            "print": self.step_print,
+            "args": self.step_args,
+            "file_open": self.step_file_open,
+            "file_write": self.step_file_write,
+            "file_read": self.step_file_read,
+            "char_repr": self.step_char_repr,
+            "int_repr": self.step_int_repr,
+            "length": self.step_length,
+            "binary_op": self.step_binary_op,
+            "unary_op": self.step_unary_op,
+            "expr": self.step_expr,
+            "simple_expr": self.step_simple_expr,
+            "term": self.step_simple_expr,
+            "factor": self.step_factor,
+        }
+
+    def evaluate(self, node: Node):
+        """
+        Evaluates a node (and its children) with an explicit stack of frames
+        and returns the result
+        @raise InterpreterError: If the frame budget is exceeded
+        """
+        self.resolver.resolve(node)
+        step_methods = self.__step_methods
+        dispatch_table = self.dispatch_table
+        logger = self.logger
+        trace = logger is not None and logger.enabled_for(LogLevel.TRACE)
+        frames: list[Frame] = []
+        value = None
+        while True:
+            # Evaluate the node, directly if it has no children to step through
+            step_method = step_methods.get(node.label)
+            if step_method:
+                if trace:
+                    logger.trace(warning_msg(f"Visiting {node.label}"))
+                if len(frames) >= self.frame_budget:
+                    raise InterpreterError(
+                        ErrorType.RECURSION,
+                        "Ara Ara!!!\nNon-kawaii recursion depth exceeded",
+                        node.start_pos,
+                        node.end_pos,
+                    )
+                frames.append(step_method(node))
+                value = None
+            else:
+                value = dispatch_table[node.label](node)
+
+            # Resume the innermost frame with the value, until one needs a node evaluated
+            while frames:
+                try:
+                    node = frames[-1].send(value)
+                    break
+                except StopIteration as stop:
+                    frames.pop()
+                    value = stop.value
+            else:
+                return value
+
+    def step_program(self, node: ProgramNode) -> Frame:
+        if node.eof:
+            return
+
+        for func in node.functions:
+            yield func
+
+        if node.body:
+            yield node.body
+
+    def step_body(self, node: BodyNode) -> Frame:
+        if not node.transfers:
+            for stmt in node.statements:
+                yield stmt
+            return None
+
+        for stmt in node.statements:
+            completion = yield stmt
+            if completion.__class__ is Completion:
+                return completion
+
+    def step_return(self, node: ReturnNode) -> Frame:
+        self.node_start_pos = node.start_pos
+        self.node_end_pos = node.end_pos
+        if node.tail_call:
+            call = node.expr
+            function_symbol = self.lookup_function(call)
+            function_args = (yield call.args) if call.args else None
+            return Completion("tail_call", (call, function_symbol, function_args))
+        return Completion("return", (yield node.expr) if node.expr else None)
+
+    def step_if(self, node: IfNode) -> Frame:
+        condition = yield node.expr
+        if condition.value:
+            return (yield node.body) if node.body else None
+
+        for else_if_stmt in node.else_if_statements:
+            condition = yield else_if_stmt.expr
+            if condition.value:
+                return (yield else_if_stmt.body) if else_if_stmt.body else None
+
+        if node.else_body:
+            return (yield node.else_body)
+
+    def step_while(self, node: WhileNode) -> Frame:
+        body = node.body
+        while (yield node.expr).value:
+            if body:
+                completion = yield body
+                if completion is BREAK:
+                    break
+                if completion is not None and completion is not CONTINUE:
+                    return completion
+
+    def step_for(self, node: ForNode) -> Frame:
+        range_start = self.handle_range_value(
+            node.range_start, (yield node.range_start)
+        )
+        range_end = self.handle_range_value(node.range_end, (yield node.range_end))
+
+        # Create iterator in symbol table
+        iterator_runtime_object = RunTimeObject(label="number", value=0)
+        self.assign_variable(node, node.identifier.value, iterator_runtime_object)
+
+        body = node.body
+        incrementer = 1 if range_start < range_end else -1
+        for i in range(range_start, range_end, incrementer):
+            iterator_runtime_object.value = i
+            if body:
+                completion = yield body
+                if completion is BREAK:
+                    break
+                if completion is not None and completion is not CONTINUE:
+                    return completion
+
+    def step_array_def(self, node: ArrayNode) -> Frame:
+        self.node_start_pos = node.start_pos
+        self.node_end_pos = node.end_pos
+
+        if node.size:
+            array_size = self._test_for_identifier((yield node.size)).value
+            values = [RunTimeObject(label="number", value=0)] * int(array_size)
+        elif node.initial_values:
+            values = []
+            for value in node.initial_values:
+                value = yield value
+                values.append(value.copy() if value.shared else value)
+        elif node.string_value:
+            string_value = yield node.string_value
+            values = [
+                RunTimeObject("string", value=char) for char in string_value.value
+            ]
+        else:
+            values = []
+
+        self.assign_variable(node, node.identifier, RunTimeObject("array", values))
+
+    def step_array_access(self, node: ArrayNode) -> Frame:
+        if not node.index:
+            raise InterpreterError(
+                ErrorType.RUNTIME,
+                "No array index provided...",
+                node.start_pos,
+                node.end_pos,
+            )
+
+        return self.handle_array_access(node, (yield node.index))
+
+    def step_array_update(self, node: ArrayNode) -> Frame:
+        self.check_array_update(node)
+        index_object = yield node.index
+        self.handle_array_update(node, index_object, (yield node.value))
+
+    def step_assignment(self, node: AssignmentNode) -> Frame:
+        self.handle_assignment(node, (yield node.right))
+
+    def step_call(self, node: CallNode) -> Frame:
+        function_symbol = self.lookup_function(node)
+        function_args = (yield node.args) if node.args else None
+        local_env = self.bind_arguments(node, function_symbol, function_args)
+
+        old_env = self.current_env
+        memoized = []  # Memo keys of the calls returning the result
+        while True:
+            body = self.function_body(function_symbol)
+            self.current_env = local_env
+
+            # Return the result of a previous call of a pure function, else walk through its body
+            memo_key = self.memo_key(function_symbol, function_args)
+            if memo_key is not None:
+                result = function_symbol.memo.get(memo_key)
+                if result is not None:
+                    break
+                memoized.append((function_symbol, memo_key))
+
+            # Break and continue statements outside loops end the function as well
+            completion = yield body
+            if completion is None or completion.kind != "tail_call":
+                result = completion.value if completion is not None else None
+                break
+
+            # The call returned by the function runs in this frame
+            node, function_symbol, function_args, local_env = self.bind_tail_call(
+                completion, function_symbol
+            )
+
+        for function_symbol, memo_key in memoized:
+            function_symbol.memo.put(memo_key, result)
+        self.current_env = old_env
+        return result
+
+    def step_print(self, node: PrintNode) -> Frame:
+        self.handle_print(node, (yield node.args))
+
+    def step_args(self, node: ArgsNode) -> Frame:
+        args = []
+        for arg_node in node.children:
+            args.append((yield arg_node))
+        return args
+
+    def step_file_open(self, node: FileNode) -> Frame:
+        self.check_file_open(node)
+        filepath_object = yield node.filepath
+        self.handle_file_open(node, filepath_object, (yield node.access_mode))
+
+    def step_file_write(self, node: FileNode) -> Frame:
+        self.check_file_write(node)
+        file = self.lookup_file(node)
+        self.handle_file_write(node, file, (yield node.write_buffer))
+
+    def step_file_read(self, node: FileNode) -> Frame:
+        self.check_file_identifier(node)
+        file = self.lookup_file(node)
+        n_chars_object = None
+        if node.n_chars_to_read:
+            n_chars_object = yield node.n_chars_to_read
+        return self.handle_file_read(node, file, n_chars_object)
+
+    def step_char_repr(self, node: CharReprNode) -> Frame:
+        return self.handle_char_repr(node, (yield node.expr))
+
+    def step_int_repr(self, node: IntReprNode) -> Frame:
+        return self.handle_int_repr(node, (yield node.expr))
+
+    def step_length(self, node: LengthNode) -> Frame:
+        return self.handle_length(node, (yield node.expr))
+
+    def step_binary_op(self, node: BinaryOpNode) -> Frame:
+        left = yield node.left
+        return self.handle_binary_op(node, left, (yield node.right))
+
+    def step_unary_op(self, node: UnaryOpNode) -> Frame:
+        return self.handle_unary_op(node, (yield node.operand))
+
+    def step_expr(self, node: ExprNode) -> Frame:
+        self.node_start_pos = node.start_pos
+        self.node_end_pos = node.end_pos
+        return (yield from self.step_simple_expr(node))
+
+    def step_simple_expr(self, node: ExprNode) -> Frame:
+        if not node.left:
+            error = f"Expected a left-side expression, got {node.left}"
+            raise InterpreterError(
+                ErrorType.RUNTIME, error, node.start_pos, node.end_pos
+            )
+
+        left = self._test_for_identifier((yield node.left))
+        if not node.operator:
+            return left
+
+        if not node.right:
+            error = f"Expected a right-side expression, got {node.left}"
+            raise InterpreterError(
+                ErrorType.RUNTIME, error, node.start_pos, node.end_pos
+            )
+
+        right = self._test_for_identifier((yield node.right))
+        return self.handle_operation(node, left, right)
+
+    def step_factor(self, node: FactorNode) -> Frame:
+        if not node.left:
+            raise InterpreterError(
+                ErrorType.RUNTIME,
+                f"Expecting a left-side expression, got {node.left}",
+                node.start_pos,
+                node.end_pos,
+            )
+
+        left_factor = self._test_for_identifier((yield node.left))
+        if not node.right:
+            return left_factor
+
+        right_factor = self._test_for_identifier((yield node.right))
+        return self.handle_factor(left_factor, right_factor)
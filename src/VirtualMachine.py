@@ -0,0 +1,377 @@
+from typing import Optional
+
+from src.BytecodeCompiler import BytecodeCompiler
+from src.Interpreter import Interpreter, OPERATIONS, DEFAULT_MEMO_SIZE
+from src.core.ASTNodes import Node
+from src.core.Bytecode import OpCode, CodeObject, BINARY_OPERATORS
+from src.core.RuntimeObject import RunTimeObject
+from src.core.Symbol import VarSymbol, FunctionSymbol
+from src.utils.Logger import Logger, LogLevel
+
+
+class VirtualMachine(Interpreter):
+    """
+    Runs programs compiled to bytecode, on a stack machine.
+
+    The machine executes the instructions of a code object in a dispatch loop,
+    with a value stack per frame. Calls to Nyaa functions push a frame
+    (the code, instruction pointer and value stack of the caller) instead of
+    recursing on the Python stack.
+
+    Variables live in the environments of the tree interpreter and errors are reported
+    by its handlers. Operation errors are located with the line table of the code.
+    """
+
+    def __init__(
+        self,
+        verbose: bool = False,
+        logger: Optional[Logger] = None,
+        memo_size: int = DEFAULT_MEMO_SIZE,
+    ):
+        """
+        @param verbose: Flag to enable logging (to the console, if no logger is given)
+        @param logger: Logger of the interpreter subsystem
+        @param memo_size: Maximum number of results memoized per pure function
+        """
+        # Fused and quickened nodes are only run by the tree interpreter
+        super().__init__(
+            verbose=verbose,
+            logger=logger,
+            memo_size=memo_size,
+            fusion=False,
+            quickening=False,
+        )
+
+        # Traced programs are walked by the tree interpreter, which logs every node visited
+        self.__trace = self.logger is not None and self.logger.enabled_for(
+            LogLevel.TRACE
+        )
+
+        self.compiler = BytecodeCompiler()
+        # Code of the lazily parsed function bodies, indexed by their body node
+        self.__function_codes: dict[Node, CodeObject] = {}
+
+        # Handlers and direct operations of the operators of BINARY_OP instructions
+        self.__binary_op_handlers = [
+            self.binary_op_handler(op) for op in BINARY_OPERATORS
+        ]
+        self.__operations = [
+            {
+                label: OPERATIONS[(label, op)]
+                for label in ("number", "string")
+                if (label, op) in OPERATIONS
+            }
+            for op in BINARY_OPERATORS
+        ]
+
+    def evaluate(self, node: Node | CodeObject):
+        """Compiles a node (unless given compiled code) and runs it, returning the result"""
+        if isinstance(node, CodeObject):
+            return self.run(node)
+        if self.__trace:
+            return super().evaluate(node)
+        return self.run(self.compiler.compile_module(node))
+
+    def function_code(self, function_symbol: FunctionSymbol) -> CodeObject:
+        """Returns the code of a function, compiling lazily parsed bodies on the first call"""
+        body = function_symbol.body
+        if isinstance(body, CodeObject):
+            return body
+
+        code = self.__function_codes.get(body)
+        if code is None:
+            code = self.compiler.compile_function(
+                function_symbol.name,
+                function_symbol.params,
+                self.function_body(function_symbol),
+            )
+            self.__function_codes[body] = code
+        return code
+
+    def function_callees(self, function_symbol: FunctionSymbol) -> Optional[frozenset]:
+        body = function_symbol.body
+        code = body if isinstance(body, CodeObject) else self.__function_codes.get(body)
+        return code.callees if code else None
+
+    def run(self, code: CodeObject):
+        """
+        Executes code until it returns
+        @return: The value returned by the code
+        """
+        LOAD_CONST = OpCode.LOAD_CONST.value
+        LOAD_NONE = OpCode.LOAD_NONE.value
+        LOAD_NAME = OpCode.LOAD_NAME.value
+        STORE_NAME = OpCode.STORE_NAME.value
+        INCREMENT_NAME = OpCode.INCREMENT_NAME.value
+        DECREMENT_NAME = OpCode.DECREMENT_NAME.value
+        RESOLVE_IDENTIFIER = OpCode.RESOLVE_IDENTIFIER.value
+        POP_TOP = OpCode.POP_TOP.value
+        BUILD_LIST = OpCode.BUILD_LIST.value
+        BINARY_OP = OpCode.BINARY_OP.value
+        UNARY_OP = OpCode.UNARY_OP.value
+        NESTED_OP = OpCode.NESTED_OP.value
+        FACTOR_OP = OpCode.FACTOR_OP.value
+        JUMP = OpCode.JUMP.value
+        POP_JUMP_IF_FALSE = OpCode.POP_JUMP_IF_FALSE.value
+        RANGE_VALUE = OpCode.RANGE_VALUE.value
+        FOR_SETUP = OpCode.FOR_SETUP.value
+        FOR_ITER = OpCode.FOR_ITER.value
+        SET_POSITION = OpCode.SET_POSITION.value
+        MAKE_FUNCTION = OpCode.MAKE_FUNCTION.value
+        CALL_SETUP = OpCode.CALL_SETUP.value
+        CALL = OpCode.CALL.value
+        RETURN_FRAME = OpCode.RETURN_FRAME.value
+        RETURN_VALUE = OpCode.RETURN_VALUE.value
+        TAIL_CALL = OpCode.TAIL_CALL.value
+        ARRAY_OF_SIZE = OpCode.ARRAY_OF_SIZE.value
+        ARRAY_OF_STRING = OpCode.ARRAY_OF_STRING.value
+        STORE_ARRAY = OpCode.STORE_ARRAY.value
+        ARRAY_LOAD = OpCode.ARRAY_LOAD.value
+        ARRAY_STORE = OpCode.ARRAY_STORE.value
+        PRINT = OpCode.PRINT.value
+        FILE_OPEN = OpCode.FILE_OPEN.value
+        FILE_LOOKUP = OpCode.FILE_LOOKUP.value
+        FILE_WRITE = OpCode.FILE_WRITE.value
+        FILE_READ = OpCode.FILE_READ.value
+        CHAR_REPR = OpCode.CHAR_REPR.value
+        INT_REPR = OpCode.INT_REPR.value
+        LENGTH = OpCode.LENGTH.value
+        EVAL_NODE = OpCode.EVAL_NODE.value
+
+        binary_op_handlers = self.__binary_op_handlers
+        operations = self.__operations
+
+        # Frames of the callers: their code, instruction pointer and value stack,
+        # the environment to restore, the function called and the functions
+        # and keys to memoize the result with
+        frames = []
+        instructions, consts, names, sites = (
+            code.instructions,
+            code.consts,
+            code.names,
+            code.sites,
+        )
+        stack = []
+        pc = 0
+        while True:
+            op = instructions[pc]
+            arg = instructions[pc + 1]
+            pc += 2
+
+            if op == LOAD_NAME:
+                stack.append(self.current_env.lookup_symbol(names[arg]))
+            elif op == LOAD_CONST:
+                stack.append(consts[arg])
+            elif op == BINARY_OP:
+                right = stack.pop()
+                left = stack[-1]
+                if left.label == right.label and (
+                    operation := operations[arg].get(left.label)
+                ):
+                    function, label = operation
+                    stack[-1] = RunTimeObject(label, function(left.value, right.value))
+                else:
+                    position = code.line_table.position(pc - 2)
+                    self.node_start_pos, self.node_end_pos = position
+                    stack[-1] = binary_op_handlers[arg](
+                        left, right, BINARY_OPERATORS[arg]
+                    )
+            elif op == POP_JUMP_IF_FALSE:
+                if not stack.pop().value:
+                    pc = arg
+            elif op == STORE_NAME:
+                rhs = stack.pop()
+                if rhs.label not in "function":
+                    rhs = RunTimeObject(rhs.label, rhs.value)
+                self.current_env.insert_symbol(names[arg], VarSymbol(names[arg], rhs))
+            elif op == JUMP:
+                pc = arg
+            elif op == ARRAY_LOAD:
+                stack[-1] = self.handle_array_access(sites[arg], stack[-1])
+            elif op == ARRAY_STORE:
+                value = stack.pop()
+                self.handle_array_update(sites[arg], stack.pop(), value)
+            elif op == INCREMENT_NAME or op == DECREMENT_NAME:
+                runtime_object = self.current_env.lookup_symbol(names[arg])
+                runtime_object.value += 1 if op == INCREMENT_NAME else -1
+                stack.append(RunTimeObject("number", runtime_object.value))
+            elif op == POP_TOP:
+                stack.pop()
+            elif op == SET_POSITION:
+                self.node_start_pos = sites[arg].start_pos
+                self.node_end_pos = sites[arg].end_pos
+            elif op == FOR_ITER:
+                i = next(stack[-2], None)
+                if i is None:
+                    del stack[-2:]
+                    pc = arg
+                else:
+                    stack[-1].value = i
+            elif op == CALL_SETUP:
+                self.check_for_stack_overflow(sites[arg])
+                stack.append(self.lookup_function(sites[arg]))
+            elif op == CALL:
+                function_args = stack.pop()
+                function_symbol = stack.pop()
+                local_env = self.bind_arguments(
+                    sites[arg], function_symbol, function_args
+                )
+                function_code = self.function_code(function_symbol)
+
+                # Push the result of a previous call of a pure function, else run its body
+                memo_key = self.memo_key(function_symbol, function_args)
+                memoized = None
+                if memo_key is not None:
+                    result = function_symbol.memo.get(memo_key)
+                    if result is not None:
+                        self.release_stack_frame()
+                        stack.append(result)
+                        continue
+                    memoized = [(function_symbol, memo_key)]
+
+                frames.append(
+                    (code, pc, stack, self.current_env, function_symbol, memoized)
+                )
+                self.current_env = local_env
+                code = function_code
+                instructions, consts, names, sites = (
+                    code.instructions,
+                    code.consts,
+                    code.names,
+                    code.sites,
+                )
+                stack = []
+                pc = 0
+            elif op == RETURN_FRAME:
+                result = stack.pop()
+                code, pc, stack, self.current_env, _, memoized = frames.pop()
+                instructions, consts, names, sites = (
+                    code.instructions,
+                    code.consts,
+                    code.names,
+                    code.sites,
+                )
+                if memoized:
+                    for function_symbol, memo_key in memoized:
+                        function_symbol.memo.put(memo_key, result)
+                self.release_stack_frame()
+                stack.append(result)
+            elif op == TAIL_CALL:
+                # The call returned by the function replaces its frame (see visit_call),
+                # which made the call of CALL_SETUP
+                self.release_stack_frame()
+                function_args = stack.pop()
+                callee = stack.pop()
+                caller = frames[-1][:4]
+                function_symbol, memoized = frames[-1][4:]
+                local_env = self.bind_arguments(
+                    sites[arg],
+                    callee,
+                    function_args,
+                    self.current_env if callee is function_symbol else None,
+                )
+                function_code = self.function_code(callee)
+
+                # Return the result of a previous call of a pure function
+                memo_key = self.memo_key(callee, function_args)
+                if memo_key is not None:
+                    result = callee.memo.get(memo_key)
+                    if result is not None:
+                        stack.append(result)
+                        continue
+                    if memoized is None:
+                        memoized = []
+                    memoized.append((callee, memo_key))
+
+                frames[-1] = caller + (callee, memoized)
+                self.current_env = local_env
+                code = function_code
+                instructions, consts, names, sites = (
+                    code.instructions,
+                    code.consts,
+                    code.names,
+                    code.sites,
+                )
+                stack = []
+                pc = 0
+            elif op == BUILD_LIST:
+                if arg:
+                    values = stack[-arg:]
+                    del stack[-arg:]
+                else:
+                    values = []
+                stack.append(values)
+            elif op == LOAD_NONE:
+                stack.append(None)
+            elif op == PRINT:
+                self.handle_print(sites[arg], stack.pop())
+            elif op == RANGE_VALUE:
+                stack[-1] = self.handle_range_value(sites[arg], stack[-1])
+            elif op == FOR_SETUP:
+                range_end = stack.pop()
+                range_start = stack.pop()
+
+                # Create iterator in symbol table
+                iterator_runtime_object = RunTimeObject(label="number", value=0)
+                self.current_env.insert_symbol(
+                    names[arg], VarSymbol(names[arg], iterator_runtime_object)
+                )
+                incrementer = 1 if range_start < range_end else -1
+                stack.append(iter(range(range_start, range_end, incrementer)))
+                stack.append(iterator_runtime_object)
+            elif op == UNARY_OP:
+                stack[-1] = self.handle_unary_op(sites[arg], stack[-1])
+            elif op == RESOLVE_IDENTIFIER:
+                stack[-1] = self._test_for_identifier(stack[-1])
+            elif op == NESTED_OP:
+                right = stack.pop()
+                stack[-1] = self.handle_operation(sites[arg], stack[-1], right)
+            elif op == FACTOR_OP:
+                right = stack.pop()
+                stack[-1] = self.handle_factor(stack[-1], right)
+            elif op == ARRAY_OF_SIZE:
+                array_size = self._test_for_identifier(stack[-1]).value
+                stack[-1] = [RunTimeObject(label="number", value=0)] * int(array_size)
+            elif op == ARRAY_OF_STRING:
+                stack[-1] = [
+                    RunTimeObject("string", value=char) for char in stack[-1].value
+                ]
+            elif op == STORE_ARRAY:
+                values = [
+                    value.copy() if value.shared else value for value in stack.pop()
+                ]
+                array_object = RunTimeObject("array", values)
+                self.current_env.insert_symbol(
+                    names[arg], VarSymbol(names[arg], array_object)
+                )
+            elif op == MAKE_FUNCTION:
+                name, params, body = consts[arg]
+                function_obj = RunTimeObject(
+                    "function", value=FunctionSymbol(name, dict(params), body)
+                )
+                self.current_env.insert_symbol(name, VarSymbol(name, function_obj))
+            elif op == FILE_OPEN:
+                access_mode_object = stack.pop()
+                filepath_object = stack.pop()
+                self.handle_file_open(sites[arg], filepath_object, access_mode_object)
+            elif op == FILE_LOOKUP:
+                stack.append(self.lookup_file(sites[arg]))
+            elif op == FILE_WRITE:
+                write_buffer = stack.pop()
+                self.handle_file_write(sites[arg], stack.pop(), write_buffer)
+            elif op == FILE_READ:
+                n_chars_object = stack.pop()
+                stack[-1] = self.handle_file_read(sites[arg], stack[-1], n_chars_object)
+            elif op == CHAR_REPR:
+                stack[-1] = self.handle_char_repr(sites[arg], stack[-1])
+            elif op == INT_REPR:
+                stack[-1] = self.handle_int_repr(sites[arg], stack[-1])
+            elif op == LENGTH:
+                stack[-1] = self.handle_length(sites[arg], stack[-1])
+            elif op == EVAL_NODE:
+                node = code.nodes[arg]
+                stack.append(self.dispatch_table[node.label](node))
+            elif op == RETURN_VALUE:
+                return stack.pop()
+            else:
+                raise NotImplementedError(f"No implementation of opcode {op}")
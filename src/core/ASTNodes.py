@@ -1,33 +1,43 @@
 import json
-from typing import Optional
+from typing import Iterator, Optional
 
-from src.core.CacheMemory import cache_mem
-from src.core.Token import Token, Position
+from src.core.RuntimeObject import SharedRunTimeObject, HAI, IIE
+from src.core.Token import Token
 
 
 class Node:
+    # Source offsets of the node, resolved to line and column numbers only when reporting errors
+    start_pos: Optional[int] = None
+    end_pos: Optional[int] = None
+    # Scope depth and slot index of the variable the node reads or writes,
+    # set by the resolver (None if the node was not resolved)
+    depth: Optional[int] = None
+    slot: Optional[int] = None
+    # Inline cache of the global variable the node looks up (the function, for calls),
+    # valid while the global scope is at the version it was looked up in
+    cache_version: Optional[int] = None
+    cached_value = None
+
     def __init__(self, node_label: str):
         self.label = node_label
-        self.start_pos: Position = Position(line=-1, col=-1)
-        self.end_pos: Position = Position(line=-1, col=-1)
 
     def accept(self, visitor):
-        if cached_visit := cache_mem.get(self):
-            return cached_visit(self)
-        return visitor.visit(self)
+        return visitor.dispatch_table[self.label](self)
 
     @staticmethod
     def to_serializable(value):
         if isinstance(value, Node):
             return value.to_json
-        elif isinstance(value, Position):
-            return value.line_number, value.column_number
         elif isinstance(value, bool):
             return str(value)
         elif isinstance(value, list):
             return [item.to_json for item in value]
         elif isinstance(value, dict):
-            return {key: value.to_json for key, value in value.items() if value}
+            return {
+                key: Node.to_serializable(item)
+                for key, item in value.items()
+                if item is not None
+            }
         return str(value)
 
     @property
@@ -35,7 +45,8 @@ class Node:
         return {
             k: self.to_serializable(v)
             for k, v in self.__dict__.items()
-            if v is not None
+            # Shared constants are built for the interpreter, they are not part of the AST
+            if v is not None and not isinstance(v, SharedRunTimeObject)
         }
 
     def encode_json(self) -> str:
@@ -75,13 +86,46 @@ class FuncDefNode(Node):
         self.body = body
 
 
+class LazyBodyNode(Node):
+    """
+    Function body skimmed by a lazy parser, it is only parsed when the function is first called
+    """
+
+    def __init__(self, source: str, offset: int, source_map, parser_options: dict):
+        """
+        @param source: The source of the body, braces included
+        @param offset: The source offset of the opening brace
+        @param source_map: The source map of the program, to report errors with
+        @param parser_options: The keyword arguments of the parser to parse the body with
+        """
+        super().__init__("lazy_body")
+        self.source = source
+        self.offset = offset
+        self.source_map = source_map
+        self.parser_options = parser_options
+        self.body: Optional[BodyNode] = None
+
+    @property
+    def to_json(self) -> dict:
+        if self.body:
+            return self.body.to_json
+        return {"label": self.label, "source": self.source}
+
+
 class BodyNode(Node):
     def __init__(self):
         super().__init__("body")
         self.statements = []
+        # Slot indexes of the local variables of a function body, set by the resolver
+        self.slots: Optional[dict[str, int]] = None
+        # Whether a statement of the body may transfer control (break, continue or return),
+        # the statements of other bodies always run to the end
+        self.transfers = False
 
     def append(self, statement: Node):
         self.statements.append(statement)
+        if transfers_control(statement):
+            self.transfers = True
 
 
 class BreakNode(Node):
@@ -95,6 +139,10 @@ class ContinueNode(Node):
 
 
 class ReturnNode(Node):
+    # Whether a function returns the result of a call (set by the parser),
+    # the call then runs in the frame of the function instead of a new one
+    tail_call = False
+
     def __init__(self):
         super().__init__("return")
         self.expr = None
@@ -118,6 +166,10 @@ class WhileNode(ConditionalNode):
 
 
 class ForNode(Node):
+    # Whether the body leaves the iterator to the loop (set by the resolver),
+    # the loop then runs the statements of its body directly
+    counted = False
+
     def __init__(self, identifier, range_start, range_end, body):
         super().__init__("for")
         self.identifier = identifier
@@ -251,6 +303,50 @@ class FactorNode(ExprNode):
         self.right = right
 
 
+class BinaryOpNode(Node):
+    """Flat binary operation, emitted by the precedence-climbing expression parser"""
+
+    # Executions of the operation counted by the interpreter, which quickens it (changes its
+    # label) into a variant specialised for the labels of its operands once it is warm:
+    # the labels of the operands, the function applying it and the label of its result
+    executions = 0
+    quickened: Optional[tuple] = None
+
+    def __init__(self, left: Node, operator: str, right: Node):
+        super().__init__("binary_op")
+        self.left = left
+        self.operator = operator
+        self.right = right
+
+
+class UnaryOpNode(Node):
+    """Flat unary operation (not, -), emitted by the precedence-climbing expression parser"""
+
+    def __init__(self, operator: str, operand: Node):
+        super().__init__("unary_op")
+        self.operator = operator
+        self.operand = operand
+
+
+class LiteralNode(Node):
+    """Number, string or boolean constant, emitted by the precedence-climbing expression parser"""
+
+    def __init__(self, kind: str, value):
+        super().__init__("literal")
+        self.kind = kind
+        self.value = value
+        # The runtime object of the constant, shared by all its evaluations
+        self.constant = shared_constant(kind, value)
+
+
+class LoadNode(Node):
+    """Variable read, emitted by the precedence-climbing expression parser"""
+
+    def __init__(self, identifier: str):
+        super().__init__("load")
+        self.identifier = identifier
+
+
 class LengthNode(ExprNode):
     def __init__(self, expr):
         super().__init__("length")
@@ -310,21 +406,129 @@ class NumericLiteralNode(ExprNode):
 
         self.type = token.type
         self.value = token.number
+        self.constant = shared_constant("number", self.value)
 
 
 class StringLiteralNode(ExprNode):
     def __init__(self, token):
         super().__init__("string_literal")
         self.value = token.word
+        self.constant = shared_constant("string", self.value)
 
 
 class BooleanNode(ExprNode):
     def __init__(self, boolean_value):
         super().__init__("boolean_literal")
         self.value = boolean_value
+        self.constant = shared_constant("boolean", self.value)
 
 
 class OperatorNode(Node):
     def __init__(self, value):
         super().__init__("operator")
         self.value = value
+
+
+class FusedNode(Node):
+    """
+    Statement of a common shape rewritten by the fuser into a single node (a superinstruction),
+    which the tree interpreter runs with one visit instead of one for each node of the shape.
+    The statement replaced is its only child, so passes walking the AST still see its shape,
+    the operands it evaluates are held in a tuple.
+    """
+
+    def __init__(self, label: str, statement: Node, operands: tuple = ()):
+        super().__init__(label)
+        self.statement = statement
+        self.operands = operands
+        self.start_pos = statement.start_pos
+        self.end_pos = statement.end_pos
+        self.depth = statement.depth
+        self.slot = statement.slot
+
+
+class IncrementNode(FusedNode):
+    """Fused x++ or x-- statement"""
+
+    def __init__(self, statement: PostfixExprNode):
+        super().__init__("increment", statement)
+        self.identifier = statement.left.value
+        self.step = 1 if statement.operator == "++" else -1
+
+
+class AddConstantNode(FusedNode):
+    """Fused assignment of an operand plus (or minus) a number, e.g. x = x + 1"""
+
+    def __init__(self, statement: AssignmentNode):
+        operation = statement.right
+        super().__init__("add_constant", statement, (operation.left, operation))
+        self.identifier = statement.left.value
+        constant = operation.right.constant.value
+        self.offset = constant if operation.operator == "+" else -constant
+
+
+class ArrayStoreNode(FusedNode):
+    """Fused store to an array element, e.g. a[i] = x"""
+
+    def __init__(self, statement: ArrayNode):
+        super().__init__("array_store", statement, (statement.index, statement.value))
+        self.identifier = statement.identifier
+
+
+class CompareWhileNode(FusedNode):
+    """Fused while loop whose condition compares two operands, e.g. daijoubu (i < n)"""
+
+    def __init__(self, statement: WhileNode):
+        condition = statement.expr
+        operands = (condition.left, condition.right, condition, statement.body)
+        super().__init__("compare_while", statement, operands)
+
+
+def shared_constant(label: str, value) -> SharedRunTimeObject:
+    """Returns the runtime object of a literal, built once when the literal is parsed"""
+    if label == "boolean":
+        return HAI if value else IIE
+    return SharedRunTimeObject(label, value)
+
+
+def transfers_control(statement: Node) -> bool:
+    """
+    Checks if a statement may transfer control out of the body it is in:
+    a break, continue or return statement, or a statement with a body which may.
+    Loops only pass returns on, they are assumed to pass on any transfer of their body.
+    """
+    if statement.label in ("break", "continue", "return"):
+        return True
+    if isinstance(statement, IfNode):
+        bodies = [statement.body, statement.else_body]
+        bodies += [else_if_stmt.body for else_if_stmt in statement.else_if_statements]
+    elif isinstance(statement, (WhileNode, ForNode)):
+        bodies = [statement.body]
+    else:
+        return False
+    return any(isinstance(body, BodyNode) and body.transfers for body in bodies)
+
+
+def mark_tail_calls(body: Node) -> None:
+    """Marks the return statements of a function body returning the result of a call"""
+    for node in walk(body):
+        if isinstance(node, ReturnNode) and isinstance(node.expr, CallNode):
+            node.tail_call = True
+
+
+def children(node: Node) -> Iterator[Node]:
+    """Yields the child nodes of a node"""
+    for value in vars(node).values():
+        if isinstance(value, Node):
+            yield value
+        elif isinstance(value, list):
+            yield from (child for child in value if isinstance(child, Node))
+
+
+def walk(node: Node) -> Iterator[Node]:
+    """Yields a node and all its descendants"""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(children(node))
@@ -0,0 +1,239 @@
+from bisect import bisect_right
+from enum import IntEnum
+from typing import Any, Optional
+
+from src.core.ASTNodes import Node
+from src.core.Token import SourceMap
+
+
+class OpCode(IntEnum):
+    """
+    Instructions of the Nyaa virtual machine.
+    Every instruction is two words, the opcode and its argument (0 if unused).
+    """
+
+    # Values
+    LOAD_CONST = 1  # Push a new runtime object of the constant (label, value)
+    LOAD_NONE = 2  # Push None (e.g. a call without arguments)
+    LOAD_NAME = 3  # Push the runtime object of a variable
+    STORE_NAME = 4  # Pop a value and assign (a copy of) it to a variable
+    INCREMENT_NAME = 5  # Postfix ++ on a variable, push the result
+    DECREMENT_NAME = 6  # Postfix -- on a variable, push the result
+    RESOLVE_IDENTIFIER = 7  # Replace an identifier on the stack with its value
+    POP_TOP = 8
+    BUILD_LIST = 9  # Pop arg values into a list
+
+    # Operations
+    BINARY_OP = 10  # Arg indexes BINARY_OPERATORS
+    UNARY_OP = 11
+    NESTED_OP = 12  # Operation of a nested (non-flat) expression node
+    FACTOR_OP = 13  # Unary operation of a nested factor node
+
+    # Control flow, the argument of jumps is the target instruction
+    JUMP = 20
+    POP_JUMP_IF_FALSE = 21
+    RANGE_VALUE = 22  # Check a for range value is an integer
+    FOR_SETUP = 23  # Pop a range, push its iterator and the loop variable
+    FOR_ITER = 24  # Advance the loop variable, or pop them both and leave the loop
+    SET_POSITION = 25  # Set the position reported by operation errors
+
+    # Functions
+    MAKE_FUNCTION = 40
+    CALL_SETUP = 41  # Check the call depth, push the function called
+    CALL = 42  # Pop the arguments and function, call it (or push its memoized result)
+    RETURN_FRAME = 43  # Pop the return value and return from a function to its caller
+    RETURN_VALUE = 44  # Stop the machine with the value on top of the stack
+    TAIL_CALL = 45  # CALL returning its result, replacing the frame of the function
+
+    # Arrays
+    ARRAY_OF_SIZE = 50
+    ARRAY_OF_STRING = 51
+    STORE_ARRAY = 52
+    ARRAY_LOAD = 53
+    ARRAY_STORE = 54
+
+    # Built-ins
+    PRINT = 60
+    FILE_OPEN = 61
+    FILE_LOOKUP = 62
+    FILE_WRITE = 63
+    FILE_READ = 64
+    CHAR_REPR = 65
+    INT_REPR = 66
+    LENGTH = 67
+
+    # Nodes interpreted by their visit method (input, file read line and close)
+    EVAL_NODE = 70
+
+
+# Operators of BINARY_OP instructions
+BINARY_OPERATORS = ("+", "-", "*", "/", "%", "and", "or")
+BINARY_OPERATORS += ("==", "!=", "<", ">", "<=", ">=")
+
+JUMP_OPCODES = {
+    OpCode.JUMP,
+    OpCode.POP_JUMP_IF_FALSE,
+    OpCode.FOR_ITER,
+}
+NAME_OPCODES = {
+    OpCode.LOAD_NAME,
+    OpCode.STORE_NAME,
+    OpCode.INCREMENT_NAME,
+    OpCode.DECREMENT_NAME,
+    OpCode.FOR_SETUP,
+    OpCode.STORE_ARRAY,
+}
+SITE_OPCODES = {
+    OpCode.UNARY_OP,
+    OpCode.NESTED_OP,
+    OpCode.RANGE_VALUE,
+    OpCode.SET_POSITION,
+    OpCode.CALL_SETUP,
+    OpCode.CALL,
+    OpCode.TAIL_CALL,
+    OpCode.ARRAY_LOAD,
+    OpCode.ARRAY_STORE,
+    OpCode.PRINT,
+    OpCode.FILE_OPEN,
+    OpCode.FILE_LOOKUP,
+    OpCode.FILE_WRITE,
+    OpCode.FILE_READ,
+    OpCode.CHAR_REPR,
+    OpCode.INT_REPR,
+    OpCode.LENGTH,
+}
+
+
+class Site:
+    """
+    The part of a node an instruction needs at runtime: its source position and the
+    attributes read by the interpreter when it executes the node or reports its errors.
+    Instructions reference sites rather than nodes, so code objects hold no AST.
+    """
+
+    # Sites are not resolved, their variables are looked up in the scope chain
+    depth = slot = None
+
+    def __init__(self, node: Node, **attributes):
+        """
+        @param node: The node the instruction was compiled from
+        @param attributes: The attributes of the node the instruction reads
+        """
+        self.label = node.label
+        self.start_pos = node.start_pos
+        self.end_pos = node.end_pos
+        self.__dict__.update(attributes)
+
+    def __repr__(self) -> str:
+        """Returns a description of the site (used by the disassembler)"""
+        for attribute in ("identifier", "operator"):
+            if value := self.__dict__.get(attribute):
+                return f"{self.label} {value}"
+        return self.label
+
+
+class LineTable:
+    """
+    Maps instructions to the source positions of the nodes they were compiled from.
+    Only the instructions at which the position changes are stored,
+    the position of an instruction is found with a binary search.
+    """
+
+    def __init__(self):
+        self.__instructions: list[int] = []
+        self.__positions: list[tuple[Optional[int], Optional[int]]] = []
+
+    def add(self, pc: int, start_pos: Optional[int], end_pos: Optional[int]) -> None:
+        """
+        Records the position of the instruction at pc (and the ones following it)
+        @param pc: The index of the instruction
+        @param start_pos: The source offset the node starts at
+        @param end_pos: The source offset the node ends at
+        """
+        if self.__positions and self.__positions[-1] == (start_pos, end_pos):
+            return
+        self.__instructions.append(pc)
+        self.__positions.append((start_pos, end_pos))
+
+    def position(self, pc: int) -> tuple[Optional[int], Optional[int]]:
+        """Returns the source offsets of the node the instruction at pc was compiled from"""
+        index = bisect_right(self.__instructions, pc) - 1
+        if index < 0:
+            return None, None
+        return self.__positions[index]
+
+
+class CodeObject:
+    """Bytecode of the main program, or of the body of a function"""
+
+    def __init__(self, name: str):
+        """
+        @param name: The name of the function, <main> for the program
+        """
+        self.name = name
+        self.instructions: list[int] = []  # Opcode and argument pairs
+        self.consts: list[Any] = []
+        self.names: list[str] = []
+        self.sites: list[Site] = []
+        self.nodes: list[Node] = []  # Nodes of EVAL_NODE instructions
+        self.line_table = LineTable()
+        # Global functions called by the function, None if it is impure (see EffectAnalyser)
+        self.callees: Optional[frozenset[str]] = None
+
+    def __len__(self) -> int:
+        """Returns the number of instructions"""
+        return len(self.instructions) // 2
+
+
+def argument_repr(code: CodeObject, pc: int, op: OpCode, arg: int) -> str:
+    """Returns a description of the argument of an instruction"""
+    if op in JUMP_OPCODES:
+        return f"to {arg}"
+    if op in NAME_OPCODES:
+        return code.names[arg]
+    if op in SITE_OPCODES:
+        return repr(code.sites[arg])
+    if op == OpCode.LOAD_CONST:
+        constant = code.consts[arg]
+        return f"{constant.label} {constant.value!r}"
+    if op == OpCode.MAKE_FUNCTION:
+        return code.consts[arg][0]
+    if op == OpCode.BINARY_OP:
+        return BINARY_OPERATORS[arg]
+    if op == OpCode.EVAL_NODE:
+        return code.nodes[arg].label
+    return ""
+
+
+def disassemble(code: CodeObject, source_map: Optional[SourceMap] = None) -> str:
+    """
+    Returns a listing of the instructions of a code object, followed by the
+    listings of the functions it defines
+    @param code: The code object to disassemble
+    @param source_map: Resolves the positions of instructions to line numbers
+    """
+    lines = [f"Disassembly of {code.name}:"]
+    functions = []
+    previous_line = None
+    for pc in range(0, len(code.instructions), 2):
+        op, arg = OpCode(code.instructions[pc]), code.instructions[pc + 1]
+        start_pos, _ = code.line_table.position(pc)
+        line = ""
+        if source_map and start_pos is not None:
+            line_number = source_map.position(start_pos).line_number
+            if line_number != previous_line:
+                line = str(line_number)
+                previous_line = line_number
+
+        argument = argument_repr(code, pc, op, arg)
+        lines.append(
+            f"{line:>5} {pc:>6} {op.name:<20} {arg:>4}"
+            + (f" ({argument})" if argument else "")
+        )
+        if op == OpCode.MAKE_FUNCTION and isinstance(code.consts[arg][2], CodeObject):
+            functions.append(code.consts[arg][2])
+
+    listing = "\n".join(lines)
+    for function in functions:
+        listing += "\n\n" + disassemble(function, source_map)
+    return listing
@@ -1,4 +1,10 @@
 from collections import OrderedDict
+from typing import Any, Optional
+
+from src.core.RuntimeObject import RunTimeObject
+
+# Labels of the mutable runtime objects, which calls of pure functions are not memoized with
+UNMEMOIZED_LABELS = ("array", "file")
 
 
 class LRUCache:
@@ -47,8 +53,38 @@ class LRUCache:
         """
         return key in self.__cache_map
 
+    def clear(self):
+        """Removes every value from the cache"""
+        self.__cache_map.clear()
+
     def display(self):
         print(self.__cache_map)
 
 
-cache_mem = LRUCache()
+class FunctionMemo(LRUCache):
+    """
+    Results of the calls of a pure function, keyed by the values of their arguments.
+    Results are copied in and out of the table, as runtime objects are mutable.
+    Arrays and files are not memoized, as a copy of them would still share their elements.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        @param capacity: The maximum number of results the table can hold
+        """
+        super().__init__(capacity)
+        # Whether the function and every function it calls are pure
+        self.pure = False
+        # The functions bound to the names called by the function (transitively)
+        # when its results were memoized, None before its first memoized call
+        self.dependencies: Optional[dict[str, Any]] = None
+
+    def get(self, key) -> Optional[RunTimeObject]:
+        result = super().get(key)
+        if result is None:
+            return None
+        return RunTimeObject(result.label, result.value)
+
+    def put(self, key, value: Optional[RunTimeObject]):
+        if value is not None and value.label not in UNMEMOIZED_LABELS:
+            super().put(key, RunTimeObject(value.label, value.value))
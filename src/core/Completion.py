@@ -0,0 +1,34 @@
+from typing import Optional
+
+from src.core.RuntimeObject import RunTimeObject
+
+
+class Completion:
+    """
+    Record of a statement transferring control (break, continue or return),
+    returned by the statements enclosing it up to the loop or call it completes.
+    A return statement returning the result of a call is a tail call record.
+    """
+
+    __slots__ = ("kind", "value")
+
+    def __init__(
+        self, kind: str, value: Optional[RunTimeObject | tuple] = None
+    ) -> None:
+        """
+        Initializes a new completion record
+        @param kind: The label of the statement transferring control, or tail_call
+        @param value: The value returned, for a return statement,
+        the call node, function called and its arguments for a tail call
+        """
+        self.kind = kind
+        self.value = value
+
+    def __repr__(self) -> str:
+        """Returns a string representation of the completion record"""
+        return f"Completion({self.kind}) = {self.value}"
+
+
+# Completion records of break and continue statements, which hold no value
+BREAK = Completion("break")
+CONTINUE = Completion("continue")
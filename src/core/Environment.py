@@ -1,9 +1,16 @@
-import hashlib
+from itertools import count
 from typing import Any, Dict, Optional
 
 from src.core.RuntimeObject import RunTimeObject
 from src.core.Symbol import ArraySymbol, FunctionSymbol, Symbol, VarSymbol
 
+# Value of the slots of variables that are not assigned yet
+UNASSIGNED = object()
+
+# Versions of the scopes, unique across environments,
+# so a version only ever identifies one state of one scope
+VERSIONS = count()
+
 
 class Environment:
     def __init__(self, name: str, level: int, parent: Optional["Environment"] = None):
@@ -11,13 +18,19 @@ class Environment:
         self.__level = level
         self.__parent = parent
         self.__symbol_table: Dict[str, Symbol] = {}
+        # Changes whenever a symbol of the table is replaced or removed,
+        # the symbols looked up at a version are valid as long as it is current
+        self.version = next(VERSIONS)
 
     def insert_symbol(self, name: str, symbol: Any):
         """
-        Inserts a symbol into the symbol table
+        Inserts a symbol into the symbol table, a new version of the scope
+        if it replaces the symbol of the name
         @param name: The name of the symbol
         @param symbol: The symbol to insert
         """
+        if name in self.__symbol_table:
+            self.version = next(VERSIONS)
         self.__symbol_table[name] = symbol
 
     def lookup_symbol(self, name: str, lookup_within_scope=False) -> RunTimeObject:
@@ -39,6 +52,31 @@ class Environment:
 
         raise Exception(f"Variable '{name}' not found in '{self.__name}' scope")
 
+    def lookup_slot(self, index: int, name: str) -> RunTimeObject:
+        """
+        Retrieves the runtime object of a variable the resolver assigned a slot to.
+        Scopes without slots look the variable up by name.
+        @param index: The slot index of the variable
+        @param name: The name of the variable
+        @raise Exception: If the symbol is not found in the table.
+        """
+        return self.lookup_symbol(name)
+
+    def assign_slot(self, index: int, name: str, value: RunTimeObject):
+        """
+        Assigns a runtime object to a variable the resolver assigned a slot to.
+        Scopes without slots insert a variable symbol.
+        @param index: The slot index of the variable
+        @param name: The name of the variable
+        @param value: The runtime object to assign
+        """
+        self.insert_symbol(name, VarSymbol(name, value))
+
+    def clear(self):
+        """Removes the symbols of the scope, for another call of its function to reuse it"""
+        self.version = next(VERSIONS)
+        self.__symbol_table.clear()
+
     @property
     def name(self):
         """Get the name of the environment"""
@@ -54,25 +92,82 @@ class Environment:
         """Get the parent environment of the current environment"""
         return self.__parent
 
-    def hash(self):
-        """Hash the symbol table"""
-        return hashlib.sha256(self.__str__().encode()).hexdigest()
-
     def __str__(self):
         """
         Return a string representation of the symbol table.
-        The symbol table is sorted by key to ensure consistent output for hash generation.
+        The symbol table is sorted by key to ensure consistent output.
         """
+        return "\n".join(entry for _, entry in sorted(self.entries()))
+
+    def entries(self) -> list[tuple[str, str]]:
+        """Returns the names of the symbols of the table, with their string representation"""
         table = []
-        for k, v in sorted(self.__symbol_table.items()):
+        for k, v in self.__symbol_table.items():
             if isinstance(v, VarSymbol):
-                table.append(f"Var: {k} =>\n  Value: {v.value}")
+                table.append((k, f"Var: {k} =>\n  Value: {v.value}"))
             elif isinstance(v, FunctionSymbol) == "func":
-                table.append(f"Func: {k}] =>\n  Params: {v.params}\n  Body: {v.body}")
+                table.append(
+                    (k, f"Func: {k}] =>\n  Params: {v.params}\n  Body: {v.body}")
+                )
             elif isinstance(v, ArraySymbol):
-                table.append(f"Array: {k} =>\n  Size: {v.size}\n  Values: {v.values}")
-        return "\n".join(table)
+                table.append(
+                    (k, f"Array: {k} =>\n  Size: {v.size}\n  Values: {v.values}")
+                )
+        return table
+
+
+class SlotEnvironment(Environment):
+    """
+    Local scope of a function call, whose variables are held in a fixed-size array
+    of slots instead of the symbol table. The resolver assigns the slots of a
+    function (parameters first), its variable nodes then index them directly.
+    Variables read before they are assigned are looked up in the parent scope.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        level: int,
+        parent: Environment,
+        slot_indexes: Dict[str, int],
+    ):
+        """
+        @param slot_indexes: The slot indexes of the local variables, indexed by name
+        """
+        super().__init__(name, level, parent)
+        self.__slot_indexes = slot_indexes
+        self.__slots = [UNASSIGNED] * len(slot_indexes)
+
+    def insert_symbol(self, name: str, symbol: Any):
+        index = self.__slot_indexes.get(name)
+        if index is None or not isinstance(symbol, VarSymbol):
+            super().insert_symbol(name, symbol)
+        else:
+            self.__slots[index] = symbol.value
+
+    def lookup_symbol(self, name: str, lookup_within_scope=False) -> RunTimeObject:
+        index = self.__slot_indexes.get(name)
+        if index is not None and self.__slots[index] is not UNASSIGNED:
+            return self.__slots[index]
+        return super().lookup_symbol(name, lookup_within_scope)
+
+    def lookup_slot(self, index: int, name: str) -> RunTimeObject:
+        value = self.__slots[index]
+        if value is UNASSIGNED:
+            return super().lookup_symbol(name)
+        return value
+
+    def assign_slot(self, index: int, name: str, value: RunTimeObject):
+        self.__slots[index] = value
+
+    def clear(self):
+        super().clear()
+        self.__slots = [UNASSIGNED] * len(self.__slot_indexes)
 
-    def __hash__(self):
-        """Return the hash value of the symbol table"""
-        return self.hash()
+    def entries(self) -> list[tuple[str, str]]:
+        table = super().entries()
+        for name, index in self.__slot_indexes.items():
+            value = self.__slots[index]
+            if value is not UNASSIGNED:
+                table.append((name, f"Var: {name} =>\n  Value: {value}"))
+        return table
@@ -0,0 +1,54 @@
+from typing import Optional
+
+# The label and source offsets of the node generated on a line
+LineSite = tuple[str, Optional[int], Optional[int]]
+
+
+class LineMap:
+    """
+    Maps the lines of a transpiled Python module to the nodes generated on them.
+    Every node that can report an error starts a new line of the module, so the
+    line a traceback stops at in the module locates the node that failed.
+    """
+
+    def __init__(self, sites: Optional[dict[int, LineSite]] = None):
+        """
+        @param sites: The sites of the lines of a module, as returned by sites
+        """
+        self.__sites: dict[int, LineSite] = dict(sites) if sites else {}
+
+    def add(
+        self, line: int, label: str, start_pos: Optional[int], end_pos: Optional[int]
+    ) -> None:
+        """
+        Records the node generated on a line
+        @param line: The line number in the module
+        @param label: The label of the node
+        @param start_pos: The source offset the node starts at
+        @param end_pos: The source offset the node ends at
+        """
+        self.__sites[line] = (label, start_pos, end_pos)
+
+    def site(self, line: int) -> Optional[LineSite]:
+        """Returns the label and source offsets of the node generated on a line, if any"""
+        return self.__sites.get(line)
+
+    @property
+    def sites(self) -> dict[int, LineSite]:
+        """Returns the sites of all mapped lines, indexed by line number"""
+        return dict(self.__sites)
+
+
+class PyModule:
+    """Python source transpiled from a Nyaa program (or REPL input)"""
+
+    def __init__(self, source: str, line_map: LineMap, filename: str):
+        """
+        @param source: The Python source of the module
+        @param line_map: Maps the lines of the source to the nodes generated on them
+        @param filename: The name the module is compiled under, which identifies
+        its frames in tracebacks
+        """
+        self.source = source
+        self.line_map = line_map
+        self.filename = filename
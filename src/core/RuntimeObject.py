@@ -2,37 +2,29 @@ from typing import Any
 
 
 class RunTimeObject:
+    # Runtime objects are allocated for every value computed, slots keep them compact
+    __slots__ = ("label", "value")
+
+    # Whether the runtime object is shared, and must be copied before it is bound
+    # to a variable (variables are mutated in place, e.g. by postfix operators)
+    shared = False
+
     def __init__(self, label: str, value: Any) -> None:
         """
         Initializes a new runtime object
         @param label: The label of the runtime object
         @param value: The value held by the runtime object
         """
-        self.__label = label
-        self.__value = value
-
-    @property
-    def label(self) -> str:
-        """Returns the label of the runtime object"""
-        return self.__label
-
-    @property
-    def value(self) -> Any:
-        """Returns the value held by the runtime object"""
-        return self.__value
-
-    @value.setter
-    def value(self, value: Any) -> None:
-        """Set the value of the runtime object"""
-        self.__value = value
+        self.label = label
+        self.value = value
 
     def copy(self) -> "RunTimeObject":
         """Returns a new instance of the runtime object"""
-        return RunTimeObject(self.__label, self.value)
+        return RunTimeObject(self.label, self.value)
 
     def __repr__(self) -> str:
         """Returns a string representation of the runtime object"""
-        return f"RuntimeObject({self.__label}) = {self.value}"
+        return f"RuntimeObject({self.label}) = {self.value}"
 
     def __eq__(self, other) -> bool:
         """
@@ -42,10 +34,24 @@ class RunTimeObject:
         """
         return (
             isinstance(self, other)
-            and self.__label == other.label
-            and self.__value == other.label
+            and self.label == other.label
+            and self.value == other.label
         )
 
     def __hash__(self) -> int:
         """Return the hash of the runtime object"""
-        return hash((self.__label, self.__value))
+        return hash((self.label, self.value))
+
+
+class SharedRunTimeObject(RunTimeObject):
+    """
+    Immutable runtime object shared by every evaluation of a literal,
+    and by the boolean results of operations
+    """
+
+    __slots__ = ()
+    shared = True
+
+
+HAI = SharedRunTimeObject("boolean", True)
+IIE = SharedRunTimeObject("boolean", False)
@@ -1,6 +1,7 @@
-from typing import IO, Any
+from typing import IO, Any, Optional
 
 from src.core.ASTNodes import BodyNode
+from src.core.CacheMemory import FunctionMemo
 from src.core.RuntimeObject import RunTimeObject
 
 
@@ -65,6 +66,8 @@ class FunctionSymbol(Symbol):
         super().__init__(name)
         self.__params = params
         self.__body = body
+        # Memoized results of the calls of the function, created on its first call
+        self.memo: Optional[FunctionMemo] = None
 
     @property
     def params(self) -> dict:
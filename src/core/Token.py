@@ -1,4 +1,6 @@
-from typing import Union
+from array import array
+from bisect import bisect_right
+from typing import Optional, Union
 
 from src.core.Types import TokenType
 
@@ -6,65 +8,90 @@ from src.core.Types import TokenType
 class Position:
     """Represents the position of a token in the source code"""
 
+    __slots__ = ("line_number", "column_number")
+
     def __init__(self, *, line: int = -1, col: int = -1) -> None:
         self.line_number = line
         self.column_number = col
 
 
-class Token:
-    """Represents a token"""
-
-    def __init__(self) -> None:
-        self._type = TokenType.NULL
-        self._word: str = ""
-        self._number: Union[int, float] = 0
-        self.__position = Position(line=-1, col=-1)
-
-    @property
-    def type(self) -> TokenType:
-        return self._type
-
-    @type.setter
-    def type(self, tok_type: TokenType) -> None:
-        self._type = tok_type
-
-    @property
-    def value(self):
-        return self._type.value
+class SourceMap:
+    """
+    Maps source offsets to line and column numbers.
+    Tokens and nodes only store the offset of the character they start at,
+    the line and column are resolved (only when reporting errors) with
+    a binary search over the offsets at which each line starts.
+    """
 
-    @property
-    def word(self) -> str:
-        return self._word
+    __slots__ = ("__line_starts", "__length")
 
-    @word.setter
-    def word(self, value: str) -> None:
-        self._word = value
+    def __init__(self) -> None:
+        self.__line_starts = array("q", [0])
+        self.__length = 0
+
+    @classmethod
+    def from_line_starts(cls, line_starts: list[int]) -> "SourceMap":
+        """
+        Rebuilds the source map of a source from the offsets at which its lines start
+        @param line_starts: The offsets, as returned by line_starts
+        """
+        source_map = cls()
+        source_map.__line_starts = array("q", line_starts)
+        source_map.__length = line_starts[-1]
+        return source_map
 
     @property
-    def number(self) -> Union[int, float]:
-        return self._number
+    def line_starts(self) -> list[int]:
+        """Returns the offsets at which each line of the indexed source starts"""
+        return self.__line_starts.tolist()
+
+    def extend(self, text: str) -> None:
+        """
+        Indexes the next part of the source
+        @param text: The source text following the previously indexed text
+        """
+        base = self.__length
+        line_starts = self.__line_starts
+        find = text.find
+
+        newline = find("\n")
+        while newline != -1:
+            line_starts.append(base + newline + 1)
+            newline = find("\n", newline + 1)
+        self.__length += len(text)
+
+    def position(self, offset: Optional[int]) -> Position:
+        """
+        Resolves the position of the character at the given offset.
+        A newline character belongs to the start (column 0) of the line it opens.
+        @param offset: The source offset, -1 being the position before any character
+        @return: The line and column number of the offset
+        """
+        if offset is None:
+            return Position(line=-1, col=-1)
+
+        line = bisect_right(self.__line_starts, offset + 1)
+        return Position(line=line, col=offset + 1 - self.__line_starts[line - 1])
 
-    @number.setter
-    def number(self, value: Union[int, float]) -> None:
-        self._number = value
-
-    @property
-    def line_num(self) -> int:
-        return self.position.line_number
 
-    @property
-    def column_num(self) -> int:
-        return self.position.column_number
+class Token:
+    """Represents a token"""
 
-    @property
-    def position(self):
-        return self.__position
+    __slots__ = ("type", "word", "number", "offset")
 
-    @position.setter
-    def position(self, position):
-        self.__position = position
+    def __init__(
+        self,
+        tok_type: TokenType = TokenType.NULL,
+        word: str = "",
+        number: Union[int, float] = 0,
+        offset: Optional[int] = None,
+    ) -> None:
+        self.type = tok_type
+        self.word = word
+        self.number = number
+        self.offset = offset  # Offset of the first character in the source
 
     def __str__(self) -> str:
-        if self._word:
-            return f"type: {self._type} -> {self._word}"
-        return f"type: {self._type}"
+        if self.word:
+            return f"type: {self.type} -> {self.word}"
+        return f"type: {self.type}"
@@ -0,0 +1,59 @@
+from collections import deque
+from typing import Iterator
+
+from src.core.Token import Token
+from src.core.Types import TokenType
+from src.utils.Constants import MAX_LOOKAHEAD
+
+
+class TokenStream:
+    """
+    Pulls tokens lazily from a token iterator and keeps a bounded
+    lookahead window, so parsing never materialises the whole token list.
+    """
+
+    def __init__(self, tokens: Iterator[Token], lookahead: int = MAX_LOOKAHEAD):
+        """
+        @param tokens: Iterator of tokens, ending with an ENDMARKER token
+        @param lookahead: The maximum number of tokens that can be peeked at
+        """
+        self.__next_token = iter(tokens).__next__
+        self.__window: deque[Token] = deque(maxlen=lookahead)
+        self.__lookahead = lookahead
+
+    def __iter__(self) -> "TokenStream":
+        return self
+
+    def __next__(self) -> Token:
+        """Returns the next token, draining the lookahead window first"""
+        if self.__window:
+            return self.__window.popleft()
+        return self.__pull()
+
+    def __pull(self) -> Token:
+        """Reads a token from the source, repeating the end marker once exhausted"""
+        token = self.__next_token()
+        if token.type is TokenType.ENDMARKER:
+            self.__next_token = lambda: token
+        return token
+
+    @property
+    def buffered(self) -> int:
+        """Returns the number of tokens read from the source but not yet consumed"""
+        return len(self.__window)
+
+    def peek(self, k: int = 0) -> Token:
+        """
+        Looks ahead at an upcoming token without consuming it
+        @param k: Offset of the token, 0 being the token returned by the next call to next()
+        @return: The k-th upcoming token
+        """
+        if not 0 <= k < self.__lookahead:
+            raise IndexError(
+                f"Lookahead of {k} is outside the window of {self.__lookahead} tokens"
+            )
+
+        window = self.__window
+        while len(window) <= k:
+            window.append(self.__pull())
+        return window[k]
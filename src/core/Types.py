@@ -12,16 +12,10 @@ class TokenType(Enum):
     A series of helper functions are defined for the parser to
     use to figure how to handle a token it encounters.
 
-    Tokens are assigned unique integer values using `enum.auto()`,
-    and so IT IS IMPORTANT that the order of these tokens is maintained
-    in order for the parser to understand which categories tokens
-    belong to; ie. (BODY_STATEMENTS, CALLABLES, FACTORS,...)
-
-    To figure out which group/parse_type a token falls under, the value
-    must fall within the _begin_X_definition and _end_X_definition
-    Example:
-        - from _BEGIN_BODY_STATEMENT_DEFINITIONS to _END_BODY_STATEMENT_DEFINITIONS
-        Encompasses a range of tokens that can be indicate body statements to be parsed.
+    The categories a token belongs to (BODY_STATEMENTS, CALLABLES, FACTORS,...)
+    are listed in the frozen sets defined below this class, the order
+    of the tokens is irrelevant. Every token must be listed in at least one
+    category, which is verified when this module is imported.
     """
 
     NULL = auto()  # null token
@@ -32,11 +26,9 @@ class TokenType(Enum):
     # ========================================================
     # STATEMENT DEFINITIONS
     # ========================================================
-    _BEGIN_BODY_STATEMENT_DEFINITIONS = auto()
     RET = auto()
     DEF = auto()
 
-    _BEGIN_CALLABLE_DEFINITIONS = auto()
     INPUT = auto()
     PRINT = auto()
     PRINTLN = auto()
@@ -45,46 +37,34 @@ class TokenType(Enum):
     STR_SPLIT = auto()
     LEN = auto()
 
-    _BEGIN_FILE_IO_DEFINITIONS = auto()
     FILE_OPEN = auto()
     FILE_CLOSE = auto()
     FILE_READ = auto()
     FILE_READLINE = auto()
     FILE_WRITE = auto()
     FILE_WRITELINE = auto()
-    _END_FILE_IO_DEFINITIONS = auto()
-    _END_CALLABLE_DEFINITIONS = auto()
 
-    _BEGIN_CONDITIONAL_STATEMENT_DEFINITION = auto()
     IF = auto()
     WHILE = auto()
     FOR = auto()
-    _END_BODY_STATEMENT_DEFINITIONS = auto()
     ELIF = auto()
     ELSE = auto()
     CONTINUE = auto()
     BREAK = auto()
-    _END_CONDITIONAL_STATEMENT_DEFINITION = auto()
 
     # ========================================================
     # OPERATOR DEFINITIONS
     # ========================================================
-    _BEGIN_BINARY_OPERATOR_DEFINITIONS = auto()
-    _BEGIN_ADDITIVE_OPERATOR_DEFINITIONS = auto()
     # Add
     PLUS = auto()
     MINUS = auto()
-    _END_ADDITIVE_OPERATOR_DEFINITIONS = auto()
 
     # Multiplicative
-    _BEGIN_MULTIPLICATIVE_OPERATOR_DEFINITIONS = auto()
     MULTIPLY = auto()
     DIVIDE = auto()
     MODULO = auto()  # %
-    _END_MULTIPLICATIVE_OPERATOR_DEFINITIONS = auto()
 
     # Relational
-    _BEGIN_RELATIONAL_OPERATOR_DEFINITIONS = auto()
     EQ = auto()  # ==
     NEQ = auto()  # !=
     LT = auto()  # <
@@ -93,18 +73,13 @@ class TokenType(Enum):
     GTE = auto()  # >=
     AND = auto()
     OR = auto()
-    _END_RELATIONAL_OPERATOR_DEFINITIONS = auto()
-    _BEGIN_POSTFIX_OPERATOR_DEFINITIONS = auto()
     # postfix operators
     UN_ADD = auto()  # ++
     UN_SUB = auto()  # --
-    _END_POSTFIX_OPERATOR_DEFINITIONS = auto()
-    _END_BINARY_OPERATOR_DEFINITIONS = auto()
 
     # ========================================================
     # FACTOR DEFINITIONS
     # ========================================================
-    _BEGIN_FACTOR_DEFINITIONS = auto()
     # Types
     ID = auto()
     INT = auto()
@@ -115,17 +90,13 @@ class TokenType(Enum):
     TRUE = auto()
     FALSE = auto()
 
-    _BEGIN_UNARY_OPERATOR_DEFINITIONS = auto()
     # Negations
     NOT = auto()
-    _END_UNARY_OPERATOR_DEFINITIONS = auto()
     LPAR = auto()  # (
-    _END_FACTOR_DEFINITIONS = auto()
 
     # ========================================================
     # LITERAL DEFINITIONS
     # ========================================================
-    _BEGIN_LITERAL_DEFINITIONS = auto()
     # Non-alphabetic operators
     ASSIGN = auto()
     FILE_EOF = auto()
@@ -138,119 +109,217 @@ class TokenType(Enum):
     RBRACKET = auto()  # ]
     COMMA = auto()  # ,
     COLON = auto()  # ::
-    _END_LITERAL_DEFINITIONS = auto()
 
     ENDMARKER = auto()  # End of file
     ERR = auto()  # Lexer only
 
     @classmethod
     def statement_start(cls, token: "Token") -> bool:
-        is_statement_start = token.type == TokenType.ID
-        is_statement_start |= cls.token_within(
-            token,
-            cls._BEGIN_BODY_STATEMENT_DEFINITIONS,
-            cls._END_BODY_STATEMENT_DEFINITIONS,
-        )
-        return is_statement_start
+        return token.type in STATEMENT_START_TOKENS
 
     @classmethod
     def conditional_stmt_start(cls, token: "Token") -> bool:
-        return cls.statement_start(token) or (
-            token.value < cls._END_CONDITIONAL_STATEMENT_DEFINITION.value
-        )
+        return token.type in CONDITIONAL_STATEMENT_START_TOKENS
 
     @classmethod
     def postfix(cls, token: "Token") -> bool:
-        return cls.token_within(
-            token,
-            cls._BEGIN_POSTFIX_OPERATOR_DEFINITIONS,
-            cls._END_POSTFIX_OPERATOR_DEFINITIONS,
-        )
+        return token.type in POSTFIX_OPERATOR_TOKENS
 
     @classmethod
     def unary(cls, token) -> bool:
-        return cls.token_within(
-            token,
-            cls._BEGIN_UNARY_OPERATOR_DEFINITIONS,
-            cls._END_UNARY_OPERATOR_DEFINITIONS,
-        )
+        return token.type in UNARY_OPERATOR_TOKENS
 
     @classmethod
     def expression(cls, token: "Token") -> bool:
-        return cls.factor(token)
+        return token.type in FACTOR_START_TOKENS
 
     @classmethod
     def term(cls, token: "Token") -> bool:
-        return cls.factor(token)
+        return token.type in FACTOR_START_TOKENS
 
     @classmethod
     def factor(cls, token: "Token") -> bool:
-        result = cls.token_within(
-            token,
-            TokenType._BEGIN_FACTOR_DEFINITIONS,
-            TokenType._END_FACTOR_DEFINITIONS,
-        )
-        # Handle negative numbers
-        result |= token.type == TokenType.MINUS
-        result |= cls.callable(token)
-        return result
+        return token.type in FACTOR_START_TOKENS
 
     @classmethod
     def bin_op(cls, token: "Token") -> bool:
-        return cls.rel_op(token) or cls.add_op(token) or cls.mul_op(token)
+        return token.type in BINARY_OPERATOR_TOKENS
 
     @classmethod
     def rel_op(cls, token: "Token") -> bool:
-        return cls.token_within(
-            token,
-            cls._BEGIN_RELATIONAL_OPERATOR_DEFINITIONS,
-            cls._END_RELATIONAL_OPERATOR_DEFINITIONS,
-        )
+        return token.type in RELATIONAL_OPERATOR_TOKENS
 
     @classmethod
     def add_op(cls, token: "Token") -> bool:
-        return cls.token_within(
-            token,
-            cls._BEGIN_ADDITIVE_OPERATOR_DEFINITIONS,
-            cls._END_ADDITIVE_OPERATOR_DEFINITIONS,
-        )
+        return token.type in ADDITIVE_OPERATOR_TOKENS
 
     @classmethod
     def mul_op(cls, token: "Token") -> bool:
-        return cls.token_within(
-            token,
-            cls._BEGIN_MULTIPLICATIVE_OPERATOR_DEFINITIONS,
-            cls._END_MULTIPLICATIVE_OPERATOR_DEFINITIONS,
-        )
+        return token.type in MULTIPLICATIVE_OPERATOR_TOKENS
 
     @classmethod
     def callable(cls, token: "Token") -> bool:
-        return cls.token_within(
-            token,
-            TokenType._BEGIN_CALLABLE_DEFINITIONS,
-            TokenType._END_CALLABLE_DEFINITIONS,
-        )
+        return token.type in CALLABLE_TOKENS
 
     @classmethod
     def file_IO(cls, token: "Token") -> bool:
-        return cls.token_within(
-            token, cls._BEGIN_FILE_IO_DEFINITIONS, cls._END_FILE_IO_DEFINITIONS
-        )
+        return token.type in FILE_IO_TOKENS
 
     @classmethod
     def assignment(cls, token: "Token") -> bool:
-        return token.type in [TokenType.ASSIGN, TokenType.LBRACKET]
-
-    @staticmethod
-    def token_within(
-        token: "Token",
-        start_token_definition: "TokenType",
-        end_token_definition: "TokenType",
-    ):
-        return start_token_definition.value < token.value < end_token_definition.value
+        return token.type in ASSIGNMENT_TOKENS
 
     def __str__(self) -> str:
         return self.name
 
     def __repr__(self) -> str:
         return self.name
+
+
+# ========================================================
+# TOKEN CATEGORIES
+# ========================================================
+FILE_IO_TOKENS = frozenset(
+    {
+        TokenType.FILE_OPEN,
+        TokenType.FILE_CLOSE,
+        TokenType.FILE_READ,
+        TokenType.FILE_READLINE,
+        TokenType.FILE_WRITE,
+        TokenType.FILE_WRITELINE,
+    }
+)
+CALLABLE_TOKENS = FILE_IO_TOKENS | {
+    TokenType.INPUT,
+    TokenType.PRINT,
+    TokenType.PRINTLN,
+    TokenType.GET_CHAR,
+    TokenType.GET_INT,
+    TokenType.STR_SPLIT,
+    TokenType.LEN,
+}
+BODY_STATEMENT_TOKENS = CALLABLE_TOKENS | {
+    TokenType.RET,
+    TokenType.DEF,
+    TokenType.IF,
+    TokenType.WHILE,
+    TokenType.FOR,
+}
+STATEMENT_START_TOKENS = BODY_STATEMENT_TOKENS | {TokenType.ID}
+# Tokens that may open the body of a conditional (or loop) statement
+CONDITIONAL_STATEMENT_START_TOKENS = STATEMENT_START_TOKENS | {
+    TokenType.NULL,
+    TokenType.MAIN,
+    TokenType.ELIF,
+    TokenType.ELSE,
+    TokenType.CONTINUE,
+    TokenType.BREAK,
+}
+
+ADDITIVE_OPERATOR_TOKENS = frozenset({TokenType.PLUS, TokenType.MINUS})
+MULTIPLICATIVE_OPERATOR_TOKENS = frozenset(
+    {TokenType.MULTIPLY, TokenType.DIVIDE, TokenType.MODULO}
+)
+RELATIONAL_OPERATOR_TOKENS = frozenset(
+    {
+        TokenType.EQ,
+        TokenType.NEQ,
+        TokenType.LT,
+        TokenType.GT,
+        TokenType.LTE,
+        TokenType.GTE,
+        TokenType.AND,
+        TokenType.OR,
+    }
+)
+BINARY_OPERATOR_TOKENS = (
+    ADDITIVE_OPERATOR_TOKENS
+    | MULTIPLICATIVE_OPERATOR_TOKENS
+    | RELATIONAL_OPERATOR_TOKENS
+)
+POSTFIX_OPERATOR_TOKENS = frozenset({TokenType.UN_ADD, TokenType.UN_SUB})
+UNARY_OPERATOR_TOKENS = frozenset({TokenType.NOT})
+
+# Tokens that can start a factor (and therefore an expression)
+FACTOR_START_TOKENS = (
+    CALLABLE_TOKENS
+    | UNARY_OPERATOR_TOKENS
+    | {
+        TokenType.ID,
+        TokenType.INT,
+        TokenType.STR,
+        TokenType.FLOAT,
+        TokenType.BOOL,
+        TokenType.TRUE,
+        TokenType.FALSE,
+        TokenType.LPAR,
+        TokenType.MINUS,  # Negative numbers
+    }
+)
+
+ASSIGNMENT_TOKENS = frozenset({TokenType.ASSIGN, TokenType.LBRACKET})
+LITERAL_TOKENS = frozenset(
+    {
+        TokenType.ASSIGN,
+        TokenType.FILE_EOF,
+        TokenType.TO,
+        TokenType.RPAR,
+        TokenType.SEMICOLON,
+        TokenType.LBRACE,
+        TokenType.RBRACE,
+        TokenType.LBRACKET,
+        TokenType.RBRACKET,
+        TokenType.COMMA,
+        TokenType.COLON,
+    }
+)
+# Tokens that only mark the state of the lexer
+CONTROL_TOKENS = frozenset({TokenType.NULL, TokenType.ENDMARKER, TokenType.ERR})
+
+
+def verify_token_categories() -> None:
+    """
+    Checks the token categories are consistent with each other
+    and that every token belongs to at least one category
+    """
+    nested_categories = [
+        ("FILE_IO_TOKENS", FILE_IO_TOKENS, "CALLABLE_TOKENS", CALLABLE_TOKENS),
+        (
+            "CALLABLE_TOKENS",
+            CALLABLE_TOKENS,
+            "FACTOR_START_TOKENS",
+            FACTOR_START_TOKENS,
+        ),
+        (
+            "BODY_STATEMENT_TOKENS",
+            BODY_STATEMENT_TOKENS,
+            "CONDITIONAL_STATEMENT_START_TOKENS",
+            CONDITIONAL_STATEMENT_START_TOKENS,
+        ),
+    ]
+    for name, category, parent_name, parent_category in nested_categories:
+        if not category <= parent_category:
+            raise TypeError(f"{name} must be a subset of {parent_name}")
+
+    operator_families = [
+        ADDITIVE_OPERATOR_TOKENS,
+        MULTIPLICATIVE_OPERATOR_TOKENS,
+        RELATIONAL_OPERATOR_TOKENS,
+        POSTFIX_OPERATOR_TOKENS,
+    ]
+    if sum(map(len, operator_families)) != len(frozenset().union(*operator_families)):
+        raise TypeError("An operator token belongs to more than one operator family")
+
+    categorised = frozenset().union(
+        CONDITIONAL_STATEMENT_START_TOKENS,
+        BINARY_OPERATOR_TOKENS,
+        POSTFIX_OPERATOR_TOKENS,
+        FACTOR_START_TOKENS,
+        LITERAL_TOKENS,
+        CONTROL_TOKENS,
+    )
+    if uncategorised := [token.name for token in TokenType if token not in categorised]:
+        raise TypeError(f"Tokens without a category: {', '.join(uncategorised)}")
+
+
+verify_token_categories()
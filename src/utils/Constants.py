@@ -1,6 +1,14 @@
 EOF = ""
 MAX_ID_LEN = 32
 MAX_STR_LEN = 1024
+MAX_BULK_READ_SIZE = 1 << 24  # Sources larger than 16 MiB are streamed
+SOURCE_CHUNK_SIZE = 1 << 20
+MAX_LOOKAHEAD = 4  # Tokens the parser may peek at beyond the current token
+CACHE_DIR = "__nyaacache__"
+CACHE_SUFFIX = ".nyc"
+CACHE_MAGIC = b"NYC\x01"  # Bump when the layout of cache entries changes
+BYTECODE_SUFFIX = ".nyb"
+BYTECODE_MAGIC = b"NYB\x01"  # Bump when the layout of bytecode files changes
 BOLD = "\033[1m"
 HEADER = "\033[95m"
 OKBLUE = "\033[94m"
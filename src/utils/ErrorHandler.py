@@ -1,7 +1,8 @@
 import random
 from enum import Enum
+from typing import Optional
 
-from src.core.Token import Position
+from src.core.Token import Position, SourceMap
 from src.core.Types import TokenType
 from src.utils.Constants import ERROR, WARNING, SUCCESS, ENDC
 
@@ -34,21 +35,50 @@ class ParserError(Exception):
 
 class InterpreterError(Exception):
     def __init__(
-        self, err_type: ErrorType, message: str, start_pos: Position, end_pos: Position
+        self,
+        err_type: ErrorType,
+        message: str,
+        start_pos: Optional[int],
+        end_pos: Optional[int],
     ):
-        start_line_number, start_col_number = (
-            start_pos.line_number,
-            start_pos.column_number,
+        """
+        @param err_type: The type of runtime error
+        @param message: The error message
+        @param start_pos: The source offset the erroneous node starts at
+        @param end_pos: The source offset the erroneous node ends at
+        """
+        self.err_type = err_type
+        self.error_message = message
+        self.start_pos = start_pos
+        self.end_pos = end_pos
+        self.source_map: Optional[SourceMap] = None
+        self.__emoji = emoji()
+        super().__init__(message)
+
+    def locate(self, source_map: Optional[SourceMap]) -> "InterpreterError":
+        """
+        Sets the source map used to resolve the line and column numbers of the error
+        @param source_map: The source map of the interpreted program
+        """
+        self.source_map = source_map
+        return self
+
+    @property
+    def message(self) -> str:
+        start_pos, end_pos = Position(), Position()
+        if self.source_map:
+            start_pos = self.source_map.position(self.start_pos)
+            end_pos = self.source_map.position(self.end_pos)
+
+        return (
+            f"{WARNING}{self.__emoji}\n"
+            f"{self.err_type.value}: {ERROR}{self.error_message}{ERROR} "
+            f"at position {WARNING}{start_pos.line_number}:{start_pos.column_number} "
+            f"to {end_pos.line_number}:{end_pos.column_number}{ENDC}"
         )
-        end_line_number, end_col_number = end_pos.line_number, end_pos.column_number
 
-        self.message = (
-            f"{WARNING}{emoji()}\n"
-            f"{err_type.value}: {ERROR}{message}{ERROR} "
-            f"at position {WARNING}{start_line_number}:{start_col_number} "
-            f"to {end_line_number}:{end_col_number}{ENDC}"
-        )
-        super().__init__(self.message)
+    def __str__(self) -> str:
+        return self.message
 
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,79 @@
+import re
+from enum import IntEnum
+from typing import Optional, TextIO
+
+# Colour codes of the console messages, stripped from messages written to a file
+COLOUR_PATTERN = re.compile(r"\x1b\[[0-9;]*m")
+
+
+class LogLevel(IntEnum):
+    """Detail of a log message, lower levels are more detailed"""
+
+    TRACE = 10  # Each token scanned or consumed, each node visited
+    INFO = 20  # Each construct parsed, each file operation
+
+
+class Logger:
+    """
+    Writes the verbose output of a subsystem (lexer, parser or interpreter).
+
+    Components only hold a logger when their subsystem is logged, and ask which levels
+    are enabled once, when they are constructed. Logging variants of the hot paths
+    (scanning a token, consuming a token, visiting a node) are only installed for
+    enabled levels, so disabled logging costs nothing on those paths.
+    """
+
+    def __init__(
+        self,
+        subsystem: str,
+        level: LogLevel = LogLevel.TRACE,
+        stream: Optional[TextIO] = None,
+    ):
+        """
+        @param subsystem: The subsystem logged, e.g. "parser"
+        @param level: The most detailed level logged
+        @param stream: The log file to write to, instead of the console.
+        Messages written to a file are prefixed with their subsystem and stripped of colours.
+        """
+        self.subsystem = subsystem
+        self.level = level
+        self.__stream = stream
+
+    def enabled_for(self, level: LogLevel) -> bool:
+        """Checks if messages of the given level are logged"""
+        return level >= self.level
+
+    def log(self, level: LogLevel, message: str) -> None:
+        """
+        Logs a message if its level is enabled
+        @param level: The level of the message
+        @param message: The message to log
+        """
+        if level < self.level:
+            return
+
+        if self.__stream is None:
+            print(message)
+        else:
+            message = COLOUR_PATTERN.sub("", message)
+            self.__stream.write(f"[{self.subsystem}] {message}\n")
+
+    def trace(self, message: str) -> None:
+        self.log(LogLevel.TRACE, message)
+
+    def info(self, message: str) -> None:
+        self.log(LogLevel.INFO, message)
+
+
+def subsystem_logger(
+    subsystem: str, verbose: bool, logger: Optional[Logger]
+) -> Optional[Logger]:
+    """
+    Returns the logger of a component, None if its subsystem is not logged
+    @param subsystem: The subsystem of the component
+    @param verbose: Flag to log the subsystem to the console (when no logger is given)
+    @param logger: The logger given to the component
+    """
+    if logger:
+        return logger
+    return Logger(subsystem) if verbose else None
@@ -0,0 +1,68 @@
+import os.path
+import shutil
+import tempfile
+from pathlib import Path
+
+from src.ASTCache import ASTCache
+from src.Lexer import Lexer
+from src.Parser import Parser
+from src.utils.Constants import SUCCESS, ENDC
+from tests import BaseTest
+
+
+class TestASTCache(BaseTest):
+    def setUp(self):
+        self.parser: Parser = Parser(lexer=Lexer())
+        self.cache: ASTCache = ASTCache(self.parser)
+        self.temp_dir = tempfile.mkdtemp()
+
+        source = os.path.join(self.test_dir, "interpreter/in/brainfuck.ny")
+        self.source = Path(shutil.copy(source, self.temp_dir))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        super().tearDown()
+
+    def test_cache_hit(self):
+        self.print_header("AST Cache (hit)")
+        ast, _ = self.cache.parse_source(str(self.source))
+        self.assertTrue(ASTCache.cache_path(self.source).exists())
+
+        cached_ast, source_map = self.cache.parse_source(str(self.source))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(cached_ast.encode_json(), ast.encode_json())
+        self.assertEqual(source_map.position(0).line_number, 1)
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_stale_entry(self):
+        self.print_header("AST Cache (stale entry)")
+        self.cache.parse_source(str(self.source))
+        with open(self.source, "a") as source:
+            source.write("\n# edited\n")
+
+        self.cache.parse_source(str(self.source))
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 2))
+
+        # Entries of another parser configuration are not reused
+        nested_parser = Parser(lexer=Lexer(), flat_expressions=False)
+        nested_cache = ASTCache(nested_parser)
+        nested_cache.parse_source(str(self.source))
+        self.assertEqual((nested_cache.hits, nested_cache.misses), (0, 1))
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_corrupt_entry(self):
+        self.print_header("AST Cache (corrupt entry)")
+        ast, _ = self.cache.parse_source(str(self.source))
+        cache_path = ASTCache.cache_path(self.source)
+        with open(cache_path, "r+b") as entry:
+            entry.seek(len(entry.read()) // 2)
+            entry.truncate()
+
+        reparsed_ast, _ = self.cache.parse_source(str(self.source))
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 2))
+        self.assertEqual(reparsed_ast.encode_json(), ast.encode_json())
+
+        # The corrupt entry has been replaced
+        self.cache.parse_source(str(self.source))
+        self.assertEqual(self.cache.hits, 1)
+        print(f"{SUCCESS}  Passed{ENDC}")
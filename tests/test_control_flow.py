@@ -0,0 +1,193 @@
+import contextlib
+import io
+
+from src.ClosureInterpreter import ClosureInterpreter
+from src.Interpreter import Interpreter
+from src.Lexer import Lexer
+from src.Parser import Parser
+from src.PyInterpreter import PyInterpreter
+from src.StackInterpreter import StackInterpreter
+from src.VirtualMachine import VirtualMachine
+from src.utils.Constants import SUCCESS, ENDC
+from tests import BaseTest
+
+ENGINES = (
+    Interpreter,
+    StackInterpreter,
+    ClosureInterpreter,
+    VirtualMachine,
+    PyInterpreter,
+)
+
+FUNCTIONS = """\
+kawaii pairs(n) => {
+    count = 0
+    for i => (0, n) {
+        for j => (0, n) {
+            nani (j == i) {
+                motto
+            }
+            nani (j > i) {
+                yamete
+            }
+            count = count + 1
+        }
+        count = count + 10
+    }
+    modoru count
+}
+kawaii find(target) => {
+    for i => (0, 10) {
+        j = 0
+        daijoubu (j < 10) {
+            nani (i * j == target) {
+                modoru i * 100 + j
+            }
+            j++
+        }
+    }
+    modoru 999
+}
+kawaii odd_sum(n) => {
+    total = 0
+    i = 0
+    daijoubu (i < n) {
+        i++
+        nani (i % 2 == 0) {
+            motto
+        }
+        total = total + i
+    }
+    modoru total
+}
+kawaii skip(n) => {
+    for i => (0, n) {
+        nani (i == n - 1) {
+            motto
+        }
+    }
+    yomu_ln("skip")
+}
+kawaii stop() => {
+    daijoubu (HAI) {
+        modoru
+    }
+}
+kawaii early(n) => {
+    nani (n > 0) {
+        yamete
+    }
+    yomu_ln("late")
+}
+kawaii depth(n) => {
+    for i => (0, 5) {
+        nani (n == 0) {
+            modoru i
+        }
+        modoru depth(n - 1) + 1
+    }
+}
+"""
+
+
+class TestControlFlow(BaseTest):
+    def setUp(self):
+        self.parser: Parser = Parser(lexer=Lexer())
+
+    def run_program(self, main: str) -> dict[str, list[str]]:
+        """Runs the functions with a main body on every engine, returns the lines printed"""
+        outputs = {}
+        for engine in ENGINES:
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                program = self.parser.parse_string(FUNCTIONS + main)
+                engine().interpret(program, self.parser.source_map)
+            outputs[engine.__name__] = output.getvalue().split()
+        return outputs
+
+    def assertOutput(self, main: str, expected: list[str]) -> None:
+        """Asserts that every engine prints the expected lines"""
+        for engine, output in self.run_program(main).items():
+            self.assertEqual(output, expected, engine)
+
+    def test_nested_loops(self):
+        self.print_header("Control flow (nested loops in functions)")
+        main = """\
+        uWu_nyaa() => {
+            yomu_ln(pairs(3), find(12), find(1000), odd_sum(10))
+            total = 0
+            for k => (1, 10) {
+                nani (k == 4) {
+                    yamete
+                }
+                total = total + pairs(k)
+            }
+            yomu_ln(total)
+        }
+        """
+        self.assertOutput(main, ["33", "206", "999", "25", "64"])
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_no_leaks(self):
+        self.print_header("Control flow (transfers do not leak)")
+        main = """\
+        uWu_nyaa() => {
+            for i => (0, 2) {
+                nani (i == 1) {
+                    motto
+                }
+            }
+            yomu_ln("loop")
+            skip(3)
+            yomu_ln("call")
+            stop()
+            yomu_ln("stop")
+        }
+        """
+        self.assertOutput(main, ["loop", "skip", "call", "stop"])
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_returns(self):
+        self.print_header("Control flow (returns)")
+        main = """\
+        uWu_nyaa() => {
+            early(1)
+            early(0)
+            yomu_ln(depth(3))
+            daijoubu (HAI) {
+                nani (HAI) {
+                    modoru
+                }
+            }
+            yomu_ln("unreachable")
+        }
+        """
+        # Break and continue outside loops end the function, return ends the program
+        self.assertOutput(main, ["late", "3"])
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_repl_inputs(self):
+        self.print_header("Control flow (REPL inputs)")
+        for engine in ENGINES:
+            interpreter = engine()
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                for line in ["nani (HAI) { motto }", 'yomu_ln("next")']:
+                    interpreter.interpret(
+                        self.parser.parse_repl(line), self.parser.source_map
+                    )
+            self.assertEqual(output.getvalue().split(), ["next"], engine.__name__)
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_transferring_bodies(self):
+        self.print_header("Control flow (bodies transferring control)")
+        program = self.parser.parse_string(FUNCTIONS + "uWu_nyaa() => { x = 1 }")
+        functions = {
+            function.identifier: function.body for function in program.functions
+        }
+        self.assertTrue(functions["pairs"].transfers)
+        self.assertTrue(functions["stop"].transfers)
+        # Bodies without break, continue or return run as a plain loop
+        self.assertFalse(program.body.transfers)
+        self.assertTrue(functions["skip"].statements[0].body.transfers)
+        print(f"{SUCCESS}  Passed{ENDC}")
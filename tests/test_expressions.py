@@ -5,6 +5,7 @@ from random import randint, choice
 from src.Interpreter import Interpreter
 from src.Lexer import Lexer
 from src.Parser import Parser
+from src.core.RuntimeObject import RunTimeObject
 from src.utils.Constants import WARNING, SUCCESS, ENDC, ERROR
 from tests import BaseTest
 
@@ -112,3 +113,47 @@ class TestExpressions(BaseTest):
                 assert False
 
         print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_relational_expressions(self):
+        self.print_header("Relational Expressions")
+        operators = ["==", "!=", "<", ">", "<=", ">="]
+        operands = [
+            ("3", 3),
+            ("2.5", 2.5),
+            ('"abc"', "abc"),
+            ('"ab\\"d"', 'ab"d'),
+            ("HAI", True),
+            ("IIE", False),
+        ]
+
+        for op in operators:
+            for left_source, left in operands:
+                for right_source, right in operands:
+                    if type(left) is str and type(right) in (int, float):
+                        # Strings compare their length with numbers
+                        expected = eval(f"len(left) {op} right")
+                    elif type(left) is type(right) or {type(left), type(right)} == {
+                        int,
+                        float,
+                    }:
+                        expected = eval(f"left {op} right")
+                    else:
+                        continue
+
+                    test_input = f"{left_source} {op} {right_source}"
+                    ast = self.parser.parse_repl(repl_input=test_input)
+                    result = self.interpreter.interpret(ast)
+                    if result.value != expected:
+                        print(f"{ERROR}   Failed{ENDC}")
+                        self.fail(
+                            f"EXPRESSION:\n"
+                            f"    {test_input}\n"
+                            f"EXPECTED RESULT= {expected}\n"
+                            f"ACTUAL RESULT=  {result.value}\n"
+                        )
+
+        # Non-finite floats are compared as values, not formatted into source
+        infinity = RunTimeObject("number", float("inf"))
+        handler = self.interpreter.binary_op_handler("<")
+        self.assertTrue(handler(RunTimeObject("number", 1), infinity, "<").value)
+        print(f"{SUCCESS}  Passed{ENDC}")
@@ -0,0 +1,94 @@
+import contextlib
+import io
+
+from src.EffectAnalyser import EffectAnalyser
+from src.Fuser import Fuser
+from src.Interpreter import Interpreter
+from src.Lexer import Lexer
+from src.Parser import Parser
+from src.Resolver import Resolver
+from src.core.ASTNodes import FusedNode, walk
+from src.utils.Constants import SUCCESS, ENDC
+from tests import BaseTest
+
+PROGRAM = """\
+kawaii count(n) => {
+    cells => [n]
+    i = 0
+    daijoubu (i < n) {
+        cells[i] = i * 2
+        i++
+    }
+    total = 0
+    for j => (0, n) {
+        total = total + 1
+        total = cells[j] - 1
+    }
+    modoru total
+}
+uWu_nyaa() => {
+    yomu_ln(count(4))
+    s = ""
+    daijoubu (s < 3) {
+        s = s + "a"
+    }
+    n = 1.5
+    n = n - 1
+    n--
+    yomu_ln(s, n)
+    nani (HAI) {
+        flag = HAI
+        flag = flag + 1
+    }
+}
+"""
+
+
+class TestFuser(BaseTest):
+    def setUp(self):
+        self.parser: Parser = Parser(lexer=Lexer())
+
+    def run_program(self, fusion: bool) -> tuple[list[str], str]:
+        """
+        Runs the program on the tree interpreter,
+        returns the lines printed and the error reported (without its emoji)
+        """
+        output, errors = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(errors):
+            Interpreter(fusion=fusion).interpret(
+                self.parser.parse_string(PROGRAM), self.parser.source_map
+            )
+        return output.getvalue().split(), errors.getvalue().splitlines()[-1]
+
+    def test_fused_sites(self):
+        self.print_header("Fuser (fused sites)")
+        program = self.parser.parse_string(PROGRAM)
+        Resolver().resolve(program)
+        fuser = Fuser()
+        counts = fuser.fuse(program)
+        self.assertEqual(
+            counts,
+            {"increment": 2, "add_constant": 4, "array_store": 1, "compare_while": 2},
+        )
+        # Fused statements are left as they are
+        self.assertFalse(fuser.fuse(program))
+        self.assertEqual(fuser.counts, counts)
+
+        # The statements replaced are still walked by the static passes
+        fused = [node for node in walk(program) if isinstance(node, FusedNode)]
+        self.assertEqual(len(fused), 9)
+        for node in fused:
+            self.assertIn(node.statement, walk(node))
+        count = program.functions[0]
+        self.assertTrue(count.body.statements[4].counted)
+        self.assertEqual(EffectAnalyser().callees(["n"], count.body), frozenset())
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_fused_interpretation(self):
+        self.print_header("Fuser (fused and plain interpretation)")
+        output, errors = self.run_program(fusion=True)
+        # Operands other than numbers go through the binary operations
+        self.assertEqual(output, ["5", "aaa", "-0.5"])
+        self.assertIn("boolean", errors)
+        self.assertEqual((output, errors), self.run_program(fusion=False))
+        print(f"{SUCCESS}  Passed{ENDC}")
@@ -1,10 +1,11 @@
 import os.path
 import subprocess
+import tempfile
 
 from src.Interpreter import Interpreter
 from src.Lexer import Lexer
 from src.Parser import Parser
-from src.utils.Constants import WARNING, SUCCESS, ENDC, ERROR
+from src.utils.Constants import WARNING, SUCCESS, ENDC, ERROR, BYTECODE_MAGIC
 from tests import BaseTest
 
 
@@ -16,6 +17,26 @@ class TestNyaa(BaseTest):
 
     def test_interpreter(self):
         self.print_header("Interpreter")
+        self.run_interpreter_tests()
+
+    def test_stack_interpreter(self):
+        self.print_header("Interpreter (stack engine)")
+        self.run_interpreter_tests("--engine=stack")
+
+    def test_closure_interpreter(self):
+        self.print_header("Interpreter (closure engine)")
+        self.run_interpreter_tests("--engine=closure")
+
+    def test_vm_interpreter(self):
+        self.print_header("Interpreter (virtual machine)")
+        self.run_interpreter_tests("--engine=vm")
+
+    def test_py_interpreter(self):
+        self.print_header("Interpreter (Python transpiler)")
+        self.run_interpreter_tests("--engine=py")
+
+    def run_interpreter_tests(self, *options):
+        """Runs the programs in the interpreter test directory and compares their output"""
         interpreter_dir = os.path.join(self.test_dir, "interpreter/")
         input_dir = os.path.join(interpreter_dir, "in/")
         output_dir = os.path.join(interpreter_dir, "out/")
@@ -36,12 +57,15 @@ class TestNyaa(BaseTest):
 
             print(f"[Interpreter] Running test on: {file}")
             proc = subprocess.run(
-                ["python3", "nyaa.py", input_dir + file], capture_output=True, text=True
+                ["python3", "nyaa.py", *options, input_dir + file],
+                capture_output=True,
+                text=True,
+                timeout=60,
             )
 
-            # Compare outputs
+            # Compare outputs, the programs report no errors
             res = proc.stdout.strip().replace(" ", "")
-            if res == expected and proc.returncode == 0:
+            if res == expected and proc.returncode == 0 and not proc.stderr:
                 print(f"{SUCCESS}  Passed{ENDC}")
             else:
                 expected_header = "EXPECTED OUTPUT:"
@@ -61,6 +85,26 @@ class TestNyaa(BaseTest):
 
     def test_interpreter_errors(self):
         self.print_header("Interpreter Errors")
+        self.run_interpreter_error_tests()
+
+    def test_stack_interpreter_errors(self):
+        self.print_header("Interpreter Errors (stack engine)")
+        self.run_interpreter_error_tests("--engine=stack")
+
+    def test_closure_interpreter_errors(self):
+        self.print_header("Interpreter Errors (closure engine)")
+        self.run_interpreter_error_tests("--engine=closure")
+
+    def test_vm_interpreter_errors(self):
+        self.print_header("Interpreter Errors (virtual machine)")
+        self.run_interpreter_error_tests("--engine=vm")
+
+    def test_py_interpreter_errors(self):
+        self.print_header("Interpreter Errors (Python transpiler)")
+        self.run_interpreter_error_tests("--engine=py")
+
+    def run_interpreter_error_tests(self, *options):
+        """Runs the programs in the error test directory and checks the errors reported"""
         test_dir = os.path.join(self.test_dir, "errors/interpreter/")
         for file in os.listdir(test_dir):
             if not file.endswith(".ny"):
@@ -78,7 +122,10 @@ class TestNyaa(BaseTest):
 
             print(f"[Interpreter Error] Running test on: {file}")
             proc = subprocess.run(
-                ["python3", "nyaa.py", test_dir + file], capture_output=True, text=True
+                ["python3", "nyaa.py", *options, test_dir + file],
+                capture_output=True,
+                text=True,
+                timeout=60,
             )
 
             # Compare outputs
@@ -89,3 +136,211 @@ class TestNyaa(BaseTest):
                 self.fail(f"EXPECTED:\n    {expected}\nACTUAL:\n    {proc.stderr}")
 
             print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_tail_call_errors(self):
+        self.print_header("Interpreter Errors (tail call positions)")
+        source = os.path.join(self.test_dir, "errors/interpreter/tail_call_args.ny")
+        for engine in ("tree", "stack", "closure", "vm", "py"):
+            print(f"[Interpreter Error] Running test on: tail_call_args.ny ({engine})")
+            proc = subprocess.run(
+                ["python3", "nyaa.py", f"--engine={engine}", "--no-cache", source],
+                capture_output=True,
+                text=True,
+                timeout=60,
+            )
+            # Errors of a tail call are located at the call, not at its caller
+            self.assertIn("6:17", proc.stderr)
+            self.assertNotIn("10:18", proc.stderr)
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_deep_programs(self):
+        self.print_header("Interpreter (deep programs)")
+        recursion = (
+            "kawaii down(n) => {\n"
+            "    nani (n == 0) {\n"
+            "        modoru 0\n"
+            "    }\n"
+            "    modoru 1 + down(n - 1)\n"
+            "}\n"
+            "uWu_nyaa() => yomu_ln(down(20000));\n"
+        )
+        nesting = 'yomu_ln("deep")\n'
+        for _ in range(3000):
+            nesting = f"nani (HAI) {{\n{nesting}}}\n"
+        nesting = f"uWu_nyaa() => {{\n{nesting}}}\n"
+        # Expressions are parsed recursively, under a raised recursion limit
+        expression = "(" * 500 + "1" + " + 1)" * 500
+        expression = f"uWu_nyaa() => {{\nx = {expression}\nyomu_ln(x)\n}}\n"
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for name, program, expected in [
+                ("recursion.ny", recursion, "20000"),
+                ("nesting.ny", nesting, "deep"),
+                ("expression.ny", expression, "501"),
+            ]:
+                print(f"[Interpreter] Running test on: {name}")
+                source = os.path.join(temp_dir, name)
+                with open(source, "w") as f:
+                    f.write(program)
+
+                proc = subprocess.run(
+                    ["python3", "nyaa.py", "--engine=stack", "--no-cache", source],
+                    capture_output=True,
+                    text=True,
+                )
+                self.assertEqual(proc.stdout.strip(), expected, proc.stderr)
+
+            # Recursion is limited by the frame budget
+            proc = subprocess.run(
+                [
+                    "python3",
+                    "nyaa.py",
+                    "--engine=stack",
+                    "--frame-budget=1000",
+                    "--no-cache",
+                    os.path.join(temp_dir, "recursion.ny"),
+                ],
+                capture_output=True,
+                text=True,
+            )
+            self.assertIn("non-kawaii recursion depth exceeded", proc.stderr.lower())
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_closure_deep_nesting(self):
+        self.print_header("Interpreter (closure engine, deep nesting)")
+        nesting = 'yomu_ln("deep")\n'
+        for _ in range(20000):
+            nesting = f"nani (HAI) {{\n{nesting}}}\n"
+        nesting = f"uWu_nyaa() => {{\n{nesting}}}\n"
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = os.path.join(temp_dir, "nesting.ny")
+            with open(source, "w") as f:
+                f.write(nesting)
+
+            proc = subprocess.run(
+                ["python3", "nyaa.py", "--engine=closure", "--no-cache", source],
+                capture_output=True,
+                text=True,
+                timeout=300,
+            )
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            self.assertEqual(proc.stdout.strip(), "deep", proc.stderr)
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_py_deep_nesting(self):
+        self.print_header("Interpreter (Python transpiler, deep nesting)")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for depth, expected in [(90, "deep"), (50000, "")]:
+                nesting = 'yomu_ln("deep")\n'
+                for _ in range(depth):
+                    nesting = f"nani (HAI) {{\n{nesting}}}\n"
+                source = os.path.join(temp_dir, f"nesting_{depth}.ny")
+                with open(source, "w") as f:
+                    f.write(f"uWu_nyaa() => {{\n{nesting}}}\n")
+
+                print(f"[Interpreter] Running test on: nesting_{depth}.ny")
+                proc = subprocess.run(
+                    ["python3", "nyaa.py", "--engine=py", "--no-cache", source],
+                    capture_output=True,
+                    text=True,
+                    timeout=60,
+                )
+                self.assertEqual(proc.stdout.strip(), expected, proc.stderr)
+
+            # Programs nested deeper than CPython compiles are rejected before they are emitted
+            self.assertIn("too many levels of indentation", proc.stderr)
+            self.assertIn("101:1", proc.stderr)
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_bytecode_files(self):
+        self.print_header("Interpreter (bytecode files)")
+        source = os.path.join(self.test_dir, "interpreter/in/fib.ny")
+        with open(os.path.join(self.test_dir, "interpreter/out/fib.out")) as f:
+            expected = f.read().strip().replace(" ", "")
+
+        proc = subprocess.run(
+            ["python3", "nyaa.py", "--dis", "--no-cache", source],
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertIn("Disassembly of <main>:", proc.stdout)
+        self.assertIn("Disassembly of fib:", proc.stdout)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bytecode = os.path.join(temp_dir, "fib.nyb")
+            proc = subprocess.run(
+                ["python3", "nyaa.py", f"--save-bytecode={bytecode}", source],
+                capture_output=True,
+                text=True,
+            )
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+
+            # Bytecode files run without their source
+            proc = subprocess.run(
+                ["python3", "nyaa.py", bytecode], capture_output=True, text=True
+            )
+            self.assertEqual(proc.stdout.strip().replace(" ", ""), expected)
+
+            # Truncated files are rejected
+            truncated = os.path.join(temp_dir, "truncated.nyb")
+            with open(bytecode, "rb") as f, open(truncated, "wb") as t:
+                t.write(f.read()[:-64])
+            proc = subprocess.run(
+                ["python3", "nyaa.py", truncated], capture_output=True, text=True
+            )
+            self.assertEqual(proc.returncode, 1)
+            self.assertIn("cannot be loaded", proc.stderr)
+
+            # Files compiled by another version of the compiler are rejected
+            with open(bytecode, "r+b") as f:
+                f.seek(len(BYTECODE_MAGIC))
+                f.write(bytes(8))
+            proc = subprocess.run(
+                ["python3", "nyaa.py", bytecode], capture_output=True, text=True
+            )
+            self.assertEqual(proc.returncode, 1)
+            self.assertIn("cannot be loaded", proc.stderr)
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_python_modules(self):
+        self.print_header("Interpreter (Python modules)")
+        root_dir = os.path.dirname(self.test_dir)
+        environment = dict(os.environ, PYTHONPATH=root_dir)
+        with open(os.path.join(self.test_dir, "interpreter/out/fib.out")) as f:
+            expected = f.read().strip().replace(" ", "")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for name, expected_output in [
+                ("interpreter/in/fib.ny", expected),
+                ("errors/interpreter/zero_div.ny", "division by zero is not kawaii"),
+            ]:
+                print(f"[Interpreter] Running test on: {name}")
+                module = os.path.join(temp_dir, os.path.basename(name)[:-3] + ".py")
+                proc = subprocess.run(
+                    [
+                        "python3",
+                        "nyaa.py",
+                        f"--save-py={module}",
+                        "--no-cache",
+                        os.path.join(self.test_dir, name),
+                    ],
+                    capture_output=True,
+                    text=True,
+                )
+                self.assertEqual(proc.returncode, 0, proc.stderr)
+                with open(module) as f:
+                    self.assertIn(name, f.readline())
+
+                # Modules run without the Nyaa front end, errors keep their positions
+                proc = subprocess.run(
+                    ["python3", module],
+                    capture_output=True,
+                    text=True,
+                    env=environment,
+                )
+                output = proc.stdout.strip().replace(" ", "") + proc.stderr.lower()
+                self.assertIn(expected_output, output, proc.stderr)
+        self.assertIn("1:20 to 1:25", proc.stderr)
+        print(f"{SUCCESS}  Passed{ENDC}")
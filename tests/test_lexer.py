@@ -3,9 +3,12 @@ import sys
 from pathlib import Path
 
 from src.Lexer import Lexer, RESERVED_WORDS
+from src.RegexLexer import RegexLexer
 from src.core.Token import Token
+from src.core.TokenStream import TokenStream
 from src.core.Types import TokenType
 from src.utils.Constants import WARNING, SUCCESS, ENDC, ERROR
+from src.utils.ErrorHandler import LexerError
 from tests import BaseTest
 
 
@@ -75,3 +78,134 @@ class TestLexer(BaseTest):
                 print(f"{SUCCESS}  Passed{ENDC}")
             finally:
                 self.lexer.__init__()
+
+    def test_positions(self):
+        self.print_header("Lexer Positions")
+        self.lexer.analyze_repl('x = 1\n\n  yomu_ln("a")  ## block\n# comment ##\n')
+
+        positions = []
+        for token in self.lexer.iter_tokens():
+            position = self.lexer.source_map.position(token.offset)
+            positions.append((position.line_number, position.column_number))
+        self.assertEqual(
+            positions,
+            [(1, 1), (1, 3), (1, 5), (3, 3), (3, 10), (3, 11), (3, 14), (5, 0)],
+        )
+
+    def test_error_position(self):
+        self.print_header("Lexer Error Position")
+        self.lexer.analyze_repl('x = 1\n  y = "abc\\q"')
+        with self.assertRaises(LexerError) as error:
+            list(self.lexer.iter_tokens())
+        self.assertIn(f"at position {WARNING}2:7", error.exception.message)
+
+
+class TestRegexLexer(TestLexer):
+    def setUp(self):
+        self.lexer: Lexer = RegexLexer()
+
+    @staticmethod
+    def tokenize(lexer: Lexer, source: Path, iterate: bool = False) -> list:
+        """
+        Returns the token stream of a source file (or the error message raised)
+        @param iterate: Flag to read the tokens with iter_tokens instead of get_token
+        """
+        lexer.analyze_src_file(source)
+        tokens = []
+        next_token = iter(lexer.iter_tokens()).__next__ if iterate else lexer.get_token
+        try:
+            token = Token()
+            while token.type != TokenType.ENDMARKER:
+                token = next_token()
+                position = lexer.source_map.position(token.offset)
+                tokens.append(
+                    (
+                        token.type,
+                        token.word,
+                        token.number,
+                        position.line_number,
+                        position.column_number,
+                    )
+                )
+        except LexerError as e:
+            tokens.append(e.message.split("\n")[-1])
+        return tokens
+
+    def test_same_tokens_as_hand_written_lexer(self):
+        self.print_header("Regex Lexer Token Stream")
+        sources = [
+            os.path.join(self.test_dir, "lexer/"),
+            os.path.join(self.test_dir, "errors/lexer/"),
+            os.path.join(self.test_dir, "interpreter/in/"),
+        ]
+        for test_dir in sources:
+            for file in os.listdir(test_dir):
+                if not file.endswith((".in", ".lex", ".ny")):
+                    continue
+
+                print(f"[Regex Lexer] Running test on: {file}")
+                source = Path(test_dir + file)
+                expected = self.tokenize(Lexer(), source)
+                if self.tokenize(self.lexer, source) != expected:
+                    print(f"{ERROR}  Failed{ENDC}")
+                    self.fail(f"Token stream differs for {file}")
+                # Tokens iterated are built from their match, without _scan_token
+                if self.tokenize(self.lexer, source, iterate=True) != expected:
+                    print(f"{ERROR}  Failed{ENDC}")
+                    self.fail(f"Token stream differs for {file}")
+                print(f"{SUCCESS}  Passed{ENDC}")
+
+
+class TestTokenStream(BaseTest):
+    def setUp(self):
+        self.lexer: Lexer = Lexer()
+
+    @staticmethod
+    def describe(token: Token) -> tuple:
+        return token.type, token.word, token.number, token.offset
+
+    def test_peek(self):
+        self.print_header("Token Stream Lookahead")
+        test_dir = os.path.join(self.test_dir, "interpreter/in/")
+        for file in os.listdir(test_dir):
+            if not file.endswith(".ny"):
+                continue
+
+            print(f"[Token Stream] Running test on: {file}")
+            self.lexer.analyze_src_file(Path(test_dir + file))
+            expected = [self.describe(token) for token in self.lexer.iter_tokens()]
+
+            self.lexer.analyze_src_file(Path(test_dir + file))
+            tokens = TokenStream(self.lexer.iter_tokens(), lookahead=3)
+            for i, token in enumerate(expected):
+                # Peeking must neither skip nor re-lex tokens
+                for k in range(3):
+                    peeked = self.describe(tokens.peek(k))
+                    self.assertEqual(peeked, expected[min(i + k, len(expected) - 1)])
+                self.assertEqual(self.describe(next(tokens)), token)
+            print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_end_marker_repeats(self):
+        self.print_header("Token Stream End Marker")
+        self.lexer.analyze_repl("x = 1;")
+        tokens = TokenStream(self.lexer.iter_tokens())
+        types = [next(tokens).type for _ in range(6)]
+        self.assertEqual(
+            types,
+            [
+                TokenType.ID,
+                TokenType.ASSIGN,
+                TokenType.INT,
+                TokenType.SEMICOLON,
+                TokenType.ENDMARKER,
+                TokenType.ENDMARKER,
+            ],
+        )
+        self.assertEqual(tokens.peek(1).type, TokenType.ENDMARKER)
+
+    def test_lookahead_is_bounded(self):
+        self.print_header("Token Stream Window")
+        self.lexer.analyze_repl("x = 1;")
+        tokens = TokenStream(self.lexer.iter_tokens(), lookahead=2)
+        self.assertEqual(tokens.peek(1).type, TokenType.ASSIGN)
+        self.assertRaises(IndexError, tokens.peek, 2)
@@ -0,0 +1,64 @@
+import io
+import os.path
+import shutil
+import subprocess
+import tempfile
+
+from src.Lexer import Lexer
+from src.Parser import Parser
+from src.utils.Constants import SUCCESS, ENDC
+from src.utils.Logger import Logger, LogLevel
+from tests import BaseTest
+
+
+class TestLogger(BaseTest):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.test_dir, "interpreter/in/func.ny")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        super().tearDown()
+
+    def test_log_levels(self):
+        self.print_header("Logger (levels)")
+        stream = io.StringIO()
+        parser = Parser(
+            lexer=Lexer(), logger=Logger("parser", LogLevel.INFO, stream=stream)
+        )
+        parser.parse_source(self.source)
+
+        log = stream.getvalue()
+        self.assertIn("[parser] ", log)
+        self.assertNotIn("Consuming", log)
+        self.assertNotIn("\x1b[", log)
+
+        stream = io.StringIO()
+        parser = Parser(lexer=Lexer(), logger=Logger("parser", stream=stream))
+        parser.parse_source(self.source)
+        self.assertIn("Consuming", stream.getvalue())
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_log_file(self):
+        self.print_header("Logger (log file)")
+        log_path = os.path.join(self.temp_dir, "nyaa.log")
+        proc = subprocess.run(
+            [
+                "python3",
+                "nyaa.py",
+                "-p",
+                "-i",
+                "--no-cache",
+                f"--log-file={log_path}",
+                self.source,
+            ],
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertEqual(proc.stdout.strip(), "5")
+
+        with open(log_path) as log_file:
+            subsystems = {line.split("]")[0] + "]" for line in log_file}
+        self.assertEqual(subsystems, {"[parser]", "[interpreter]"})
+        print(f"{SUCCESS}  Passed{ENDC}")
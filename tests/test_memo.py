@@ -0,0 +1,176 @@
+import contextlib
+import io
+
+from src.ClosureInterpreter import ClosureInterpreter
+from src.EffectAnalyser import EffectAnalyser
+from src.Interpreter import Interpreter
+from src.Lexer import Lexer
+from src.Parser import Parser
+from src.PyInterpreter import PyInterpreter
+from src.StackInterpreter import StackInterpreter
+from src.VirtualMachine import VirtualMachine
+from src.core.RuntimeObject import RunTimeObject
+from src.utils.Constants import SUCCESS, ENDC
+from tests import BaseTest
+
+FUNCTIONS = """\
+kawaii fib(n) => {
+    nani (n < 2) {
+        modoru n
+    }
+    modoru fib(n - 1) + fib(n - 2)
+}
+kawaii loud(n) => {
+    yomu_ln(n)
+    modoru n
+}
+kawaii scaled(n) => {
+    modoru n * factor
+}
+kawaii branch(n) => {
+    nani (n > 0) {
+        m = n
+    }
+    modoru m
+}
+kawaii total(n) => {
+    t = 0
+    for i => (0, n) {
+        t = t + double(i)
+    }
+    modoru t
+}
+kawaii double(n) => {
+    modoru n * 2
+}
+kawaii first(a) => {
+    modoru a[0]
+}
+kawaii set_first(a, n) => {
+    a[0] = n
+    modoru n
+}
+kawaii filled(n) => {
+    a => [2]
+    a[1] = n
+    modoru a[1]
+}
+kawaii made(n) => {
+    a => [n]
+    modoru a
+}
+"""
+
+
+class TestMemo(BaseTest):
+    def setUp(self):
+        self.parser: Parser = Parser(lexer=Lexer())
+
+    def analyse(self, source: str) -> dict:
+        """Returns the result of the effect analysis of the functions of a program"""
+        program = self.parser.parse_string(source + "uWu_nyaa() => {}")
+        analyser = EffectAnalyser()
+        return {
+            function.identifier: analyser.analyse(
+                [arg.value for arg in function.args.children], function.body
+            )
+            for function in program.functions
+        }
+
+    def run_program(self, interpreter: Interpreter, main: str) -> list[str]:
+        """Runs the functions with a main body, returns the lines printed"""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            program = self.parser.parse_string(FUNCTIONS + main)
+            interpreter.interpret(program, self.parser.source_map)
+        return output.getvalue().split()
+
+    def test_effect_analysis(self):
+        self.print_header("Memoization (effect analysis)")
+        callees = self.analyse(FUNCTIONS)
+        self.assertEqual(callees["fib"], {"fib"})
+        self.assertEqual(callees["total"], {"double"})
+        self.assertEqual(callees["double"], frozenset())
+        self.assertEqual(callees["filled"], frozenset())
+        # Output, globals and locals that are not assigned on every path are impure
+        self.assertIsNone(callees["loud"])
+        self.assertIsNone(callees["scaled"])
+        self.assertIsNone(callees["branch"])
+        # Storing to an array the function did not define is visible to the caller
+        self.assertIsNone(callees["set_first"])
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_memoized_calls(self):
+        self.print_header("Memoization (calls)")
+        interpreter = Interpreter()
+        main = """\
+        uWu_nyaa() => {
+            yomu_ln(fib(60), loud(1), loud(1))
+            factor = 2
+            yomu_ln(scaled(1))
+            factor = 3
+            yomu_ln(scaled(1), branch(1), total(3))
+            arr => {1, 2}
+            yomu_ln(first(arr), set_first(arr, 5), first(arr), filled(4))
+        }
+        """
+        output = self.run_program(interpreter, main)
+        self.assertEqual(
+            output,
+            ["1", "1", "1548008755920", "1", "1", "2", "3", "1", "6"]
+            + ["1", "5", "5", "4"],
+        )
+
+        fib = interpreter.global_env.lookup_symbol("fib").value
+        total = interpreter.global_env.lookup_symbol("total").value
+        self.assertTrue(fib.memo.has_key((("number", int, 60),)))
+        self.assertTrue(total.memo.has_key((("number", int, 3),)))
+        # Calls with arrays are not memoized
+        first = interpreter.global_env.lookup_symbol("first").value
+        array = RunTimeObject("array", [RunTimeObject("number", 1)])
+        self.assertIsNone(interpreter.memo_key(first, [array]))
+        self.assertFalse(interpreter.global_env.lookup_symbol("loud").value.memo.pure)
+
+        # Redefining a function called discards the results memoized with it
+        interpreter.global_env.lookup_symbol("double").value = (
+            interpreter.global_env.lookup_symbol("fib").value
+        )
+        key = interpreter.memo_key(total, [RunTimeObject("number", 3)])
+        self.assertFalse(total.memo.has_key(key))
+        self.assertEqual(set(total.memo.dependencies), {"double", "fib"})
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_memoized_arrays(self):
+        self.print_header("Memoization (array results)")
+        main = """\
+        uWu_nyaa() => {
+            x = made(2)
+            y = made(2)
+            x[0] = 7
+            yomu_ln(x[0], y[0])
+        }
+        """
+        # Calls returning an array each return an array of their own
+        for engine in (
+            Interpreter,
+            StackInterpreter,
+            ClosureInterpreter,
+            VirtualMachine,
+            PyInterpreter,
+        ):
+            self.assertEqual(self.run_program(engine(), main), ["7", "0"])
+
+        interpreter = Interpreter()
+        self.run_program(interpreter, main)
+        made = interpreter.global_env.lookup_symbol("made").value
+        self.assertTrue(made.memo.pure)
+        self.assertFalse(made.memo.has_key((("number", int, 2),)))
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_memoization_disabled(self):
+        self.print_header("Memoization (disabled)")
+        interpreter = Interpreter(memo_size=0)
+        output = self.run_program(interpreter, "uWu_nyaa() => {\nyomu_ln(fib(15))\n}")
+        self.assertEqual(output, ["610"])
+        self.assertIsNone(interpreter.global_env.lookup_symbol("fib").value.memo)
+        print(f"{SUCCESS}  Passed{ENDC}")
@@ -1,8 +1,25 @@
 import os.path
 import sys
+import tempfile
 
 from src.Lexer import Lexer
 from src.Parser import Parser
+from src.RegexLexer import RegexLexer
+from src.core.ASTNodes import (
+    BinaryOpNode,
+    UnaryOpNode,
+    LiteralNode,
+    LoadNode,
+    LazyBodyNode,
+)
+from src.core.Token import Token
+from src.core.Types import (
+    TokenType,
+    BINARY_OPERATOR_TOKENS,
+    CALLABLE_TOKENS,
+    FACTOR_START_TOKENS,
+    verify_token_categories,
+)
 from src.utils.Constants import SUCCESS, ENDC, ERROR
 from tests import BaseTest
 
@@ -27,3 +44,96 @@ class TestParser(BaseTest):
             except Exception as e:
                 print(f"{ERROR}  Failed{ENDC}", e, file=sys.stderr)
                 self.fail()
+
+    def test_parse_stream(self):
+        self.print_header("Parser (streamed source)")
+        test_dir = os.path.join(self.test_dir, "interpreter/in/")
+        for file in os.listdir(test_dir):
+            if not file.endswith(".ny"):
+                continue
+
+            try:
+                print(f"[Parser] Running streamed test on: {file}")
+                self.parser.parse_stream(open(test_dir + file, "r"))
+
+                print(f"{SUCCESS}  Passed{ENDC}")
+            except Exception as e:
+                print(f"{ERROR}  Failed{ENDC}", e, file=sys.stderr)
+                self.fail()
+
+    def test_token_categories(self):
+        self.print_header("Token Categories")
+        verify_token_categories()
+
+        # MINUS is the only operator that can also start a factor (negative numbers)
+        self.assertEqual(
+            FACTOR_START_TOKENS & BINARY_OPERATOR_TOKENS, frozenset({TokenType.MINUS})
+        )
+        self.assertTrue(
+            all(
+                TokenType.statement_start(Token(tok_type))
+                for tok_type in CALLABLE_TOKENS
+            )
+        )
+
+    def test_flat_expressions(self):
+        self.print_header("Flat Expressions")
+
+        def render(node):
+            if isinstance(node, BinaryOpNode):
+                return f"({render(node.left)} {node.operator} {render(node.right)})"
+            if isinstance(node, UnaryOpNode):
+                return f"({node.operator} {render(node.operand)})"
+            if isinstance(node, LiteralNode):
+                return repr(node.value)
+            if isinstance(node, LoadNode):
+                return node.identifier
+            return node.label
+
+        expressions = {
+            "1 + 2 * 3 - 4": "((1 + (2 * 3)) - 4)",
+            "a / b % c * d": "(((a / b) % c) * d)",
+            "a < b == c": "(a < (b == c))",
+            "a < b && c || d": "(a < (b and (c or d)))",
+            "-a * !b + (c - d)": "(((- a) * (not b)) + (c - d))",
+            '"nyaa" + x[1] * f(2)': "('nyaa' + (array_access * call))",
+            "HAI": "True",
+        }
+        for expression, expected in expressions.items():
+            print(f"[Parser] Running test on: {expression}")
+            self.assertEqual(render(self.parser.parse_repl(expression)), expected)
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_lazy_bodies(self):
+        self.print_header("Lazy Function Bodies")
+        test_dir = os.path.join(self.test_dir, "interpreter/in/")
+        # Both tokenizer backends resume after the bodies they skim
+        for lexer in (RegexLexer(), Lexer()):
+            lazy_parser = Parser(lexer=lexer, lazy_bodies=True)
+            for file in os.listdir(test_dir):
+                if not file.endswith(".ny"):
+                    continue
+
+                print(f"[Parser] Running lazy test on: {file}")
+                ast = self.parser.parse_source(filepath=test_dir + file)
+                lazy_ast = lazy_parser.parse_source(filepath=test_dir + file)
+                for func in lazy_ast.functions:
+                    if isinstance(func.body, LazyBodyNode):
+                        func.body = lazy_parser.parse_lazy_body(func.body)
+                self.assertEqual(lazy_ast.encode_json(), ast.encode_json())
+
+        # Bodies are only matched by their braces, including those within strings and comments
+        with tempfile.NamedTemporaryFile("w", suffix=".ny") as source:
+            source.write(
+                'kawaii f() => { x = ) "}" # }\n ## { # # }\n'
+                "kawaii g() => { modoru 1 }\n"
+                "uWu_nyaa() => { yomu(g()) }\n"
+            )
+            source.flush()
+            lazy_ast = lazy_parser.parse_source(filepath=source.name)
+        self.assertEqual(
+            [func.body.label for func in lazy_ast.functions],
+            ["lazy_body", "lazy_body"],
+        )
+        self.assertEqual(lazy_ast.functions[1].body.source, "{ modoru 1 }")
+        print(f"{SUCCESS}  Passed{ENDC}")
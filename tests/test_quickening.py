@@ -0,0 +1,90 @@
+import contextlib
+import io
+
+from src.Interpreter import Interpreter, QUICKENING_THRESHOLD
+from src.Lexer import Lexer
+from src.Parser import Parser
+from src.core.ASTNodes import BinaryOpNode, walk
+from src.utils.Constants import SUCCESS, ENDC
+from src.utils.Logger import Logger, LogLevel
+from tests import BaseTest
+
+PROGRAM = """\
+kawaii add(a, b) => {
+    modoru a + b
+}
+kawaii below(a, b) => {
+    modoru a < b
+}
+uWu_nyaa() => {
+    total = 0
+    for i => (0, 20) {
+        total = add(total, i)
+    }
+    words = ""
+    for _ => (0, 3) {
+        words = add(words, "nya")
+    }
+    yomu_ln(total, words, below(1, 2), below("a", "b"))
+    d = 9
+    for i => (0, 12) {
+        yomu(10 / d, "")
+        d = d - 1
+    }
+}
+"""
+
+
+class TestQuickening(BaseTest):
+    def setUp(self):
+        self.parser: Parser = Parser(lexer=Lexer())
+
+    def run_program(self, **kwargs) -> tuple[Interpreter, list[str], str]:
+        """
+        Runs the program on the tree interpreter,
+        returns it, the lines printed and the error reported (without its emoji)
+        """
+        interpreter = Interpreter(**kwargs)
+        output, errors = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(errors):
+            interpreter.interpret(
+                self.parser.parse_string(PROGRAM), self.parser.source_map
+            )
+        return (
+            interpreter,
+            output.getvalue().split(),
+            errors.getvalue().splitlines()[-1],
+        )
+
+    def test_quickened_operations(self):
+        self.print_header("Quickening (specialised and generic operations)")
+        program = self.parser.parse_string("uWu_nyaa() => {\n    x = 1 + 2\n}\n")
+        node = next(node for node in walk(program) if isinstance(node, BinaryOpNode))
+        interpreter = Interpreter()
+        interpreter.evaluate(program)
+        for _ in range(QUICKENING_THRESHOLD):
+            self.assertEqual(node.accept(interpreter).value, 3)
+        self.assertEqual(node.label, "quick_arithmetic")
+        self.assertEqual(node.accept(interpreter).value, 3)
+        self.assertEqual(interpreter.quickening_stats, {"quickened": 1})
+
+        # Operations are the same with or without quickening, down to the error reported
+        interpreter, output, error = self.run_program()
+        self.assertEqual(output[:4], ["190", "nyanyanya", "True", "True"])
+        self.assertIn("Division by zero", error)
+        # Operands of other labels, and the division by zero, revert their operation
+        self.assertEqual(interpreter.quickening_stats["deopts"], 2)
+        self.assertEqual((output, error), self.run_program(quickening=False)[1:])
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_quickening_stats(self):
+        self.print_header("Quickening (stats logged)")
+        log = io.StringIO()
+        logger = Logger("interpreter", LogLevel.INFO, log)
+        interpreter, _, _ = self.run_program(logger=logger)
+        stats = interpreter.quickening_stats
+        self.assertEqual(stats["quickened"], 2)
+        self.assertEqual(stats["deopts"], 2)
+        self.assertGreater(stats["executions"], stats["deopts"])
+        self.assertIn("Quickened 2 binary operations", log.getvalue())
+        print(f"{SUCCESS}  Passed{ENDC}")
@@ -26,6 +26,21 @@ class TestRepl(BaseTest):
             print(e, file=sys.stderr)
             self.fail()
 
+    def test_repl_lazy_syntax_error(self):
+        self.print_header("REPL (syntax error in a lazily parsed body)")
+        proc = subprocess.run(
+            ["python3", "nyaa.py", "--lazy"],
+            capture_output=True,
+            text=True,
+            input="kawaii broken() => { x = = 1 }\nbroken()\nyomu_ln(5)\njaa ne\n",
+            timeout=60,
+        )
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertIn("Syntax Error", proc.stderr)
+        # The session goes on after the error
+        self.assertIn("5", proc.stdout)
+        print(f"{SUCCESS}  Passed{ENDC}")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,148 @@
+import contextlib
+import io
+
+from src.Interpreter import Interpreter
+from src.Lexer import Lexer
+from src.Parser import Parser
+from src.Resolver import Resolver, LOCAL_SCOPE, GLOBAL_SCOPE
+from src.core.ASTNodes import LoadNode, AssignmentNode, ForNode, walk
+from src.core.Environment import Environment, SlotEnvironment
+from src.core.RuntimeObject import RunTimeObject
+from src.core.Symbol import VarSymbol
+from src.utils.Constants import SUCCESS, ENDC
+from tests import BaseTest
+
+PROGRAM = """\
+kawaii scale(n, k) => {
+    total = n * k + offset
+    for i => (0, 2) {
+        total = total + i
+    }
+    modoru total
+}
+kawaii shadow(n) => {
+    yomu_ln(offset)
+    offset = n
+    modoru offset
+}
+uWu_nyaa() => {
+    offset = 1
+    yomu_ln(scale(2, 3))
+    yomu_ln(shadow(7))
+    yomu_ln(offset)
+}
+"""
+
+
+class TestResolver(BaseTest):
+    def setUp(self):
+        self.parser: Parser = Parser(lexer=Lexer())
+        self.resolver: Resolver = Resolver()
+
+    def test_slots(self):
+        self.print_header("Resolver (slots)")
+        program = self.parser.parse_string(PROGRAM)
+        self.resolver.resolve(program)
+
+        scale, shadow = program.functions
+        # Parameters take the first slots, then the variables the function assigns
+        self.assertEqual(list(scale.body.slots)[:2], ["n", "k"])
+        self.assertEqual(set(scale.body.slots), {"n", "k", "total", "i"})
+        self.assertEqual(sorted(scale.body.slots.values()), [0, 1, 2, 3])
+        self.assertEqual(shadow.body.slots, {"n": 0, "offset": 1})
+
+        loads = {
+            node.identifier: (node.depth, node.slot)
+            for node in walk(scale.body)
+            if isinstance(node, LoadNode)
+        }
+        self.assertEqual(loads["k"], (LOCAL_SCOPE, 1))
+        self.assertEqual(loads["i"], (LOCAL_SCOPE, scale.body.slots["i"]))
+        self.assertEqual(loads["offset"], (GLOBAL_SCOPE, None))
+
+        # Variables of the main program are global
+        for node in walk(program.body):
+            if isinstance(node, (LoadNode, AssignmentNode)):
+                self.assertEqual((node.depth, node.slot), (GLOBAL_SCOPE, None))
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_slot_environments(self):
+        self.print_header("Resolver (slot environments)")
+        program = self.parser.parse_string(PROGRAM)
+        interpreter = Interpreter()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            interpreter.interpret(program, self.parser.source_map)
+
+        # A local read before its slot is assigned falls back to the global variable,
+        # assigning it does not change the global one
+        self.assertEqual(output.getvalue().split(), ["8", "1", "7", "1"])
+
+        scale = interpreter.global_env.lookup_symbol("scale").value
+        local_env = interpreter.bind_arguments(
+            program.functions[0],
+            scale,
+            [RunTimeObject("number", 2), RunTimeObject("number", 3)],
+        )
+        self.assertIsInstance(local_env, SlotEnvironment)
+        self.assertEqual(local_env.lookup_symbol("k").value, 3)
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_counted_loops(self):
+        self.print_header("Resolver (counted loops)")
+        program = self.parser.parse_string(
+            "kawaii fill(n) => {\nfor i => (0, n) {\ncells[i] = 0\n}\n}\n"
+            + PROGRAM.replace("total = total + i", "total = total + i\ni++")
+        )
+        self.resolver.resolve(program)
+
+        fill, scale, _ = program.functions
+        # Loops reassigning or incrementing their iterator are not counted loops
+        loops = [node for node in walk(program) if isinstance(node, ForNode)]
+        self.assertEqual(len(loops), 2)
+        self.assertFalse(scale.body.statements[1].counted)
+        self.assertTrue(fill.body.statements[0].counted)
+
+        interpreter = Interpreter()
+        interpreter.interpret(
+            self.parser.parse_string(
+                "uWu_nyaa() => {\ncells => [4]\nfor i => (3, 0) {\ncells[i] = 5\n}\n}\n"
+            )
+        )
+        cells = interpreter.global_env.lookup_symbol("cells").value
+        self.assertEqual([cell.value for cell in cells], [0, 5, 5, 5])
+        # Elements stored by a loop filling the array are distinct runtime objects
+        self.assertEqual(len(set(map(id, cells[1:]))), 3)
+        self.assertEqual(interpreter.global_env.lookup_symbol("i").value, 1)
+        print(f"{SUCCESS}  Passed{ENDC}")
+
+    def test_inline_caches(self):
+        self.print_header("Resolver (inline caches of global lookups)")
+        environment = Environment(name="global", level=1)
+        version = environment.version
+        environment.insert_symbol("x", VarSymbol("x", RunTimeObject("number", 1)))
+        self.assertEqual(environment.version, version)
+        # Replacing a symbol makes the lookups made before stale
+        environment.insert_symbol("x", VarSymbol("x", RunTimeObject("number", 2)))
+        self.assertNotEqual(environment.version, version)
+        self.assertNotEqual(Environment(name="global", level=1).version, version)
+
+        interpreter = Interpreter()
+        output, errors = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(errors):
+            for line in [
+                "kawaii g() => { modoru offset }",
+                "kawaii f() => { modoru g() }",
+                "for i => (0, 3) {\noffset = i * 10\nyomu_ln(f())\n}",
+                "kawaii g() => { modoru -1 }",
+                "yomu_ln(f())",
+                "g = 3",
+                "yomu_ln(f())",
+            ]:
+                interpreter.interpret(
+                    self.parser.parse_repl(line), self.parser.source_map
+                )
+        # Functions and variables rebound after a call are looked up again
+        self.assertEqual(output.getvalue().split(), ["0", "10", "20", "-1"])
+        self.assertIn("'g' is not a function", errors.getvalue())
+        print(f"{SUCCESS}  Passed{ENDC}")